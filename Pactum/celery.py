@@ -0,0 +1,11 @@
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Pactum.settings')
+
+app = Celery('Pactum')
+
+# Configurações lidas do settings com prefixo CELERY_
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
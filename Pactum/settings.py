@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from decouple import config
+from celery.schedules import crontab
 import environ
 import dj_database_url
 
@@ -73,6 +74,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.middleware.ProfilingMiddleware',  # Consultas/tempo por view (/ops/metrics)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -80,6 +82,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'apps.core.middleware.AuditMiddleware',  # Custom middleware para logs
+    'apps.core.middleware.CacheMiddleware',  # Cache versionado de dashboard/API
 ]
 
 ROOT_URLCONF = 'Pactum.urls'
@@ -111,6 +114,10 @@ DATABASES = {
         conn_health_checks=True,
     )
 }
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # Banco de testes em arquivo: o padrão em memória (cache compartilhado) falha na
+    # hora com "table is locked" em vez de esperar, o que inviabiliza testes com threads
+    DATABASES['default']['TEST'] = {'NAME': BASE_DIR / 'test_db.sqlite3'}
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -186,6 +193,10 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'json_lines': {
+            'format': '{message}',
+            'style': '{',
+        },
     },
     'handlers': {
         'file_access': {
@@ -205,6 +216,12 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
+        'file_profiling': {
+            'level': 'INFO',
+            'class': 'logging.FileHandler',
+            'filename': BASE_DIR / 'logs' / 'profiling.jsonl',
+            'formatter': 'json_lines',
+        },
     },
     'root': {
         'handlers': ['console'],
@@ -220,6 +237,11 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': False,
         },
+        'apps.profiling': {
+            'handlers': ['file_profiling'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
@@ -277,12 +299,74 @@ LOGGING = {
 MERCADOPAGO_ACCESS_TOKEN = config('MERCADOPAGO_ACCESS_TOKEN', default='')
 MERCADOPAGO_PUBLIC_KEY = config('MERCADOPAGO_PUBLIC_KEY', default='')
 
-# Cache Configuration - Use simple cache for development
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+# Cache Configuration - Redis compartilhado entre workers; LocMem em desenvolvimento/testes
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            },
+            'KEY_PREFIX': 'pactum',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
     }
+
+# Páginas do dashboard/API em cache; invalidadas pelas versões dos modelos em apps.core.cache.MODELOS_VERSIONADOS
+VERSIONED_CACHE_TIMEOUT = config('VERSIONED_CACHE_TIMEOUT', default=60 * 60 * 6, cast=int)
+# Páginas HTML em cache expiram antes: dependem também de sessão e mensagens do usuário
+HTML_CACHE_TIMEOUT = config('HTML_CACHE_TIMEOUT', default=60 * 5, cast=int)
+# Gráficos do dashboard: após este prazo (s) o payload antigo é servido enquanto é recalculado
+CHART_CACHE_SOFT_TTL = config('CHART_CACHE_SOFT_TTL', default=30, cast=int)
+
+# Eventos ao vivo do dashboard (SSE): Redis pub/sub entre workers; sem Redis, broker em memória (um processo)
+DASHBOARD_EVENTS_BROKER = config('DASHBOARD_EVENTS_BROKER', default='redis' if REDIS_URL else 'local')
+# Cada conexão SSE ocupa um worker: encerrada após este prazo (s), o navegador reconecta
+DASHBOARD_SSE_MAX_DURATION = config('DASHBOARD_SSE_MAX_DURATION', default=300, cast=int)
+DASHBOARD_SSE_KEEPALIVE = 15
+DASHBOARD_SSE_RETRY_MS = 3000
+
+# Celery - sem broker configurado as tarefas rodam de forma síncrona (eager)
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=REDIS_URL or 'memory://')
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=not REDIS_URL, cast=bool)
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    # Parcelas e contratos que venceram ontem, publicados para os dashboards conectados
+    'publicar-vencimentos-do-dia': {
+        'task': 'apps.dashboard.tasks.publicar_vencimentos_do_dia',
+        'schedule': crontab(hour=0, minute=5),
+    },
+}
+
+# Relatórios gerados em segundo plano (MEDIA_ROOT/reports/)
+REPORTS_DIR = 'reports'
+# Job em 'processando' há mais que isso (segundos) é tratado como perdido (worker morto) e reenfileirado
+REPORT_JOB_STALE_TIMEOUT = config('REPORT_JOB_STALE_TIMEOUT', default=60 * 30, cast=int)
+
+# Instrumentação por view (apps.core.profiling): JSON lines em logs/profiling.jsonl e /ops/metrics
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=True, cast=bool)
+PROFILING_SAMPLES = 1000  # amostras por view usadas nos percentis
+
+# Orçamentos por nome de URL: queries, sql_ms, total_ms e duplicadas (maior repetição de uma consulta).
+# Estouros são registrados no log; com PERF_BUDGETS_ENFORCE levantam PerfBudgetExceeded (testes).
+PERF_BUDGETS = {
+    'dashboard:index': {'queries': 12, 'duplicadas': 1},
+    # API: sessão, usuário e a página, independente do tamanho da página
+    # (contratos: mais uma consulta ao chegar aos sem data de início, ver apps.core.pagination)
+    'contrato-list': {'queries': 4, 'duplicadas': 1},
+    'projeto-list': {'queries': 3, 'duplicadas': 1},
 }
+PERF_BUDGETS_ENFORCE = config('PERF_BUDGETS_ENFORCE', default=False, cast=bool)
 
 # Session Configuration - Use database sessions for development
 SESSION_ENGINE = 'django.contrib.sessions.backends.db'
\ No newline at end of file
@@ -17,6 +17,7 @@ urlpatterns = [
     path('api/', include('apps.api.urls')),
     path('pagamentos/', include('apps.pagamentos.urls')),
     path('relatorios/', include('apps.relatorios.urls')),
+    path('ops/', include('apps.core.urls')),
 ]
 
 if settings.DEBUG:
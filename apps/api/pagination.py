@@ -0,0 +1,57 @@
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from apps.core.pagination import CursorInvalido, KeysetPaginator
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) da API, sem OFFSET nem COUNT.
+    A ordenação é o atributo `keyset_ordering` da viewset.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_page_size(self, request):
+        try:
+            tamanho = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(tamanho, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        paginator = KeysetPaginator(queryset, view.keyset_ordering, self.get_page_size(request))
+        try:
+            self.page = paginator.page(request.query_params.get(self.cursor_query_param) or None)
+        except CursorInvalido:
+            raise NotFound('Cursor de paginação inválido')
+        return self.page.object_list
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self._link(self.page.next_cursor),
+            'previous': self._link(self.page.previous_cursor),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
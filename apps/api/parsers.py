@@ -0,0 +1,33 @@
+import csv
+import io
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class CSVParser(BaseParser):
+    """
+    Corpo text/csv com cabeçalho: devolve uma lista de dicts (uma por linha),
+    no mesmo formato de um lote JSON. Aceita ',' ou ';' como separador;
+    células vazias são omitidas (campo ausente).
+    """
+
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        try:
+            texto = stream.read().decode(encoding).lstrip('\ufeff')
+        except UnicodeDecodeError as exc:
+            raise ParseError(f'CSV com codificação inválida: {exc}')
+
+        try:
+            dialeto = csv.Sniffer().sniff(texto.split('\n', 1)[0], delimiters=',;')
+        except csv.Error:
+            dialeto = csv.excel
+        leitor = csv.DictReader(io.StringIO(texto), dialect=dialeto)
+        return [
+            {chave.strip(): valor.strip() for chave, valor in linha.items() if chave and valor and valor.strip()}
+            for linha in leitor
+        ]
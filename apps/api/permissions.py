@@ -0,0 +1,10 @@
+from rest_framework.permissions import BasePermission
+
+
+class PodeGerenciarContratos(BasePermission):
+    """Perfis que podem lançar parcelas e pagamentos (admin e financeiro)"""
+
+    message = 'Seu perfil não pode registrar lançamentos de contratos.'
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and request.user.can_manage_contracts())
@@ -1,15 +1,119 @@
+from decimal import Decimal
+
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Concat
 from rest_framework import serializers
-from apps.projetos.models import Projeto
-from apps.contratos.models import Contrato
+from rest_framework.fields import SkipField
+from apps.projetos.models import Ordem, Projeto
+from apps.contratos.models import Contrato, ItemContrato
+
+
+class FetchPlanSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer que declara como buscar os próprios dados. No Meta:
+
+    - select_related / prefetch_related: relações usadas pelos campos;
+    - annotations: {nome: callable() -> expressão} para campos calculados no
+      banco (o campo do serializer usa `source=nome`).
+
+    setup_queryset() aplica o plano e um only() com as colunas dos campos
+    pedidos; `fields` (ex.: ?fields=) restringe o serializer e o SELECT.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for nome in set(self.fields) - set(fields):
+                self.fields.pop(nome)
+
+    @classmethod
+    def fontes(cls, fields=None):
+        """Fonte (source) de cada campo pedido, no formato de lookup do ORM"""
+        campos = cls().fields
+        return {
+            nome: campo.source.replace('.', '__')
+            for nome, campo in campos.items()
+            if fields is None or nome in fields
+        }
+
+    @classmethod
+    def setup_queryset(cls, queryset, fields=None):
+        meta = cls.Meta
+        fontes = cls.fontes(fields).values()
+        anotacoes = getattr(meta, 'annotations', {})
+
+        queryset = queryset.annotate(**{
+            nome: expressao() for nome, expressao in anotacoes.items() if nome in fontes
+        })
+        if getattr(meta, 'select_related', None):
+            queryset = queryset.select_related(*meta.select_related)
+        if getattr(meta, 'prefetch_related', None):
+            queryset = queryset.prefetch_related(*meta.prefetch_related)
+
+        colunas = {meta.model._meta.pk.name} | {fonte for fonte in fontes if fonte not in anotacoes}
+        return queryset.only(*colunas)
 
-class ProjetoSerializer(serializers.ModelSerializer):
+    def values_fields(self):
+        """Lookups para .values() quando todos os campos vêm de colunas ou anotações"""
+        return {nome: campo.source.replace('.', '__') for nome, campo in self.fields.items()}
+
+    def represent_values(self, linhas):
+        """Serializa linhas de .values() sem instanciar os modelos"""
+        campos = [(nome, campo, campo.source.replace('.', '__')) for nome, campo in self.fields.items()]
+        dados = []
+        for linha in linhas:
+            item = {}
+            for nome, campo, fonte in campos:
+                valor = linha[fonte]
+                try:
+                    item[nome] = None if valor is None else campo.to_representation(valor)
+                except SkipField:
+                    continue
+            dados.append(item)
+        return dados
+
+
+def projeto_do_contrato():
+    """'cod - nome' do projeto do contrato (contrato -> ordem -> requisição -> projeto)"""
+    return Subquery(
+        Ordem.objects.filter(pk=OuterRef('cod_ordem')).annotate(
+            descricao_projeto=Concat(
+                Cast('cod_requisicao__cod_projeto_id', CharField()),
+                Value(' - '),
+                'cod_requisicao__cod_projeto__nome',
+                output_field=CharField(),
+            )
+        ).values('descricao_projeto')[:1],
+        output_field=CharField(),
+    )
+
+
+class ProjetoSerializer(FetchPlanSerializer):
     class Meta:
         model = Projeto
-        fields = ['cod_projeto', 'nome', 'situacao', 'data_inicio', 'data_encerramento', 'custo_previsto', 'custo_realizado']
+        fields = ['cod_projeto', 'nome', 'situacao', 'data_inicio', 'data_encerramento', 'valor']
 
-class ContratoSerializer(serializers.ModelSerializer):
-    projeto = serializers.StringRelatedField(source='cod_ordem.cod_requisicao.cod_projeto')
+class ContratoSerializer(FetchPlanSerializer):
+    # cod_ordem é um inteiro (sem FK): o projeto vem de uma subconsulta, não de um JOIN por linha
+    projeto = serializers.CharField(source='projeto_descricao', read_only=True, allow_null=True)
 
     class Meta:
         model = Contrato
         fields = ['num_contrato', 'projeto', 'contratado', 'valor', 'situacao']
+        annotations = {'projeto_descricao': projeto_do_contrato}
+
+
+class PagamentoLoteSerializer(serializers.Serializer):
+    """Linha de um lote de pagamentos (POST /api/lotes/pagamentos/)"""
+    num_contrato = serializers.CharField(max_length=20)
+    cod_lancamento = serializers.IntegerField(min_value=1)
+    valor_pago = serializers.DecimalField(max_digits=14, decimal_places=2, min_value=Decimal('0.01'))
+    data_pagamento = serializers.DateField(required=False, allow_null=True)
+
+
+class ParcelaLoteSerializer(serializers.Serializer):
+    """Linha de um lote de parcelas (POST /api/lotes/parcelas/)"""
+    num_contrato = serializers.CharField(max_length=20)
+    data_vencimento = serializers.DateField()
+    valor_parcela = serializers.DecimalField(max_digits=14, decimal_places=2, min_value=Decimal('0.01'))
+    situacao = serializers.ChoiceField(choices=ItemContrato.SITUACAO_CHOICES, default='1')
@@ -1,11 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ProjetoViewSet, ContratoViewSet
+from .views import ContratoViewSet, PagamentoLoteView, ParcelaLoteView, ProjetoViewSet
 
 router = DefaultRouter()
 router.register(r'projetos', ProjetoViewSet)
 router.register(r'contratos', ContratoViewSet)
 
 urlpatterns = [
+    path('lotes/pagamentos/', PagamentoLoteView.as_view(), name='lote-pagamentos'),
+    path('lotes/parcelas/', ParcelaLoteView.as_view(), name='lote-parcelas'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,18 +1,140 @@
-from rest_framework import viewsets
-from .serializers import ProjetoSerializer, ContratoSerializer
+from rest_framework import status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .pagination import KeysetCursorPagination
+from .parsers import CSVParser
+from .permissions import PodeGerenciarContratos
+from .serializers import (
+    ContratoSerializer, PagamentoLoteSerializer, ParcelaLoteSerializer, ProjetoSerializer,
+)
 from apps.projetos.models import Projeto
 from apps.contratos.models import Contrato
+from apps.contratos.services.lancamentos_lote import LinhaLote, criar_parcelas, registrar_pagamentos
 
-class ProjetoViewSet(viewsets.ReadOnlyModelViewSet):
+
+class FetchPlanMixin:
+    """
+    ViewSet somente leitura sobre um FetchPlanSerializer:
+
+    - o queryset recebe o plano de busca do serializer (annotations,
+      select_related, only) para os campos pedidos;
+    - ?fields=a,b devolve apenas esses campos e reduz o SELECT;
+    - a listagem usa .values() e monta os dicts direto das linhas, sem
+      instanciar os modelos (values_fast_path).
+    """
+
+    fields_query_param = 'fields'
+    values_fast_path = True
+
+    def get_requested_fields(self):
+        if not hasattr(self, '_requested_fields'):
+            parametro = self.request.query_params.get(self.fields_query_param) if self.request else None
+            if not parametro:
+                self._requested_fields = None
+            else:
+                pedidos = [nome.strip() for nome in parametro.split(',') if nome.strip()]
+                invalidos = set(pedidos) - set(self.get_serializer_class()().fields)
+                if invalidos:
+                    raise ValidationError({self.fields_query_param: f'Campos inválidos: {", ".join(sorted(invalidos))}'})
+                self._requested_fields = pedidos
+        return self._requested_fields
+
+    def get_queryset(self):
+        return self.get_serializer_class().setup_queryset(super().get_queryset(), self.get_requested_fields())
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        if not self.values_fast_path:
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.get_serializer()
+        fontes = set(serializer.values_fields().values())
+        # Chaves do cursor entram no SELECT mesmo fora do ?fields=
+        fontes |= {nome.lstrip('-') for nome in getattr(self, 'keyset_ordering', None) or []}
+        linhas = self.filter_queryset(self.get_queryset()).values(*fontes)
+
+        pagina = self.paginate_queryset(linhas)
+        if pagina is not None:
+            return self.get_paginated_response(serializer.represent_values(pagina))
+        return Response(serializer.represent_values(linhas))
+
+
+class ProjetoViewSet(FetchPlanMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint que permite que projetos sejam visualizados.
     """
     queryset = Projeto.objects.all()
     serializer_class = ProjetoSerializer
+    pagination_class = KeysetCursorPagination
+    keyset_ordering = ['-data_inicio', 'cod_projeto']
 
-class ContratoViewSet(viewsets.ReadOnlyModelViewSet):
+class ContratoViewSet(FetchPlanMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint que permite que contratos sejam visualizados.
     """
     queryset = Contrato.objects.all()
-    serializer_class = ContratoSerializer
\ No newline at end of file
+    serializer_class = ContratoSerializer
+    pagination_class = KeysetCursorPagination
+    keyset_ordering = ['-data_inicio', 'num_contrato']
+    lookup_value_regex = '.+'  # num_contrato tem barra (ex.: 0001/2025)
+
+
+class LoteView(APIView):
+    """
+    Recebe um lote (lista JSON ou CSV com cabeçalho), valida todas as linhas
+    em memória e aplica as válidas de uma vez, em uma única transação.
+    Responde com o resultado de cada linha; com ?atomico=1, qualquer erro
+    cancela o lote inteiro (400).
+    """
+
+    parser_classes = [JSONParser, CSVParser]
+    permission_classes = [PodeGerenciarContratos]
+    serializer_class = None
+    aplicar = None
+    max_linhas = 50_000
+
+    def validar(self, corpo):
+        if isinstance(corpo, dict):
+            corpo = corpo.get('linhas')
+        if not isinstance(corpo, list):
+            raise ValidationError('Envie uma lista de linhas (JSON) ou um CSV com cabeçalho.')
+        if len(corpo) > self.max_linhas:
+            raise ValidationError(f'O lote aceita no máximo {self.max_linhas} linhas.')
+
+        # Uma única instância valida todas as linhas (os campos são montados uma vez)
+        serializer = self.serializer_class()
+        dados = []
+        for numero, linha in enumerate(corpo, start=1):
+            resultado = LinhaLote(numero)
+            try:
+                dados.append((resultado, serializer.run_validation(linha)))
+            except ValidationError as exc:
+                detalhes = exc.detail if isinstance(exc.detail, dict) else {'linha': exc.detail}
+                for campo, mensagens in detalhes.items():
+                    for mensagem in mensagens:
+                        resultado.erro(campo, str(mensagem))
+                dados.append((resultado, None))
+        return dados
+
+    def post(self, request, *args, **kwargs):
+        atomico = request.query_params.get('atomico') in ('1', 'true')
+        resultado = self.aplicar(self.validar(request.data), atomico=atomico)
+        codigo = status.HTTP_200_OK if resultado.aplicado else status.HTTP_400_BAD_REQUEST
+        return Response(resultado.to_dict(), status=codigo)
+
+
+class PagamentoLoteView(LoteView):
+    """Pagamentos de parcelas: num_contrato, cod_lancamento, valor_pago e data_pagamento (opcional)"""
+    serializer_class = PagamentoLoteSerializer
+    aplicar = staticmethod(registrar_pagamentos)
+
+
+class ParcelaLoteView(LoteView):
+    """Novas parcelas: num_contrato, data_vencimento, valor_parcela e situacao (padrão '1')"""
+    serializer_class = ParcelaLoteSerializer
+    aplicar = staticmethod(criar_parcelas)
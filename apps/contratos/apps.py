@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ContratosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.contratos'
+
+    def ready(self):
+        import apps.contratos.signals
@@ -0,0 +1,105 @@
+"""
+Management command para medir lançamentos de parcelas simultâneos em um
+mesmo contrato (o pior caso de disputa) e verificar que nenhum
+cod_lancamento se repete
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from apps.contratos.models import Contrato, ItemContrato
+
+CONTRATO_BENCHMARK = 'BENCH/LANC'
+
+
+def lancar_contador(contrato, dados):
+    """Caminho de ItemContratoCreateView: contador do contrato"""
+    with transaction.atomic():
+        [(cod_lancamento, num_parcela)] = Contrato.reservar_lancamentos(contrato)
+        ItemContrato.objects.create(
+            num_contrato_id=contrato, cod_lancamento=cod_lancamento, num_parcela=num_parcela, **dados
+        )
+
+
+def lancar_agregado(contrato, dados):
+    """Estratégia anterior: bloqueia as parcelas e calcula MAX/COUNT a cada lançamento"""
+    with transaction.atomic():
+        itens = ItemContrato.objects.select_for_update().filter(num_contrato_id=contrato)
+        ultimo = itens.aggregate(maior=Max('cod_lancamento'))['maior'] or 0
+        ItemContrato.objects.create(
+            num_contrato_id=contrato, cod_lancamento=ultimo + 1, num_parcela=itens.count() + 1, **dados
+        )
+
+
+ESTRATEGIAS = {'contador': lancar_contador, 'agregado': lancar_agregado}
+
+
+class Command(BaseCommand):
+    help = 'Mede lançamentos de parcelas em paralelo (inserções/s) e verifica duplicidade de cod_lancamento'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Threads simultâneas (padrão: 8)')
+        parser.add_argument('--lancamentos', type=int, default=50, help='Lançamentos por thread (padrão: 50)')
+        parser.add_argument(
+            '--estrategia',
+            action='append',
+            choices=sorted(ESTRATEGIAS),
+            help='Estratégia a medir (pode ser repetido; padrão: todas)'
+        )
+
+    def handle(self, *args, **options):
+        hoje = timezone.now().date()
+        dados = {
+            'data_lancamento': hoje, 'data_vencimento': hoje + timedelta(days=30),
+            'valor_parcela': Decimal('100.00'), 'situacao': '1',
+        }
+
+        for nome in options['estrategia'] or sorted(ESTRATEGIAS, reverse=True):
+            Contrato.objects.filter(pk=CONTRATO_BENCHMARK).delete()
+            Contrato.objects.create(
+                num_contrato=CONTRATO_BENCHMARK, cod_ordem=0, descricao='Benchmark de lançamentos',
+            )
+            try:
+                self.medir(nome, ESTRATEGIAS[nome], dados, options['threads'], options['lancamentos'])
+            finally:
+                Contrato.objects.filter(pk=CONTRATO_BENCHMARK).delete()
+
+    def medir(self, nome, lancar, dados, threads, lancamentos):
+        erros = []
+        trava = threading.Lock()
+
+        def executar(_):
+            try:
+                for _ in range(lancamentos):
+                    try:
+                        lancar(CONTRATO_BENCHMARK, dados)
+                    except DatabaseError as exc:
+                        with trava:
+                            erros.append(exc)
+            finally:
+                connection.close()
+
+        inicio = time.monotonic()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(executar, range(threads)))
+        duracao = time.monotonic() - inicio
+
+        itens = ItemContrato.objects.filter(num_contrato_id=CONTRATO_BENCHMARK)
+        gravados = itens.count()
+        duplicados = itens.values('cod_lancamento').annotate(n=Count('pk')).filter(n__gt=1).count()
+        taxa = gravados / duracao if duracao else gravados
+
+        estilo = self.style.SUCCESS if not erros and not duplicados else self.style.WARNING
+        self.stdout.write(estilo(
+            f'{nome:<10} {gravados:>6} gravados  {len(erros):>5} erros  {duplicados:>3} duplicados  '
+            f'{duracao:>7.2f}s  {taxa:>8.0f} lançamentos/s'
+        ))
+        if erros:
+            self.stdout.write(f'           primeiro erro: {erros[0]}')
@@ -0,0 +1,143 @@
+"""
+Management command para verificar, com EXPLAIN, se as consultas quentes de
+dashboard e relatórios usam os índices de contrato e itens_contrato
+"""
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.contratos.models import Contrato, ItemContrato
+from apps.core.pagination import KeysetPaginator
+from apps.dashboard.services.aging_report import AgingReport
+
+
+@dataclass
+class PlanoConsulta:
+    nome: str
+    indice: str
+    queryset: object  # callable(hoje) -> QuerySet
+
+
+CONSULTAS = [
+    PlanoConsulta(
+        'aging.vencidas', 'itens_situacao_venc_idx',
+        lambda hoje: AgingReport(hoje=hoje).vencidas(),
+    ),
+    PlanoConsulta(
+        'dashboard.vencimentos', 'itens_situacao_venc_idx',
+        lambda hoje: ItemContrato.objects.filter(situacao='1', data_vencimento=hoje + timedelta(days=7)),
+    ),
+    PlanoConsulta(
+        'pagamentos.periodo', 'itens_pagamento_idx',
+        lambda hoje: ItemContrato.objects.filter(
+            valor_pago__gt=0, data_pagamento__gte=hoje - timedelta(days=30), data_pagamento__lt=hoje,
+        ),
+    ),
+    PlanoConsulta(
+        'relatorios.financeiro', 'itens_pagamento_idx',
+        lambda hoje: ItemContrato.objects.filter(valor_pago__gt=0).order_by('-data_pagamento')[:100],
+    ),
+    PlanoConsulta(
+        'dashboard.contratos_pj_vencidos', 'contrato_tipo_sit_inicio_idx',
+        lambda hoje: Contrato.objects.filter(tipo_pessoa=2, situacao='2', data_fim__lt=hoje),
+    ),
+    PlanoConsulta(
+        'relatorios.contratos_tipo_periodo', 'contrato_tipo_sit_inicio_idx',
+        lambda hoje: Contrato.objects.filter(
+            tipo_pessoa=1, situacao__in=['1', '2'], data_inicio__gte=hoje - timedelta(days=365),
+        ),
+    ),
+    PlanoConsulta(
+        'dashboard.serie_mensal', 'contrato_inicio_num_idx',
+        lambda hoje: Contrato.objects.filter(
+            data_inicio__gte=hoje.replace(day=1) - timedelta(days=180), data_inicio__lt=hoje.replace(day=1),
+        ),
+    ),
+    PlanoConsulta(
+        'parcelas.cursor', 'itens_vencimento_id_idx',
+        lambda hoje: _pagina_cursor(ItemContrato.objects.all(), ['data_vencimento', 'id']),
+    ),
+    PlanoConsulta(
+        'contratos.cursor', 'contrato_inicio_num_idx',
+        lambda hoje: _pagina_cursor(Contrato.objects.all(), ['-data_inicio', 'num_contrato']),
+    ),
+]
+
+
+def _pagina_cursor(queryset, ordering, tamanho=15):
+    """Consulta de uma página do meio da listagem paginada por cursor"""
+    paginador = KeysetPaginator(queryset, ordering, tamanho)
+    meio = queryset.order_by(*ordering)[queryset.count() // 2:].first()
+    valores = None if meio is None else [getattr(meio, campo.attname) for campo, _ in paginador.chaves]
+    return paginador.segmentos(valores)[0]
+
+
+class Command(BaseCommand):
+    help = 'Executa EXPLAIN das consultas de dashboard/relatórios e verifica o uso dos índices'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Popula antes uma massa sintética com aproximadamente N registros (populate_database --synthetic)'
+        )
+        parser.add_argument(
+            '--no-assert',
+            action='store_true',
+            help='Apenas reporta os planos, sem falhar quando um índice não for usado'
+        )
+        parser.add_argument(
+            '--verbose-plan',
+            action='store_true',
+            help='Mostra o plano completo de cada consulta'
+        )
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            call_command('populate_database', synthetic=options['seed'], stdout=self.stdout)
+
+        if not ItemContrato.objects.exists():
+            self.stdout.write(self.style.WARNING(
+                'itens_contrato está vazia: use --seed para um plano representativo'
+            ))
+
+        # Estatísticas atualizadas para o otimizador escolher como faria em produção
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        hoje = timezone.now().date()
+        falhas = []
+        self.stdout.write(f"{'Consulta':<36} {'Índice esperado':<30} {'Usado':<6} {'Linhas':>8} {'Tempo (ms)':>11}")
+
+        for consulta in CONSULTAS:
+            queryset = consulta.queryset(hoje)
+            plano = queryset.explain()
+
+            inicio = time.perf_counter()
+            linhas = len(list(queryset.values_list('pk', flat=True)))
+            duracao = (time.perf_counter() - inicio) * 1000
+
+            usado = consulta.indice in plano
+            if not usado:
+                falhas.append(consulta.nome)
+
+            estilo = self.style.SUCCESS if usado else self.style.ERROR
+            self.stdout.write(
+                f'{consulta.nome:<36} {consulta.indice:<30} {estilo("sim" if usado else "não"):<6} '
+                f'{linhas:>8} {duracao:>11.2f}'
+            )
+            if options['verbose_plan'] or not usado:
+                for linha in plano.splitlines():
+                    self.stdout.write(f'    {linha}')
+
+        if falhas and not options['no_assert']:
+            raise CommandError(f'Consultas sem uso do índice esperado: {", ".join(falhas)}')
+
+        self.stdout.write(self.style.SUCCESS('Todas as consultas usam os índices esperados'
+                                             if not falhas else 'Benchmark concluído'))
@@ -0,0 +1,24 @@
+"""
+Management command para reconstruir o consolidado financeiro mensal
+"""
+import time
+from django.core.management.base import BaseCommand
+from apps.contratos.models import MonthlyFinancialRollup
+from apps.core.cache import bump_version
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói a tabela rollup_financeiro_mensal a partir de itens_contrato'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Reconstruindo consolidado financeiro mensal...')
+
+        inicio = time.monotonic()
+        total = MonthlyFinancialRollup.rebuild()
+        duracao = time.monotonic() - inicio
+        # Receitas em cache (páginas e analytics) são lidas do consolidado
+        bump_version('contratos.ItemContrato')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Consolidado reconstruído: {total} linhas em {duracao:.2f}s')
+        )
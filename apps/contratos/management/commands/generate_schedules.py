@@ -0,0 +1,81 @@
+"""
+Management command para gerar o cronograma de parcelas dos contratos que
+ainda não têm parcelas lançadas
+"""
+import time
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+from apps.contratos.models import Contrato, ItemContrato
+from apps.contratos.services.cronograma import gerar_cronogramas
+
+
+class Command(BaseCommand):
+    help = 'Gera as parcelas (valor, parcelas, data da parcela inicial) dos contratos sem parcelas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--contrato',
+            action='append',
+            dest='contratos',
+            metavar='NUM_CONTRATO',
+            help='Gera apenas para este contrato (pode ser repetido)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Contratos por transação (padrão: 1000)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Apenas conta contratos e parcelas, sem gravar'
+        )
+
+    def pendentes(self, contratos=None):
+        queryset = Contrato.objects.filter(
+            valor__gt=0, parcelas__gt=0, data_parcela_inicial__isnull=False,
+        ).exclude(
+            Exists(ItemContrato.objects.filter(num_contrato=OuterRef('pk')))
+        )
+        if contratos:
+            queryset = queryset.filter(pk__in=contratos)
+        return queryset.order_by('pk')
+
+    def handle(self, *args, **options):
+        queryset = self.pendentes(options['contratos'])
+        batch_size = options['batch_size']
+
+        if options['dry_run']:
+            total = 0
+            quantidade = 0
+            for contrato in queryset.only('pk', 'valor', 'parcelas', 'data_parcela_inicial').iterator():
+                quantidade += 1
+                total += len(contrato.calcular_parcelas())
+            self.stdout.write(f'{quantidade} contratos sem parcelas; {total} parcelas seriam geradas')
+            return
+
+        self.stdout.write('Gerando cronogramas de parcelas...')
+        inicio = time.monotonic()
+        contratos = parcelas = ignorados = 0
+        ultimo = None
+        while True:
+            lote = queryset if ultimo is None else queryset.filter(pk__gt=ultimo)
+            numeros = list(lote.values_list('pk', flat=True)[:batch_size])
+            if not numeros:
+                break
+            resultado = gerar_cronogramas(numeros)
+            contratos += resultado.contratos
+            parcelas += resultado.parcelas
+            ignorados += resultado.ignorados
+            ultimo = numeros[-1]
+            self.stdout.write(f'  {contratos} contratos, {parcelas} parcelas...')
+
+        duracao = time.monotonic() - inicio
+        taxa = parcelas / duracao if duracao else parcelas
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Cronogramas gerados: {contratos} contratos, {parcelas} parcelas '
+                f'({ignorados} ignorados) em {duracao:.2f}s ({taxa:.0f} parcelas/s)'
+            )
+        )
@@ -0,0 +1,30 @@
+"""
+Management command para recalcular o resumo de pagamentos dos contratos
+"""
+import time
+from django.core.management.base import BaseCommand
+from apps.contratos.models import Contrato
+
+
+class Command(BaseCommand):
+    help = 'Recalcula total_pago, total_previsto e os contadores de lançamentos dos contratos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--contrato',
+            action='append',
+            dest='contratos',
+            metavar='NUM_CONTRATO',
+            help='Recalcula apenas este contrato (pode ser repetido)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Recalculando resumo de pagamentos dos contratos...')
+
+        inicio = time.monotonic()
+        total = Contrato.atualizar_resumo(options['contratos'])
+        duracao = time.monotonic() - inicio
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Resumo recalculado: {total} contratos em {duracao:.2f}s')
+        )
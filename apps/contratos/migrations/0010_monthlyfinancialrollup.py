@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-17 12:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0009_alter_contrato_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyFinancialRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ano', models.IntegerField(verbose_name='Ano')),
+                ('mes', models.IntegerField(verbose_name='Mês')),
+                ('tipo_pessoa', models.IntegerField(blank=True, null=True, verbose_name='Tipo de Pessoa')),
+                ('situacao', models.CharField(max_length=20, verbose_name='Situação')),
+                ('valor_parcela', models.DecimalField(decimal_places=2, default=0, max_digits=16, verbose_name='Soma do Valor das Parcelas')),
+                ('valor_pago', models.DecimalField(decimal_places=2, default=0, max_digits=16, verbose_name='Soma do Valor Pago')),
+                ('quantidade', models.IntegerField(default=0, verbose_name='Quantidade de Parcelas')),
+            ],
+            options={
+                'verbose_name': 'Consolidado Financeiro Mensal',
+                'verbose_name_plural': 'Consolidados Financeiros Mensais',
+                'db_table': 'rollup_financeiro_mensal',
+                'unique_together': {('ano', 'mes', 'tipo_pessoa', 'situacao')},
+            },
+        ),
+    ]
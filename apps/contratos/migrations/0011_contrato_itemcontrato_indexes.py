@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-17 12:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0010_monthlyfinancialrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contrato',
+            index=models.Index(fields=['tipo_pessoa', 'situacao', 'data_inicio'], name='contrato_tipo_sit_inicio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='itemcontrato',
+            index=models.Index(fields=['situacao', 'data_vencimento'], name='itens_situacao_venc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='itemcontrato',
+            index=models.Index(condition=models.Q(('valor_pago__gt', 0)), fields=['data_pagamento'], name='itens_pagamento_idx'),
+        ),
+    ]
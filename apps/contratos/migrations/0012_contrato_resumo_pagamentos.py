@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-17 12:51
+
+from django.db import migrations, models
+
+
+def preencher_resumo(apps, schema_editor):
+    from apps.contratos.models.contrato import resumo_pagamentos
+
+    Contrato = apps.get_model('contratos', 'Contrato')
+    ItemContrato = apps.get_model('contratos', 'ItemContrato')
+    Contrato.objects.update(**resumo_pagamentos(ItemContrato))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0011_contrato_itemcontrato_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contrato',
+            name='parcelas_vencidas',
+            field=models.IntegerField(db_column='parcelasVencidas', default=0, editable=False, verbose_name='Parcelas Vencidas'),
+        ),
+        migrations.AddField(
+            model_name='contrato',
+            name='proximo_vencimento',
+            field=models.DateField(blank=True, db_column='proximoVencimento', editable=False, null=True, verbose_name='Próximo Vencimento'),
+        ),
+        migrations.AddField(
+            model_name='contrato',
+            name='total_pago',
+            field=models.DecimalField(db_column='totalPago', decimal_places=2, default=0, editable=False, max_digits=14, verbose_name='Total Pago'),
+        ),
+        migrations.AddField(
+            model_name='contrato',
+            name='total_previsto',
+            field=models.DecimalField(db_column='totalPrevisto', decimal_places=2, default=0, editable=False, max_digits=14, verbose_name='Total Previsto'),
+        ),
+        migrations.RunPython(preencher_resumo, migrations.RunPython.noop),
+    ]
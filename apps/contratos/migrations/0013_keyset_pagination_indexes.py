@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 12:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0012_contrato_resumo_pagamentos'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contrato',
+            index=models.Index(fields=['-data_inicio', 'num_contrato'], name='contrato_inicio_num_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='itemcontrato',
+            index=models.Index(fields=['data_vencimento', 'id'], name='itens_vencimento_id_idx'),
+        ),
+    ]
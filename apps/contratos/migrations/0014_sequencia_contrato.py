@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-17 13:16
+
+from django.db import migrations, models
+
+
+def preencher_sequencias(apps, schema_editor):
+    from apps.contratos.models.sequencia import SequenciaContrato as Sequencia
+
+    Contrato = apps.get_model('contratos', 'Contrato')
+    SequenciaContrato = apps.get_model('contratos', 'SequenciaContrato')
+    SequenciaContrato.objects.bulk_create([
+        SequenciaContrato(ano=ano, ultimo=Sequencia.maior_numero(Contrato, ano))
+        for ano in Sequencia.anos_existentes(Contrato)
+    ])
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0013_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SequenciaContrato',
+            fields=[
+                ('ano', models.IntegerField(primary_key=True, serialize=False, verbose_name='Ano')),
+                ('ultimo', models.IntegerField(default=0, verbose_name='Último Número Emitido')),
+            ],
+            options={
+                'verbose_name': 'Sequência de Contratos',
+                'verbose_name_plural': 'Sequências de Contratos',
+                'db_table': 'sequencia_contrato',
+            },
+        ),
+        migrations.RunPython(preencher_sequencias, migrations.RunPython.noop),
+    ]
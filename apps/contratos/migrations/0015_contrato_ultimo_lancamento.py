@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-17 13:19
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def preencher_ultimo_lancamento(apps, schema_editor):
+    Contrato = apps.get_model('contratos', 'Contrato')
+    ItemContrato = apps.get_model('contratos', 'ItemContrato')
+    maior = ItemContrato.objects.filter(num_contrato=OuterRef('pk')).order_by(
+        '-cod_lancamento'
+    ).values('cod_lancamento')[:1]
+    Contrato.objects.update(ultimo_lancamento=Coalesce(Subquery(maior), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0014_sequencia_contrato'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contrato',
+            name='ultimo_lancamento',
+            field=models.IntegerField(db_column='ultimoLancamento', default=0, editable=False, verbose_name='Último Lançamento'),
+        ),
+        migrations.RunPython(preencher_ultimo_lancamento, migrations.RunPython.noop),
+    ]
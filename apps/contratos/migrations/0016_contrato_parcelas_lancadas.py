@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-17 14:10
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def preencher_parcelas_lancadas(apps, schema_editor):
+    Contrato = apps.get_model('contratos', 'Contrato')
+    ItemContrato = apps.get_model('contratos', 'ItemContrato')
+    total = ItemContrato.objects.filter(num_contrato=OuterRef('pk')).order_by().values(
+        'num_contrato'
+    ).annotate(total=Count('pk')).values('total')
+    Contrato.objects.update(parcelas_lancadas=Coalesce(Subquery(total), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0015_contrato_ultimo_lancamento'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contrato',
+            name='parcelas_lancadas',
+            field=models.IntegerField(db_column='parcelasLancadas', default=0, editable=False, verbose_name='Parcelas Lançadas'),
+        ),
+        migrations.RunPython(preencher_parcelas_lancadas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 14:07
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0016_contrato_parcelas_lancadas'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='contrato',
+            name='parcelas_vencidas',
+        ),
+        migrations.RemoveField(
+            model_name='contrato',
+            name='proximo_vencimento',
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-17 14:08
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+import django.db.models.functions.comparison
+
+
+def remover_buckets_duplicados(apps, schema_editor):
+    # Com tipo_pessoa nulo o unique_together anterior não impedia duplicatas:
+    # fica a linha mais recente de cada bucket
+    MonthlyFinancialRollup = apps.get_model('contratos', 'MonthlyFinancialRollup')
+    duplicados = (MonthlyFinancialRollup.objects.filter(tipo_pessoa__isnull=True)
+                  .values('ano', 'mes', 'situacao')
+                  .annotate(total=Count('pk'), manter=Max('pk'))
+                  .filter(total__gt=1)
+                  .order_by())
+    for bucket in duplicados:
+        MonthlyFinancialRollup.objects.filter(
+            tipo_pessoa__isnull=True, ano=bucket['ano'], mes=bucket['mes'], situacao=bucket['situacao'],
+        ).exclude(pk=bucket['manter']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0017_remove_contrato_vencimentos'),
+    ]
+
+    operations = [
+        migrations.RunPython(remover_buckets_duplicados, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='monthlyfinancialrollup',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyfinancialrollup',
+            constraint=models.UniqueConstraint(models.F('ano'), models.F('mes'), django.db.models.functions.comparison.Coalesce('tipo_pessoa', 0), models.F('situacao'), name='rollup_bucket_unico'),
+        ),
+    ]
@@ -2,3 +2,5 @@
 from .contrato import Contrato
 from .item_contrato import ItemContrato
 from .prestador import Prestador
+from .monthly_rollup import MonthlyFinancialRollup
+from .sequencia import SequenciaContrato
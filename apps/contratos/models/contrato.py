@@ -1,5 +1,30 @@
 from django.db import models
+from django.db.models import Count, DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
 from decimal import Decimal
+from apps.core.managers.base import ContratoManager
+
+
+def resumo_pagamentos(item_model):
+    """
+    Expressões (subconsultas correlacionadas por contrato) dos totais de
+    pagamentos. Recebe o modelo de itens para servir também às migrações.
+    Parcelas canceladas ('2') não entram nos totais. O que depende da data
+    (parcelas vencidas, próximo vencimento) é calculado na consulta, em
+    relação a hoje (ContratoManager.com_vencimentos).
+    """
+    dinheiro = DecimalField(max_digits=14, decimal_places=2)
+    itens = item_model.objects.filter(num_contrato=OuterRef('pk')).exclude(situacao='2').order_by()
+
+    def total(campo):
+        subconsulta = itens.values('num_contrato').annotate(total=Sum(campo)).values('total')
+        return Coalesce(Subquery(subconsulta, output_field=dinheiro), Value(Decimal('0')), output_field=dinheiro)
+
+    return {
+        'total_pago': total('valor_pago'),
+        'total_previsto': total('valor_parcela'),
+    }
+
 
 class Contrato(models.Model):
     '''
@@ -91,6 +116,40 @@ class Contrato(models.Model):
         null=True,
         blank=True
     )
+
+    # Resumo de pagamentos, mantido pelos signals de ItemContrato (atualizar_resumo)
+    total_pago = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        editable=False,
+        db_column='totalPago',
+        verbose_name='Total Pago'
+    )
+    total_previsto = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        editable=False,
+        db_column='totalPrevisto',
+        verbose_name='Total Previsto'
+    )
+    # Maior cod_lancamento já emitido; reservar_lancamentos incrementa
+    ultimo_lancamento = models.IntegerField(
+        default=0,
+        editable=False,
+        db_column='ultimoLancamento',
+        verbose_name='Último Lançamento'
+    )
+    # Parcelas gravadas; dá o num_parcela em reservar_lancamentos sem contar as parcelas
+    parcelas_lancadas = models.IntegerField(
+        default=0,
+        editable=False,
+        db_column='parcelasLancadas',
+        verbose_name='Parcelas Lançadas'
+    )
+
+    objects = ContratoManager()
     
     class Meta:
         db_table = 'contrato'
@@ -101,22 +160,20 @@ class Contrato(models.Model):
         return f"{self.num_contrato} - {self.contratado}"
 
     @classmethod
-    def gerar_numero_contrato(cls):
+    def gerar_numero_contrato(cls, ano=None):
         """Gera próximo número de contrato no formato NNNN/AAAA"""
+        return cls.reservar_numeros(1, ano)[0]
+
+    @classmethod
+    def reservar_numeros(cls, quantidade, ano=None):
+        """
+        Reserva um bloco de `quantidade` números NNNN/AAAA consecutivos (ex.:
+        importações em lote) com um único incremento da sequência do ano.
+        """
         from django.utils import timezone
-        ano_atual = timezone.now().year
-        
-        # Buscar último contrato do ano
-        ultimo_contrato = cls.objects.filter(
-            num_contrato__endswith=f'/{ano_atual}'
-        ).order_by('-num_contrato').first()
-        
-        if ultimo_contrato:
-            numero = int(ultimo_contrato.num_contrato.split('/')[0]) + 1
-        else:
-            numero = 1
-        
-        return f"{numero:04d}/{ano_atual}"
+        from .sequencia import SequenciaContrato
+        ano = ano or timezone.now().year
+        return [f"{numero:04d}/{ano}" for numero in SequenciaContrato.reservar(ano, quantidade)]
     
     def clean(self):
         """Validações do modelo"""
@@ -142,9 +199,13 @@ class Contrato(models.Model):
         return new_status in transicoes_permitidas.get(self.situacao, [])
     
     def calcular_parcelas(self):
-        """Calcula valores das parcelas"""
-        # Método simplificado para compatibilidade
-        return []
+        """
+        Cronograma previsto (lista de ParcelaPrevista), calculado em memória a
+        partir de valor, parcelas e data_parcela_inicial. Para gravar, use
+        services.cronograma.gerar_cronogramas.
+        """
+        from apps.contratos.services.cronograma import calcular_cronograma
+        return calcular_cronograma(self.valor, self.parcelas, self.data_parcela_inicial)
     
     def get_status_prazo(self):
         """Retorna status do prazo (semáforo) - RF-20"""
@@ -179,13 +240,69 @@ class Contrato(models.Model):
     
     def get_valor_pendente(self):
         """Retorna valor total pendente de pagamento"""
-        return 0
+        return max(self.total_previsto - self.total_pago, Decimal('0'))
     
     def get_valor_pago(self):
         """Retorna valor total já pago"""
-        return 0
+        return self.total_pago
+
+    @classmethod
+    def atualizar_resumo(cls, num_contratos=None):
+        """
+        Recalcula total_pago, total_previsto, ultimo_lancamento e parcelas_lancadas
+        com um único UPDATE ... SET campo = (SELECT ...). Sem `num_contratos`,
+        atualiza todos os contratos. Retorna o número de contratos atualizados.
+        """
+        from .item_contrato import ItemContrato
+
+        contratos = cls.objects.all()
+        if num_contratos is not None:
+            contratos = contratos.filter(pk__in=[num for num in num_contratos if num])
+        # Lançamentos gravados sem reservar_lancamentos (importações, admin) avançam o contador
+        maior_lancamento = ItemContrato.objects.filter(num_contrato=OuterRef('pk')).order_by(
+            '-cod_lancamento'
+        ).values('cod_lancamento')[:1]
+        total_parcelas = ItemContrato.objects.filter(num_contrato=OuterRef('pk')).order_by().values(
+            'num_contrato'
+        ).annotate(total=Count('pk')).values('total')
+        return contratos.update(
+            ultimo_lancamento=Greatest('ultimo_lancamento', Coalesce(Subquery(maior_lancamento), 0)),
+            parcelas_lancadas=Coalesce(Subquery(total_parcelas), 0),
+            **resumo_pagamentos(ItemContrato),
+        )
+
+    @classmethod
+    def reservar_lancamentos(cls, num_contrato, quantidade=1):
+        """
+        Reserva `quantidade` lançamentos do contrato e devolve os pares
+        (cod_lancamento, num_parcela). Deve rodar na mesma transação que grava
+        as parcelas: o UPDATE dos contadores (ultimo_lancamento e
+        parcelas_lancadas) bloqueia só a linha do contrato até o commit, então
+        lançamentos simultâneos esperam a vez sem repetir números. As parcelas
+        não são lidas nem bloqueadas.
+        """
+        from django.db import transaction
+
+        with transaction.atomic():
+            contrato = cls.objects.filter(pk=num_contrato)
+            atualizados = contrato.update(
+                ultimo_lancamento=F('ultimo_lancamento') + quantidade,
+                parcelas_lancadas=F('parcelas_lancadas') + quantidade,
+            )
+            if not atualizados:
+                raise cls.DoesNotExist(f'Contrato {num_contrato} não encontrado')
+            ultimo, parcelas = contrato.values_list('ultimo_lancamento', 'parcelas_lancadas').get()
+        primeiro = ultimo - quantidade + 1
+        primeira_parcela = parcelas - quantidade + 1
+        return [(primeiro + indice, primeira_parcela + indice) for indice in range(quantidade)]
     
     class Meta:
         db_table = 'contrato'
         verbose_name = 'Contrato'
         verbose_name_plural = 'Contratos'
+        indexes = [
+            # KPIs e listagens por tipo de pessoa e situação, com período de início
+            models.Index(fields=['tipo_pessoa', 'situacao', 'data_inicio'], name='contrato_tipo_sit_inicio_idx'),
+            # Séries mensais, filtros de período e paginação por cursor (-data_inicio, num_contrato)
+            models.Index(fields=['-data_inicio', 'num_contrato'], name='contrato_inicio_num_idx'),
+        ]
@@ -68,4 +68,16 @@ class ItemContrato(models.Model):
         db_table = 'itens_contrato'
         verbose_name = 'Item do Contrato'
         verbose_name_plural = 'Itens do Contrato'
-        unique_together = [['num_contrato', 'cod_lancamento']]
\ No newline at end of file
+        unique_together = [['num_contrato', 'cod_lancamento']]
+        indexes = [
+            # Parcelas em aberto/vencidas e vencimentos próximos
+            models.Index(fields=['situacao', 'data_vencimento'], name='itens_situacao_venc_idx'),
+            # Paginação por cursor da lista de parcelas (data_vencimento, id)
+            models.Index(fields=['data_vencimento', 'id'], name='itens_vencimento_id_idx'),
+            # Pagamentos realizados (valor_pago > 0) por período de pagamento
+            models.Index(
+                fields=['data_pagamento'],
+                condition=models.Q(valor_pago__gt=0),
+                name='itens_pagamento_idx',
+            ),
+        ]
\ No newline at end of file
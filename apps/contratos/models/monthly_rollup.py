@@ -0,0 +1,165 @@
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+from datetime import date
+
+
+class MonthlyFinancialRollupQuerySet(models.QuerySet):
+
+    def periodo(self, inicio, fim):
+        """Filtra meses no intervalo [inicio, fim) - datas no primeiro dia do mês"""
+        filtro = Q(ano__gt=inicio.year) | Q(ano=inicio.year, mes__gte=inicio.month)
+        filtro &= Q(ano__lt=fim.year) | Q(ano=fim.year, mes__lt=fim.month)
+        return self.filter(filtro)
+
+    def por_mes(self):
+        """Totais agrupados por (ano, mês), em ordem cronológica"""
+        return self.values('ano', 'mes').annotate(
+            total_pago=Sum('valor_pago'),
+            total_parcelas=Sum('valor_parcela'),
+            total_quantidade=Sum('quantidade'),
+        ).order_by('ano', 'mes')
+
+
+class MonthlyFinancialRollup(models.Model):
+    '''
+    Consolidado mensal dos pagamentos de parcelas (itens_contrato),
+    agrupado pelo mês de data_pagamento, tipo de pessoa do contrato e
+    situação da parcela. Mantido pelos signals de ItemContrato e
+    reconstruído pelo comando build_financial_rollup.
+    '''
+
+    ano = models.IntegerField(verbose_name='Ano')
+    mes = models.IntegerField(verbose_name='Mês')
+    tipo_pessoa = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Tipo de Pessoa'
+    )
+    situacao = models.CharField(
+        max_length=20,
+        verbose_name='Situação'
+    )
+    valor_parcela = models.DecimalField(
+        max_digits=16,
+        decimal_places=2,
+        default=0,
+        verbose_name='Soma do Valor das Parcelas'
+    )
+    valor_pago = models.DecimalField(
+        max_digits=16,
+        decimal_places=2,
+        default=0,
+        verbose_name='Soma do Valor Pago'
+    )
+    quantidade = models.IntegerField(
+        default=0,
+        verbose_name='Quantidade de Parcelas'
+    )
+
+    objects = MonthlyFinancialRollupQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'rollup_financeiro_mensal'
+        verbose_name = 'Consolidado Financeiro Mensal'
+        verbose_name_plural = 'Consolidados Financeiros Mensais'
+        constraints = [
+            # NULLs não colidem em UNIQUE: tipo_pessoa desconhecido entra na chave como 0,
+            # para que dois INSERTs simultâneos do mesmo bucket esbarrem no IntegrityError
+            models.UniqueConstraint(
+                'ano', 'mes', Coalesce('tipo_pessoa', 0), 'situacao', name='rollup_bucket_unico',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.mes:02d}/{self.ano} - {self.situacao} - R$ {self.valor_pago}"
+
+    @staticmethod
+    def _itens_pagos():
+        from .item_contrato import ItemContrato
+        return ItemContrato.objects.filter(valor_pago__gt=0, data_pagamento__isnull=False)
+
+    @classmethod
+    def bucket_de(cls, data_pagamento, valor_pago, tipo_pessoa, situacao):
+        """Chave (ano, mes, tipo_pessoa, situacao) de uma parcela, ou None se não paga"""
+        if not data_pagamento or not valor_pago or valor_pago <= 0:
+            return None
+        return (data_pagamento.year, data_pagamento.month, tipo_pessoa, situacao)
+
+    @classmethod
+    def refresh_bucket(cls, ano, mes, tipo_pessoa, situacao):
+        """Recalcula uma única linha do consolidado a partir de itens_contrato"""
+        inicio = date(ano, mes, 1)
+        fim = date(ano + 1, 1, 1) if mes == 12 else date(ano, mes + 1, 1)
+
+        itens = cls._itens_pagos().filter(
+            data_pagamento__gte=inicio,
+            data_pagamento__lt=fim,
+            situacao=situacao,
+        )
+        if tipo_pessoa is None:
+            itens = itens.filter(num_contrato__tipo_pessoa__isnull=True)
+        else:
+            itens = itens.filter(num_contrato__tipo_pessoa=tipo_pessoa)
+
+        dados = itens.aggregate(
+            valor_parcela=Sum('valor_parcela'),
+            valor_pago=Sum('valor_pago'),
+            quantidade=Count('pk'),
+        )
+        chave = {'ano': ano, 'mes': mes, 'tipo_pessoa': tipo_pessoa, 'situacao': situacao}
+
+        if not dados['quantidade']:
+            cls.objects.filter(**chave).delete()
+        elif not cls.objects.filter(**chave).update(**dados):
+            try:
+                with transaction.atomic():
+                    cls.objects.create(**chave, **dados)
+            except IntegrityError:
+                # Outra transação criou o bucket primeiro
+                cls.objects.filter(**chave).update(**dados)
+
+    @classmethod
+    def refresh_contrato(cls, num_contrato, tipos_pessoa):
+        """Recalcula, para cada tipo de pessoa, os buckets que têm parcelas pagas do contrato"""
+        meses = (cls._itens_pagos()
+                 .filter(num_contrato=num_contrato)
+                 .annotate(ano=ExtractYear('data_pagamento'), mes=ExtractMonth('data_pagamento'))
+                 .values_list('ano', 'mes', 'situacao')
+                 .distinct()
+                 .order_by())
+        for ano, mes, situacao in list(meses):
+            for tipo_pessoa in tipos_pessoa:
+                cls.refresh_bucket(ano, mes, tipo_pessoa, situacao)
+
+    @classmethod
+    def rebuild(cls):
+        """Reconstrói o consolidado completo com um único GROUP BY"""
+        linhas = (cls._itens_pagos()
+                  .annotate(ano=ExtractYear('data_pagamento'), mes=ExtractMonth('data_pagamento'))
+                  .values('ano', 'mes', 'num_contrato__tipo_pessoa', 'situacao')
+                  .annotate(
+                      soma_parcela=Sum('valor_parcela'),
+                      soma_pago=Sum('valor_pago'),
+                      total=Count('pk'),
+                  )
+                  .order_by())
+
+        rollups = [
+            cls(
+                ano=linha['ano'],
+                mes=linha['mes'],
+                tipo_pessoa=linha['num_contrato__tipo_pessoa'],
+                situacao=linha['situacao'],
+                valor_parcela=linha['soma_parcela'] or 0,
+                valor_pago=linha['soma_pago'] or 0,
+                quantidade=linha['total'],
+            )
+            for linha in linhas
+        ]
+
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(rollups, batch_size=1000)
+
+        return len(rollups)
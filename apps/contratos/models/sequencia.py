@@ -0,0 +1,82 @@
+# apps/contratos/models/sequencia.py
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+
+
+class SequenciaContrato(models.Model):
+    '''
+    Último número de contrato emitido em cada ano (NNNN/AAAA). A reserva é
+    um UPDATE ultimo = ultimo + n na linha do ano, que bloqueia a linha até o
+    fim da transação: duas reservas simultâneas nunca recebem o mesmo número
+    e o custo não depende de quantos contratos existem.
+    '''
+
+    ano = models.IntegerField(primary_key=True, verbose_name='Ano')
+    ultimo = models.IntegerField(default=0, verbose_name='Último Número Emitido')
+
+    class Meta:
+        db_table = 'sequencia_contrato'
+        verbose_name = 'Sequência de Contratos'
+        verbose_name_plural = 'Sequências de Contratos'
+
+    def __str__(self):
+        return f"{self.ano}: {self.ultimo}"
+
+    @staticmethod
+    def anos_existentes(contrato_model):
+        """Anos (sufixo /AAAA) presentes nos números de contrato"""
+        return {
+            int(numero.rsplit('/', 1)[1])
+            for numero in contrato_model.objects.values_list('num_contrato', flat=True)
+            if '/' in numero and numero.rsplit('/', 1)[1].isdigit()
+        }
+
+    @staticmethod
+    def maior_numero(contrato_model, ano):
+        """Maior NNNN já usado em NNNN/ano; números fora do padrão são ignorados"""
+        numeros = contrato_model.objects.filter(
+            num_contrato__endswith=f'/{ano}'
+        ).values_list('num_contrato', flat=True)
+        return max(
+            (int(numero.split('/')[0]) for numero in numeros if numero.split('/')[0].isdigit()),
+            default=0,
+        )
+
+    @classmethod
+    def reservar(cls, ano, quantidade=1):
+        """
+        Reserva `quantidade` números consecutivos do ano e devolve o range
+        deles. A linha do ano é criada na primeira reserva, a partir do maior
+        número já existente (a única varredura por sufixo, uma vez por ano).
+        """
+        if quantidade < 1:
+            raise ValueError('A quantidade de números reservados deve ser positiva')
+
+        with transaction.atomic():
+            # O UPDATE vem antes de qualquer leitura: a transação já começa com
+            # o bloqueio de escrita e a leitura seguinte vê o próprio incremento
+            if not cls.objects.filter(ano=ano).update(ultimo=F('ultimo') + quantidade):
+                from .contrato import Contrato
+                inicial = cls.maior_numero(Contrato, ano)
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(ano=ano, ultimo=inicial + quantidade)
+                    return range(inicial + 1, inicial + quantidade + 1)
+                except IntegrityError:
+                    # Outra transação criou a linha do ano primeiro
+                    cls.objects.filter(ano=ano).update(ultimo=F('ultimo') + quantidade)
+            ultimo = cls.objects.values_list('ultimo', flat=True).get(ano=ano)
+        return range(ultimo - quantidade + 1, ultimo + 1)
+
+    @classmethod
+    def sincronizar(cls, anos=None):
+        """
+        Avança a sequência de cada ano até o maior número existente. Usado
+        após importações que gravam num_contrato diretamente.
+        """
+        from .contrato import Contrato
+        for ano in cls.anos_existentes(Contrato) if anos is None else anos:
+            maior = cls.maior_numero(Contrato, ano)
+            _, criada = cls.objects.get_or_create(ano=ano, defaults={'ultimo': maior})
+            if not criada:
+                cls.objects.filter(ano=ano, ultimo__lt=maior).update(ultimo=maior)
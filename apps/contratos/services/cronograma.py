@@ -0,0 +1,106 @@
+# apps/contratos/services/cronograma.py
+import calendar
+from dataclasses import dataclass
+from datetime import date
+from decimal import ROUND_DOWN, Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.contratos.models import ItemContrato
+from apps.contratos.services.lancamentos_lote import (
+    BATCH_SIZE, atualizar_derivados, numeracao_atual, travar_contratos,
+)
+
+CENTAVO = Decimal('0.01')
+CAMPOS_CONTRATO = ('pk', 'valor', 'parcelas', 'data_parcela_inicial', 'ultimo_lancamento')
+
+
+@dataclass(frozen=True)
+class ParcelaPrevista:
+    num_parcela: int
+    data_vencimento: date
+    valor: Decimal
+
+
+def somar_meses(data, meses):
+    """
+    Mesma data `meses` depois; dias que não existem no mês de destino caem no
+    último dia dele (31/01 + 1 mês = 28/02, + 2 meses = 31/03).
+    """
+    indice = data.month - 1 + meses
+    ano, mes = data.year + indice // 12, indice % 12 + 1
+    return date(ano, mes, min(data.day, calendar.monthrange(ano, mes)[1]))
+
+
+def calcular_cronograma(valor, parcelas, data_inicial):
+    """
+    Plano de `parcelas` parcelas mensais a partir de `data_inicial`. Os
+    valores são truncados em centavos e a sobra do arredondamento vai para a
+    última parcela, de modo que a soma é exatamente `valor`.
+    """
+    if not valor or not parcelas or parcelas < 1 or not data_inicial:
+        return []
+
+    valor = Decimal(valor)
+    base = (valor / parcelas).quantize(CENTAVO, rounding=ROUND_DOWN)
+    ultima = valor - base * (parcelas - 1)
+    return [
+        ParcelaPrevista(
+            num_parcela=numero,
+            data_vencimento=somar_meses(data_inicial, numero - 1),
+            valor=ultima if numero == parcelas else base,
+        )
+        for numero in range(1, parcelas + 1)
+    ]
+
+
+@dataclass
+class ResultadoCronogramas:
+    contratos: int = 0
+    parcelas: int = 0
+    ignorados: int = 0  # já tinham parcelas ou não têm valor/parcelas/data inicial
+
+
+def gerar_cronogramas(numeros, hoje=None):
+    """
+    Gera e grava, com um único bulk_create, o cronograma dos contratos
+    `numeros`, com os contratos bloqueados. Contratos que já têm parcelas ou
+    sem valor, parcelas ou data inicial são ignorados.
+    """
+    hoje = hoje or timezone.now().date()
+    resultado = ResultadoCronogramas()
+
+    with transaction.atomic():
+        contratos = travar_contratos(numeros, campos=CAMPOS_CONTRATO)
+        ultimo, quantidade = numeracao_atual(contratos)
+
+        novas = []
+        for numero, contrato in contratos.items():
+            plano = calcular_cronograma(contrato.valor, contrato.parcelas, contrato.data_parcela_inicial)
+            if not plano or quantidade[numero]:
+                resultado.ignorados += 1
+                continue
+
+            novas.extend(
+                ItemContrato(
+                    num_contrato_id=numero,
+                    cod_lancamento=ultimo[numero] + prevista.num_parcela,
+                    num_parcela=prevista.num_parcela,
+                    data_lancamento=hoje,
+                    data_vencimento=prevista.data_vencimento,
+                    valor_parcela=prevista.valor,
+                    valor_pago=Decimal('0'),
+                    situacao='1',
+                )
+                for prevista in plano
+            )
+            resultado.contratos += 1
+
+        ItemContrato.objects.bulk_create(novas, batch_size=BATCH_SIZE)
+        resultado.parcelas = len(novas)
+        resultado.ignorados += len(set(numeros) - set(contratos))
+        # Parcelas em aberto não entram no consolidado mensal (só pagamentos)
+        atualizar_derivados({parcela.num_contrato_id for parcela in novas}, set())
+
+    return resultado
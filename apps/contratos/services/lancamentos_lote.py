@@ -0,0 +1,263 @@
+# apps/contratos/services/lancamentos_lote.py
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from apps.contratos.models import Contrato, ItemContrato, MonthlyFinancialRollup
+from apps.core.cache import bump_version_on_commit
+from apps.core.eventos import publicar
+
+# Parâmetros por consulta IN (abaixo do limite de variáveis do SQLite)
+TAMANHO_BLOCO = 900
+BATCH_SIZE = 1000
+CAMPOS_PAGAMENTO = ['valor_pago', 'data_pagamento', 'situacao']
+
+
+@dataclass
+class LinhaLote:
+    """Resultado de uma linha do lote, na ordem em que foi enviada"""
+    linha: int
+    status: str = 'ok'
+    erros: dict = field(default_factory=dict)
+    parcela: dict = None
+
+    def erro(self, campo, mensagem):
+        self.status = 'erro'
+        self.erros.setdefault(campo, []).append(mensagem)
+
+    def to_dict(self):
+        dados = {'linha': self.linha, 'status': self.status}
+        if self.erros:
+            dados['erros'] = self.erros
+        if self.parcela:
+            dados['parcela'] = self.parcela
+        return dados
+
+
+@dataclass
+class ResultadoLote:
+    linhas: list
+    aplicado: bool
+
+    @property
+    def erros(self):
+        return sum(1 for linha in self.linhas if linha.status == 'erro')
+
+    @property
+    def aplicadas(self):
+        return len(self.linhas) - self.erros if self.aplicado else 0
+
+    def to_dict(self):
+        return {
+            'total': len(self.linhas),
+            'aplicadas': self.aplicadas,
+            'erros': self.erros,
+            'aplicado': self.aplicado,
+            'linhas': [linha.to_dict() for linha in self.linhas],
+        }
+
+
+def blocos(valores, tamanho=TAMANHO_BLOCO):
+    valores = list(valores)
+    for inicio in range(0, len(valores), tamanho):
+        yield valores[inicio:inicio + tamanho]
+
+
+def travar_contratos(numeros, campos=('pk', 'tipo_pessoa', 'ultimo_lancamento')):
+    """Bloqueia (select_for_update) cada contrato do lote uma única vez"""
+    contratos = {}
+    for bloco in blocos(sorted(numeros)):
+        contratos.update(
+            (contrato.pk, contrato)
+            for contrato in Contrato.objects.select_for_update().filter(pk__in=bloco).only(*campos)
+        )
+    return contratos
+
+
+def numeracao_atual(contratos):
+    """
+    Último cod_lancamento e quantidade de parcelas de cada contrato (dict de
+    travar_contratos), com um GROUP BY por bloco. O último lançamento é o
+    maior entre o contador do contrato e as parcelas existentes.
+    """
+    ultimo = defaultdict(int, {numero: contrato.ultimo_lancamento for numero, contrato in contratos.items()})
+    quantidade = defaultdict(int)
+    for bloco in blocos(contratos):
+        linhas = ItemContrato.objects.filter(num_contrato__in=bloco).values('num_contrato').annotate(
+            maior=Max('cod_lancamento'), total=Count('pk'),
+        ).values_list('num_contrato', 'maior', 'total').order_by()
+        for numero, maior, total in linhas:
+            ultimo[numero] = max(ultimo[numero], maior or 0)
+            quantidade[numero] = total
+    return ultimo, quantidade
+
+
+def _gravar_pagamentos(parcelas):
+    """
+    Um UPDATE parametrizado por pk executado com executemany. Para milhares de
+    linhas é bem mais rápido que bulk_update, cujo CASE WHEN por lote custa
+    O(lote) por linha para montar no ORM e para avaliar no banco.
+    """
+    meta = ItemContrato._meta
+    campos = [meta.get_field(nome) for nome in CAMPOS_PAGAMENTO]
+    quote = connection.ops.quote_name
+    sql = 'UPDATE {} SET {} WHERE {} = %s'.format(
+        quote(meta.db_table),
+        ', '.join(f'{quote(campo.column)} = %s' for campo in campos),
+        quote(meta.pk.column),
+    )
+    parametros = [
+        [campo.get_db_prep_save(getattr(parcela, campo.attname), connection) for campo in campos] + [parcela.pk]
+        for parcela in parcelas
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, parametros)
+
+
+def atualizar_derivados(numeros, buckets):
+    """
+    Gravação em lote não dispara signals: consolidado, resumo dos contratos e
+    versões de cache. Sem deltas por parcela, os dashboards conectados são
+    avisados para recarregar.
+    """
+    for bucket in buckets - {None}:
+        MonthlyFinancialRollup.refresh_bucket(*bucket)
+    for bloco in blocos(numeros):
+        Contrato.atualizar_resumo(bloco)
+    bump_version_on_commit('contratos.ItemContrato')
+    bump_version_on_commit('contratos.Contrato')
+    if numeros:
+        publicar('recarregar', {'contratos': len(numeros)})
+
+
+def registrar_pagamentos(dados, atomico=False, hoje=None):
+    """
+    Registra um lote de pagamentos. `dados` é uma lista de (linha, valores
+    validados) com num_contrato, cod_lancamento, valor_pago e data_pagamento
+    opcional; linhas já inválidas vêm em `dados` como (LinhaLote com erro, None).
+
+    Mesmas regras de RegistrarPagamentoView: o valor é somado ao já pago e a
+    parcela é liquidada ('3') ao atingir o valor previsto, sem pagar a mais.
+    Pagamentos de uma mesma parcela são aplicados na ordem do lote.
+    Com `atomico`, qualquer erro cancela o lote inteiro.
+    """
+    hoje = hoje or timezone.now().date()
+    linhas = [linha for linha, _ in dados]
+    validas = [(linha, valores) for linha, valores in dados if valores is not None]
+    numeros = {valores['num_contrato'] for _, valores in validas}
+    if atomico and len(validas) < len(linhas):
+        return ResultadoLote(linhas, aplicado=False)
+
+    with transaction.atomic():
+        contratos = travar_contratos(numeros)
+        parcelas = {}
+        for bloco in blocos(contratos):
+            for parcela in ItemContrato.objects.filter(num_contrato__in=bloco):
+                parcelas[(parcela.num_contrato_id, parcela.cod_lancamento)] = parcela
+
+        alteradas = {}
+        buckets = set()
+        for linha, valores in validas:
+            if valores['num_contrato'] not in contratos:
+                linha.erro('num_contrato', 'Contrato não encontrado.')
+                continue
+            parcela = parcelas.get((valores['num_contrato'], valores['cod_lancamento']))
+            if parcela is None:
+                linha.erro('cod_lancamento', 'Parcela não encontrada no contrato.')
+                continue
+            if parcela.situacao == '2':
+                linha.erro('cod_lancamento', 'Parcela cancelada não aceita pagamento.')
+                continue
+            if parcela.situacao == '3':
+                linha.erro('cod_lancamento', 'Parcela já liquidada.')
+                continue
+
+            tipo_pessoa = contratos[parcela.num_contrato_id].tipo_pessoa
+            buckets.add(MonthlyFinancialRollup.bucket_de(
+                parcela.data_pagamento, parcela.valor_pago, tipo_pessoa, parcela.situacao
+            ))
+
+            parcela.valor_pago += valores['valor_pago']
+            parcela.data_pagamento = valores.get('data_pagamento') or hoje
+            if parcela.valor_pago >= parcela.valor_parcela:
+                parcela.valor_pago = parcela.valor_parcela  # Evita pagar a mais
+                parcela.situacao = '3'
+            buckets.add(MonthlyFinancialRollup.bucket_de(
+                parcela.data_pagamento, parcela.valor_pago, tipo_pessoa, parcela.situacao
+            ))
+
+            alteradas[parcela.pk] = parcela
+            linha.parcela = {
+                'id': parcela.pk,
+                'valor_pago': str(parcela.valor_pago),
+                'situacao': parcela.situacao,
+            }
+
+        if atomico and any(linha.status == 'erro' for linha in linhas):
+            for linha in linhas:
+                linha.parcela = None
+            return ResultadoLote(linhas, aplicado=False)
+
+        _gravar_pagamentos(alteradas.values())
+        atualizar_derivados({parcela.num_contrato_id for parcela in alteradas.values()}, buckets)
+
+    return ResultadoLote(linhas, aplicado=True)
+
+
+def criar_parcelas(dados, atomico=False, hoje=None):
+    """
+    Cria um lote de parcelas. `dados` segue registrar_pagamentos, com
+    num_contrato, data_vencimento, valor_parcela e situacao. cod_lancamento e
+    num_parcela continuam a numeração de cada contrato, calculada uma única
+    vez com os contratos bloqueados.
+    """
+    hoje = hoje or timezone.now().date()
+    linhas = [linha for linha, _ in dados]
+    validas = [(linha, valores) for linha, valores in dados if valores is not None]
+    numeros = {valores['num_contrato'] for _, valores in validas}
+    if atomico and len(validas) < len(linhas):
+        return ResultadoLote(linhas, aplicado=False)
+
+    with transaction.atomic():
+        contratos = travar_contratos(numeros)
+        ultimo, quantidade = numeracao_atual(contratos)
+
+        novas = []
+        for linha, valores in validas:
+            numero = valores['num_contrato']
+            if numero not in contratos:
+                linha.erro('num_contrato', 'Contrato não encontrado.')
+                continue
+
+            ultimo[numero] += 1
+            quantidade[numero] += 1
+            parcela = ItemContrato(
+                num_contrato_id=numero,
+                cod_lancamento=ultimo[numero],
+                num_parcela=quantidade[numero],
+                data_lancamento=hoje,
+                data_vencimento=valores['data_vencimento'],
+                valor_parcela=valores['valor_parcela'],
+                valor_pago=Decimal('0'),
+                situacao=valores.get('situacao') or '1',
+            )
+            novas.append((linha, parcela))
+
+        if atomico and any(linha.status == 'erro' for linha in linhas):
+            return ResultadoLote(linhas, aplicado=False)
+
+        ItemContrato.objects.bulk_create([parcela for _, parcela in novas], batch_size=BATCH_SIZE)
+        for linha, parcela in novas:
+            linha.parcela = {
+                'id': parcela.pk,
+                'cod_lancamento': parcela.cod_lancamento,
+                'num_parcela': parcela.num_parcela,
+            }
+        # Parcelas novas não têm pagamento: o consolidado mensal não muda
+        atualizar_derivados({parcela.num_contrato_id for _, parcela in novas}, set())
+
+    return ResultadoLote(linhas, aplicado=True)
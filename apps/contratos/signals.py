@@ -0,0 +1,91 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Contrato, ItemContrato, MonthlyFinancialRollup
+
+# tipo_pessoa anterior não lido (contrato novo ou update_fields sem o campo); None é um tipo válido
+NAO_LIDO = object()
+
+
+def _bucket_da_parcela(parcela):
+    """Chave do consolidado mensal para o estado atual da parcela"""
+    return MonthlyFinancialRollup.bucket_de(
+        parcela.data_pagamento,
+        parcela.valor_pago,
+        parcela.num_contrato.tipo_pessoa,
+        parcela.situacao,
+    )
+
+
+@receiver(pre_save, sender=ItemContrato)
+def guardar_bucket_anterior(sender, instance, raw=False, **kwargs):
+    """
+    Guarda o bucket do consolidado em que a parcela estava antes da alteração,
+    para que o post_save possa recalcular também o mês/situação de origem.
+    O estado lido fica em `_estado_anterior` (deltas ao vivo do dashboard).
+    """
+    instance._rollup_bucket_anterior = None
+    instance._num_contrato_anterior = None
+    instance._estado_anterior = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+
+    anterior = ItemContrato.objects.filter(pk=instance.pk).values(
+        'data_pagamento', 'valor_pago', 'situacao', 'num_contrato', 'num_contrato__tipo_pessoa',
+        'valor_parcela', 'data_vencimento',
+    ).first()
+    if anterior:
+        instance._estado_anterior = anterior
+        instance._num_contrato_anterior = anterior['num_contrato']
+        instance._rollup_bucket_anterior = MonthlyFinancialRollup.bucket_de(
+            anterior['data_pagamento'],
+            anterior['valor_pago'],
+            anterior['num_contrato__tipo_pessoa'],
+            anterior['situacao'],
+        )
+
+
+@receiver(post_save, sender=ItemContrato)
+def atualizar_rollup_apos_salvar(sender, instance, raw=False, **kwargs):
+    """Atualiza incrementalmente os buckets afetados pela parcela salva"""
+    if raw:
+        return
+
+    buckets = {getattr(instance, '_rollup_bucket_anterior', None), _bucket_da_parcela(instance)}
+    for bucket in buckets - {None}:
+        MonthlyFinancialRollup.refresh_bucket(*bucket)
+
+    # Resumo de pagamentos do contrato atual e, se a parcela mudou de contrato, do anterior
+    Contrato.atualizar_resumo({instance.num_contrato_id, getattr(instance, '_num_contrato_anterior', None)})
+
+
+@receiver(pre_save, sender=Contrato)
+def guardar_tipo_pessoa_anterior(sender, instance, raw=False, update_fields=None, **kwargs):
+    """O tipo de pessoa faz parte da chave do consolidado das parcelas do contrato"""
+    instance._tipo_pessoa_anterior = NAO_LIDO
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and 'tipo_pessoa' not in update_fields:
+        return
+    instance._tipo_pessoa_anterior = Contrato.objects.filter(pk=instance.pk).values_list(
+        'tipo_pessoa', flat=True
+    ).first()
+
+
+@receiver(post_save, sender=Contrato)
+def atualizar_rollup_apos_mudar_tipo(sender, instance, raw=False, created=False, **kwargs):
+    """Move as parcelas pagas do contrato do bucket do tipo antigo para o do novo"""
+    if raw or created:
+        return
+    anterior = getattr(instance, '_tipo_pessoa_anterior', NAO_LIDO)
+    if anterior is not NAO_LIDO and anterior != instance.tipo_pessoa:
+        MonthlyFinancialRollup.refresh_contrato(instance.pk, [anterior, instance.tipo_pessoa])
+
+
+@receiver(post_delete, sender=ItemContrato)
+def atualizar_rollup_apos_excluir(sender, instance, **kwargs):
+    """Remove a contribuição da parcela excluída do consolidado"""
+    bucket = _bucket_da_parcela(instance)
+    if bucket:
+        MonthlyFinancialRollup.refresh_bucket(*bucket)
+
+    Contrato.atualizar_resumo([instance.num_contrato_id])
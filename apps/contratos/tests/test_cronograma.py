@@ -0,0 +1,59 @@
+from django.core.management import call_command
+from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from apps.contratos.models import Contrato, ItemContrato
+from apps.contratos.services.cronograma import calcular_cronograma, somar_meses
+
+
+class CronogramaTest(TestCase):
+
+    def _contrato(self, numero, **kwargs):
+        dados = {
+            'num_contrato': numero, 'cod_ordem': 1, 'descricao': 'Contrato', 'tipo_pessoa': 1,
+            'data_inicio': date(2025, 1, 1), 'valor': Decimal('100.00'), 'parcelas': 3,
+            'data_parcela_inicial': date(2025, 1, 31), 'situacao': '2',
+        }
+        dados.update(kwargs)
+        return Contrato.objects.create(**dados)
+
+    def test_sobra_do_arredondamento_vai_para_a_ultima_parcela(self):
+        plano = calcular_cronograma(Decimal('100.00'), 3, date(2025, 1, 10))
+        self.assertEqual([p.valor for p in plano], [Decimal('33.33'), Decimal('33.33'), Decimal('33.34')])
+        self.assertEqual(sum(p.valor for p in plano), Decimal('100.00'))
+        self.assertEqual(calcular_cronograma(None, 3, date(2025, 1, 10)), [])
+
+    def test_vencimentos_mantem_o_dia_quando_possivel(self):
+        self.assertEqual(
+            [somar_meses(date(2024, 1, 31), meses) for meses in range(4)],
+            [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)],
+        )
+        self.assertEqual(somar_meses(date(2025, 11, 15), 3), date(2026, 2, 15))
+
+    def test_calcular_parcelas_do_contrato(self):
+        contrato = self._contrato('0001/2025')
+        self.assertEqual(
+            [p.data_vencimento for p in contrato.calcular_parcelas()],
+            [date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31)],
+        )
+
+    def test_generate_schedules_ignora_contratos_com_parcelas(self):
+        novo = self._contrato('0001/2025')
+        existente = self._contrato('0002/2025')
+        self._contrato('0003/2025', data_parcela_inicial=None)
+        ItemContrato.objects.create(
+            num_contrato=existente, cod_lancamento=1, num_parcela=1, data_lancamento=date(2025, 1, 1),
+            data_vencimento=date(2025, 2, 1), valor_parcela=Decimal('100.00'), situacao='1',
+        )
+
+        call_command('generate_schedules', '--batch-size', '1', stdout=StringIO())
+
+        self.assertEqual(existente.itens.count(), 1)
+        self.assertEqual(
+            list(novo.itens.order_by('cod_lancamento').values_list('cod_lancamento', 'valor_parcela')),
+            [(1, Decimal('33.33')), (2, Decimal('33.33')), (3, Decimal('33.34'))],
+        )
+        novo.refresh_from_db()
+        self.assertEqual(novo.total_previsto, Decimal('100.00'))
+        self.assertEqual(ItemContrato.objects.count(), 4)
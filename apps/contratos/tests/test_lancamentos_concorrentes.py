@@ -0,0 +1,54 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.contratos.models import Contrato, ItemContrato
+
+
+class ReservaLancamentosTest(TestCase):
+
+    def setUp(self):
+        self.contrato = Contrato.objects.create(
+            num_contrato='0001/2025', cod_ordem=1, descricao='Contrato', data_inicio=date(2025, 1, 1),
+        )
+
+    def test_view_numera_pelo_contador_do_contrato(self):
+        user = get_user_model().objects.create_user(username='u', email='u@funetec.br', password='x')
+        self.client.force_login(user)
+        # Lançamento gravado fora da view (ex.: importação) avança o contador via signal
+        ItemContrato.objects.create(
+            num_contrato=self.contrato, cod_lancamento=7, num_parcela=1, data_lancamento=date(2025, 1, 1),
+            data_vencimento=date(2025, 2, 1), valor_parcela=Decimal('100.00'), situacao='1',
+        )
+
+        response = self.client.post(f'/contratos/{self.contrato.pk}/parcelas/adicionar/', {
+            'data_vencimento': '2025-03-01', 'valor_parcela': '100.00', 'situacao': '1',
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            list(self.contrato.itens.order_by('cod_lancamento').values_list('cod_lancamento', 'num_parcela')),
+            [(7, 1), (8, 2)],
+        )
+
+        # Só a linha do contrato: as parcelas não são contadas a cada reserva
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertEqual(Contrato.reservar_lancamentos(self.contrato.pk, 2), [(9, 3), (10, 4)])
+        self.assertFalse([q['sql'] for q in consultas if ItemContrato._meta.db_table in q['sql']])
+
+
+class LancamentosConcorrentesTest(TransactionTestCase):
+
+    def test_lancamentos_simultaneos_sem_duplicidade(self):
+        saida = StringIO()
+        call_command(
+            'benchmark_lancamentos', '--estrategia', 'contador', '--threads', '6', '--lancamentos', '10',
+            stdout=saida,
+        )
+        self.assertRegex(saida.getvalue(), r'contador\s+60 gravados\s+0 erros\s+0 duplicados')
@@ -0,0 +1,75 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.contratos.models import Contrato, ItemContrato, MonthlyFinancialRollup
+
+
+class LancamentosLoteTest(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='financeiro', email='financeiro@funetec.br', password='x', role='financeiro',
+        )
+        self.client.force_login(self.user)
+        self.contrato = Contrato.objects.create(
+            num_contrato='0001/2025', cod_ordem=1, descricao='Contrato', tipo_pessoa=1,
+            data_inicio=date(2025, 1, 1), valor=Decimal('3000.00'), situacao='2',
+        )
+        for cod in (1, 2, 3):
+            ItemContrato.objects.create(
+                num_contrato=self.contrato, cod_lancamento=cod, num_parcela=cod,
+                data_lancamento=date(2025, 1, 1), data_vencimento=date(2025, cod + 1, 1),
+                valor_parcela=Decimal('1000.00'), situacao='2' if cod == 3 else '1',
+            )
+
+    def test_pagamentos_json_com_relatorio_por_linha(self):
+        response = self.client.post('/api/lotes/pagamentos/', [
+            {'num_contrato': '0001/2025', 'cod_lancamento': 1, 'valor_pago': '600.00', 'data_pagamento': '2025-02-03'},
+            {'num_contrato': '0001/2025', 'cod_lancamento': 1, 'valor_pago': '600.00', 'data_pagamento': '2025-02-10'},
+            {'num_contrato': '0001/2025', 'cod_lancamento': 3, 'valor_pago': '10.00'},
+            {'num_contrato': '9999/2025', 'cod_lancamento': 1, 'valor_pago': '10.00'},
+            {'num_contrato': '0001/2025', 'cod_lancamento': 2, 'valor_pago': '-1'},
+        ], content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        dados = response.json()
+        self.assertEqual((dados['aplicadas'], dados['erros']), (2, 3))
+        self.assertEqual([linha['status'] for linha in dados['linhas']], ['ok', 'ok', 'erro', 'erro', 'erro'])
+        self.assertIn('valor_pago', dados['linhas'][4]['erros'])
+
+        # Pagamentos da mesma parcela acumulam, sem pagar a mais
+        parcela = ItemContrato.objects.get(num_contrato=self.contrato, cod_lancamento=1)
+        self.assertEqual((parcela.valor_pago, parcela.situacao), (Decimal('1000.00'), '3'))
+
+        # bulk_update não dispara signals: consolidado e resumo atualizados pelo serviço
+        self.assertEqual(MonthlyFinancialRollup.objects.get().valor_pago, Decimal('1000.00'))
+        self.contrato.refresh_from_db()
+        self.assertEqual(self.contrato.total_pago, Decimal('1000.00'))
+
+    def test_atomico_nao_aplica_lote_com_erro(self):
+        corpo = 'num_contrato;cod_lancamento;valor_pago\n0001/2025;1;100.00\n0001/2025;7;100.00\n'
+        response = self.client.post('/api/lotes/pagamentos/?atomico=1', corpo, content_type='text/csv')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['aplicado'])
+        self.assertEqual(ItemContrato.objects.get(cod_lancamento=1).valor_pago, Decimal('0.00'))
+
+    def test_parcelas_csv_continuam_numeracao(self):
+        corpo = 'num_contrato,data_vencimento,valor_parcela\n0001/2025,2025-06-01,500.00\n0001/2025,2025-07-01,500.00\n'
+        response = self.client.post('/api/lotes/parcelas/', corpo, content_type='text/csv')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [linha['parcela']['cod_lancamento'] for linha in response.json()['linhas']], [4, 5],
+        )
+        self.contrato.refresh_from_db()
+        self.assertEqual(self.contrato.total_previsto, Decimal('3000.00'))
+
+    def test_exige_perfil_financeiro(self):
+        self.user.role = 'analista'
+        self.user.save()
+        response = self.client.post('/api/lotes/parcelas/', [], content_type='application/json')
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,126 @@
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.db.models import QuerySet
+from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from apps.contratos.models import Contrato, ItemContrato, MonthlyFinancialRollup
+
+
+class MonthlyFinancialRollupTest(TestCase):
+
+    def setUp(self):
+        self.contrato = Contrato.objects.create(
+            num_contrato='0001/2025', cod_ordem=1, descricao='Contrato', tipo_pessoa=1,
+            data_inicio=date(2025, 1, 1), valor=Decimal('3000.00'), situacao='2',
+        )
+
+    def _parcela(self, cod, **kwargs):
+        dados = {
+            'num_contrato': self.contrato, 'cod_lancamento': cod, 'num_parcela': cod,
+            'data_lancamento': date(2025, 1, 1), 'data_vencimento': date(2025, 2, 1),
+            'valor_parcela': Decimal('1000.00'), 'situacao': '1',
+        }
+        dados.update(kwargs)
+        return ItemContrato.objects.create(**dados)
+
+    def _snapshot(self):
+        return sorted(MonthlyFinancialRollup.objects.values_list(
+            'ano', 'mes', 'tipo_pessoa', 'situacao', 'valor_parcela', 'valor_pago', 'quantidade'
+        ))
+
+    def test_signals_mantem_rollup_incremental(self):
+        self._parcela(1, valor_pago=Decimal('1000.00'), data_pagamento=date(2025, 2, 3), situacao='3')
+        parcela = self._parcela(2)
+        self.assertEqual(self._snapshot(), [
+            (2025, 2, 1, '3', Decimal('1000.00'), Decimal('1000.00'), 1),
+        ])
+
+        parcela.valor_pago = Decimal('400.00')
+        parcela.data_pagamento = date(2025, 3, 5)
+        parcela.save()
+        self.assertEqual(len(self._snapshot()), 2)
+
+        # Mover o pagamento de mês remove a contribuição do bucket anterior
+        parcela.data_pagamento = date(2025, 2, 20)
+        parcela.situacao = '3'
+        parcela.save()
+        self.assertEqual(self._snapshot(), [
+            (2025, 2, 1, '3', Decimal('2000.00'), Decimal('1400.00'), 2),
+        ])
+
+        parcela.delete()
+        self.assertEqual(self._snapshot(), [
+            (2025, 2, 1, '3', Decimal('1000.00'), Decimal('1000.00'), 1),
+        ])
+
+    def test_rebuild_equivale_ao_incremental(self):
+        self._parcela(1, valor_pago=Decimal('1000.00'), data_pagamento=date(2025, 2, 3), situacao='3')
+        self._parcela(2, valor_pago=Decimal('250.00'), data_pagamento=date(2025, 4, 9))
+        incremental = self._snapshot()
+
+        MonthlyFinancialRollup.objects.all().delete()
+        call_command('build_financial_rollup', stdout=StringIO())
+
+        self.assertEqual(self._snapshot(), incremental)
+
+    def test_mudanca_de_tipo_pessoa_move_buckets(self):
+        self._parcela(1, valor_pago=Decimal('1000.00'), data_pagamento=date(2025, 2, 3), situacao='3')
+        self._parcela(2, valor_pago=Decimal('250.00'), data_pagamento=date(2025, 4, 9))
+
+        self.contrato.tipo_pessoa = 2
+        self.contrato.save()
+        self.assertEqual(self._snapshot(), [
+            (2025, 2, 2, '3', Decimal('1000.00'), Decimal('1000.00'), 1),
+            (2025, 4, 2, '1', Decimal('1000.00'), Decimal('250.00'), 1),
+        ])
+
+        MonthlyFinancialRollup.objects.all().delete()
+        call_command('build_financial_rollup', stdout=StringIO())
+        self.assertEqual(len(self._snapshot()), 2)
+
+    def test_refresh_bucket_com_linha_criada_por_outra_transacao(self):
+        self._parcela(1, valor_pago=Decimal('1000.00'), data_pagamento=date(2025, 2, 3), situacao='3')
+        MonthlyFinancialRollup.objects.update(valor_pago=0, quantidade=0)
+
+        # O primeiro UPDATE não encontra a linha, que outra transação cria antes do INSERT
+        update = QuerySet.update
+        chamadas = []
+
+        def update_perdendo_corrida(queryset, **kwargs):
+            chamadas.append(kwargs)
+            return 0 if len(chamadas) == 1 else update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', update_perdendo_corrida):
+            MonthlyFinancialRollup.refresh_bucket(2025, 2, 1, '3')
+
+        self.assertEqual(len(chamadas), 2)
+        self.assertEqual(self._snapshot(), [
+            (2025, 2, 1, '3', Decimal('1000.00'), Decimal('1000.00'), 1),
+        ])
+
+    def test_bucket_com_tipo_pessoa_nulo_nao_duplica(self):
+        Contrato.objects.filter(pk=self.contrato.pk).update(tipo_pessoa=None)
+        self.contrato.refresh_from_db()
+        self._parcela(1, valor_pago=Decimal('1000.00'), data_pagamento=date(2025, 2, 3), situacao='3')
+
+        # NULL não colide em UNIQUE: a chave do bucket usa 0 para tipo desconhecido
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            MonthlyFinancialRollup.objects.create(ano=2025, mes=2, tipo_pessoa=None, situacao='3')
+
+        update = QuerySet.update
+        chamadas = []
+
+        def update_perdendo_corrida(queryset, **kwargs):
+            chamadas.append(kwargs)
+            return 0 if len(chamadas) == 1 else update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', update_perdendo_corrida):
+            MonthlyFinancialRollup.refresh_bucket(2025, 2, None, '3')
+
+        self.assertEqual(self._snapshot(), [
+            (2025, 2, None, '3', Decimal('1000.00'), Decimal('1000.00'), 1),
+        ])
@@ -0,0 +1,13 @@
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class QueryPlanBenchmarkTest(TestCase):
+
+    def test_consultas_usam_indices(self):
+        saida = io.StringIO()
+        call_command('benchmark_query_plans', seed=160, stdout=saida)
+
+        self.assertIn('Todas as consultas usam os índices esperados', saida.getvalue())
@@ -0,0 +1,91 @@
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.utils import timezone
+from apps.contratos.models import Contrato, ItemContrato
+
+
+class ResumoContratoTest(TestCase):
+
+    def setUp(self):
+        self.hoje = timezone.now().date()
+        self.contrato = Contrato.objects.create(
+            num_contrato='0001/2025', cod_ordem=1, descricao='Contrato', tipo_pessoa=1,
+            data_inicio=date(2025, 1, 1), valor=Decimal('3000.00'), situacao='2',
+        )
+
+    def _parcela(self, cod, contrato=None, **kwargs):
+        dados = {
+            'num_contrato': contrato or self.contrato, 'cod_lancamento': cod, 'num_parcela': cod,
+            'data_lancamento': date(2025, 1, 1), 'data_vencimento': self.hoje + timedelta(days=30),
+            'valor_parcela': Decimal('1000.00'), 'situacao': '1',
+        }
+        dados.update(kwargs)
+        return ItemContrato.objects.create(**dados)
+
+    def _resumo(self, contrato=None, hoje=None):
+        return Contrato.objects.com_vencimentos(hoje).values_list(
+            'total_pago', 'total_previsto', 'parcelas_vencidas', 'proximo_vencimento'
+        ).get(pk=(contrato or self.contrato).pk)
+
+    def test_signals_mantem_resumo(self):
+        vencida = self._parcela(1, data_vencimento=self.hoje - timedelta(days=10))
+        self._parcela(2, valor_pago=Decimal('1000.00'), situacao='3')
+        self._parcela(3, data_vencimento=self.hoje + timedelta(days=60))
+        self._parcela(4, valor_parcela=Decimal('500.00'), situacao='2')  # cancelada não conta
+        self.assertEqual(self._resumo(), (
+            Decimal('1000.00'), Decimal('3000.00'), 1, self.hoje + timedelta(days=60),
+        ))
+
+        vencida.valor_pago = Decimal('1000.00')
+        vencida.situacao = '3'
+        vencida.save()
+        self.assertEqual(self._resumo()[:3], (Decimal('2000.00'), Decimal('3000.00'), 0))
+
+        vencida.delete()
+        self.contrato.refresh_from_db()
+        self.assertEqual(self.contrato.get_valor_pago(), Decimal('1000.00'))
+        self.assertEqual(self.contrato.get_valor_pendente(), Decimal('1000.00'))
+
+    def test_troca_de_contrato_atualiza_os_dois(self):
+        outro = Contrato.objects.create(
+            num_contrato='0002/2025', cod_ordem=2, descricao='Outro', tipo_pessoa=2,
+            data_inicio=date(2025, 1, 1), valor=Decimal('1000.00'), situacao='2',
+        )
+        parcela = self._parcela(1)
+        parcela.num_contrato = outro
+        parcela.save()
+
+        self.assertEqual(self._resumo(), (Decimal('0.00'), Decimal('0.00'), 0, None))
+        self.assertEqual(self._resumo(outro)[1], Decimal('1000.00'))
+
+    def test_comando_recalcula_em_lote(self):
+        self._parcela(1, data_vencimento=self.hoje - timedelta(days=1))
+        self._parcela(2, valor_pago=Decimal('300.00'))
+        esperado = self._resumo()
+
+        # bulk/SQL direto não dispara signals
+        Contrato.objects.update(total_pago=0, total_previsto=0)
+        call_command('recalcular_resumo_contratos', stdout=StringIO())
+        self.assertEqual(self._resumo(), esperado)
+
+    def test_vencimentos_relativos_a_hoje_sem_salvar(self):
+        self._parcela(1, data_vencimento=self.hoje)
+        self._parcela(2, data_vencimento=self.hoje + timedelta(days=10))
+        self.assertEqual(self._resumo()[2:], (0, self.hoje))
+
+        # Virada de data sem nenhum salvamento nem tarefa agendada
+        amanha = self.hoje + timedelta(days=1)
+        self.assertEqual(self._resumo(hoje=amanha)[2:], (1, self.hoje + timedelta(days=10)))
+        self.assertEqual(self._resumo(hoje=self.hoje + timedelta(days=11))[2:], (2, None))
+
+        user = get_user_model().objects.create_user(username='u', email='u@funetec.br', password='x')
+        self.client.force_login(user)
+        self.assertEqual(list(self.client.get('/contratos/', {'inadimplencia': 'true'}).context['contratos']), [])
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(days=1)):
+            response = self.client.get('/contratos/', {'inadimplencia': 'true'})
+        self.assertEqual(list(response.context['contratos']), [self.contrato])
@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from datetime import date
+from decimal import Decimal
+from apps.contratos.models import Contrato, SequenciaContrato
+
+
+class SequenciaContratoTest(TestCase):
+
+    def test_primeira_reserva_continua_apos_o_maior_numero_do_ano(self):
+        for numero in ('0007/2030', 'S0000099/2030', '0050/2029'):
+            Contrato.objects.create(num_contrato=numero, cod_ordem=1, descricao='Contrato', valor=Decimal('1'))
+
+        self.assertEqual(Contrato.gerar_numero_contrato(2030), '0008/2030')
+        self.assertEqual(Contrato.reservar_numeros(3, 2030), ['0009/2030', '0010/2030', '0011/2030'])
+        self.assertEqual(Contrato.gerar_numero_contrato(2031), '0001/2031')
+
+    def test_sincronizar_avanca_apos_importacao(self):
+        Contrato.gerar_numero_contrato(2030)
+        Contrato.objects.create(num_contrato='0040/2030', cod_ordem=1, descricao='Importado', data_inicio=date(2030, 1, 1))
+        SequenciaContrato.sincronizar()
+        self.assertEqual(Contrato.gerar_numero_contrato(2030), '0041/2030')
+
+
+class SequenciaContratoConcorrenciaTest(TransactionTestCase):
+
+    def test_reservas_simultaneas_nao_repetem_numeros(self):
+        def reservar(indice):
+            try:
+                quantidade = 1 if indice % 2 else 5  # mistura reservas unitárias e em bloco
+                return [Contrato.reservar_numeros(quantidade, 2030) for _ in range(10)]
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            blocos = [bloco for resultado in executor.map(reservar, range(8)) for bloco in resultado]
+
+        numeros = [numero for bloco in blocos for numero in bloco]
+        self.assertEqual(len(numeros), len(set(numeros)))
+        self.assertEqual(sorted(numeros), [f'{n:04d}/2030' for n in range(1, len(numeros) + 1)])
+        self.assertEqual(SequenciaContrato.objects.get(ano=2030).ultimo, len(numeros))
+        for bloco in blocos:
+            sequencia = [int(numero[:4]) for numero in bloco]
+            self.assertEqual(sequencia, list(range(sequencia[0], sequencia[0] + len(bloco))))
@@ -2,19 +2,29 @@ from django.urls import reverse_lazy
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView, DetailView, CreateView, UpdateView
+from django.utils import timezone
 
 from ..models.contrato import Contrato
 from ..models.prestador import Prestador
 from ..forms.contrato_forms import ContratoForm, PrestadorForm
 from apps.projetos.models.ordem import Ordem
+from apps.core.pagination import KeysetPaginationMixin
 
 
-class ContratoListView(LoginRequiredMixin, ListView):
+class ContratoListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Contrato
     template_name = 'contratos/contrato_list.html'
     context_object_name = 'contratos'
     paginate_by = 10
-    ordering = ['-data_inicio', 'num_contrato']  # Fix UnorderedObjectListWarning
+    ordering = ['-data_inicio', 'num_contrato']  # Chave do cursor: a última deve ser única
+    # ?ordenar= aceita os totais do resumo de pagamentos (colunas do próprio contrato, sem JOIN)
+    ordenacoes = {'total_pago', '-total_pago', 'total_previsto', '-total_previsto'}
+
+    def get_ordering(self):
+        ordenar = self.request.GET.get('ordenar')
+        if ordenar in self.ordenacoes:
+            return [ordenar, 'num_contrato']
+        return super().get_ordering()
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -27,16 +37,10 @@ class ContratoListView(LoginRequiredMixin, ListView):
         # Filtro por inadimplência
         inadimplencia = self.request.GET.get('inadimplencia')
         if inadimplencia == 'true':
-            # Filtra contratos com parcelas vencidas
-            from ..models.item_contrato import ItemContrato
-            from django.utils import timezone
-            
-            contratos_inadimplentes = ItemContrato.objects.filter(
-                situacao='1',  # Pendente
-                data_vencimento__lt=timezone.now().date()
-            ).values_list('num_contrato', flat=True)
-            
-            queryset = queryset.filter(num_contrato__in=contratos_inadimplentes)
+            # Contratos com parcelas pendentes vencidas até hoje (EXISTS, sem JOIN)
+            queryset = queryset.filter(
+                Contrato.objects.existe_parcela_pendente(data_vencimento__lt=timezone.now().date())
+            )
         
         return queryset
 
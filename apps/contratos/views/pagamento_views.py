@@ -8,18 +8,20 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView, CreateView
 from ..forms.pagamento_forms import ItemContratoForm
 from ..models.contrato import Contrato
+from apps.core.pagination import KeysetPaginationMixin
 
 
-class ParcelaListView(LoginRequiredMixin, ListView):
+class ParcelaListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = ItemContrato
     template_name = 'contratos/parcela_list.html'
     context_object_name = 'parcelas'
     paginate_by = 15
+    ordering = ['data_vencimento', 'id']  # Chave do cursor (itens_vencimento_id_idx)
 
     def get_queryset(self):
         # Apenas um exemplo para listar todas as parcelas.
         # Pode ser filtrado por status, data, etc. no futuro.
-        return ItemContrato.objects.select_related('num_contrato').all().order_by('data_vencimento')
+        return ItemContrato.objects.select_related('num_contrato')
 
 
 class ItemContratoCreateView(LoginRequiredMixin, CreateView):
@@ -51,37 +53,20 @@ class ItemContratoCreateView(LoginRequiredMixin, CreateView):
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
-        from django.db import models, transaction
-        from ..models.item_contrato import ItemContrato
+        from django.db import transaction
         from django.utils import timezone
-        from django.db import IntegrityError
         
         # Definir o contrato
         form.instance.num_contrato = self.contrato
         form.instance.data_lancamento = timezone.now().date()
         
-        # Usar transação para evitar condições de corrida
+        # O contador do contrato fica bloqueado até o INSERT: lançamentos
+        # simultâneos no mesmo contrato esperam a vez, sem repetir cod_lancamento
         with transaction.atomic():
-            # Buscar valores com lock por contrato (não global)
-            itens_contrato = ItemContrato.objects.select_for_update().filter(num_contrato=self.contrato)
-            
-            # Calcular cod_lancamento baseado no contrato específico
-            ultimo_cod = itens_contrato.aggregate(max_cod=models.Max('cod_lancamento'))['max_cod']
-            form.instance.cod_lancamento = (ultimo_cod or 0) + 1
-            
-            # Calcular num_parcela baseado nas parcelas existentes do contrato
-            parcelas_existentes = itens_contrato.count()
-            form.instance.num_parcela = parcelas_existentes + 1
-            
-            try:
-                return super().form_valid(form)
-            except IntegrityError:
-                # Em caso raro de conflito, tentar novamente com novos valores
-                ultimo_cod = itens_contrato.aggregate(max_cod=models.Max('cod_lancamento'))['max_cod']
-                form.instance.cod_lancamento = (ultimo_cod or 0) + 1
-                parcelas_existentes = itens_contrato.count()
-                form.instance.num_parcela = parcelas_existentes + 1
-                return super().form_valid(form)
+            [(cod_lancamento, num_parcela)] = Contrato.reservar_lancamentos(self.contrato.pk)
+            form.instance.cod_lancamento = cod_lancamento
+            form.instance.num_parcela = num_parcela
+            return super().form_valid(form)
 
     def get_success_url(self):
         return reverse_lazy('contratos:contrato_detail', kwargs={'pk': self.contrato.pk})
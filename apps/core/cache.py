@@ -0,0 +1,200 @@
+import functools
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from apps.core.profiling import contar
+
+
+# Modelos cujo salvamento/exclusão invalida o cache de páginas e API
+# (Ordem e Requisição: o projeto de um contrato é lido através delas)
+MODELOS_VERSIONADOS = (
+    'projetos.Projeto',
+    'contratos.Contrato',
+    'contratos.ItemContrato',
+    'projetos.Ordem',
+    'projetos.Requisicao',
+)
+
+VERSION_KEY_PREFIX = 'cache_version'
+
+logger = logging.getLogger('apps')
+
+
+def version_key(label):
+    """Chave do contador de versão de um modelo ('app_label.Model')"""
+    return f"{VERSION_KEY_PREFIX}:{label.lower()}"
+
+
+def get_versions(labels=MODELOS_VERSIONADOS):
+    """
+    Retorna as versões atuais dos modelos, na ordem de `labels`.
+    Contadores inexistentes (cache vazio ou expirado) são inicializados em 1.
+    """
+    chaves = [version_key(label) for label in labels]
+    atuais = cache.get_many(chaves)
+
+    versoes = []
+    for chave in chaves:
+        versao = atuais.get(chave)
+        if versao is None:
+            cache.add(chave, 1, timeout=None)
+            versao = cache.get(chave, 1)
+        versoes.append(versao)
+    return tuple(versoes)
+
+
+def bump_version(label):
+    """Incrementa a versão de um modelo, invalidando as entradas que dependem dele"""
+    chave = version_key(label)
+    try:
+        return cache.incr(chave)
+    except ValueError:
+        # Contador ainda não existe: parte de 2 para diferir de uma versão inicializada em 1
+        cache.add(chave, 2, timeout=None)
+        return cache.get(chave)
+
+
+def bump_version_on_commit(label):
+    """
+    Incrementa a versão após o commit da transação corrente (na hora, fora de
+    transação). Antes do commit, uma leitura concorrente ainda vê os dados
+    antigos e os gravaria no cache sob a versão nova.
+    """
+    transaction.on_commit(lambda: bump_version(label))
+
+
+def versioned_key(prefix, *parts, labels=MODELOS_VERSIONADOS):
+    """Chave de cache que muda sempre que algum dos modelos em `labels` é alterado"""
+    versoes = '.'.join(str(versao) for versao in get_versions(labels))
+    key_string = '|'.join(str(part) for part in parts)
+    return f"{prefix}:{versoes}:{hashlib.md5(key_string.encode()).hexdigest()}"
+
+
+_AUSENTE = object()
+
+
+def memoizar(compartilhado=False, labels=('contratos.ItemContrato',), timeout=None):
+    """
+    Memoiza um método de service pela combinação de nome e argumentos
+    (que devem ser hasheáveis).
+
+    - Na instância: cada service é criado por requisição, então chamadas
+      repetidas durante a mesma requisição reaproveitam o resultado.
+    - Com `compartilhado`, também no cache (entre requisições e workers), em
+      uma chave versionada por `labels`: salvar ou excluir um desses modelos
+      invalida o resultado.
+
+    Acertos e faltas são contados em profiling (memo.hit, memo.cache_hit,
+    memo.miss). O valor devolvido é compartilhado: quem o recebe não deve alterá-lo.
+    """
+    def decorator(metodo):
+        nome = f'{metodo.__module__}.{metodo.__qualname__}'
+
+        @functools.wraps(metodo)
+        def wrapper(self, *args, **kwargs):
+            memo = self.__dict__.setdefault('_memo', {})
+            chave = (metodo.__name__, args, tuple(sorted(kwargs.items())))
+            valor = memo.get(chave, _AUSENTE)
+            if valor is not _AUSENTE:
+                contar('memo.hit')
+                return valor
+
+            if compartilhado:
+                chave_cache = versioned_key('memo', nome, repr(chave[1:]), labels=labels)
+                valor = cache.get(chave_cache, _AUSENTE)
+                if valor is not _AUSENTE:
+                    contar('memo.cache_hit')
+                    memo[chave] = valor
+                    return valor
+
+            contar('memo.miss')
+            valor = metodo(self, *args, **kwargs)
+            if compartilhado:
+                cache.set(chave_cache, valor, timeout or getattr(settings, 'VERSIONED_CACHE_TIMEOUT', 60 * 60 * 6))
+            memo[chave] = valor
+            return valor
+
+        return wrapper
+    return decorator
+
+
+@dataclass
+class EntradaSWR:
+    """Payload em cache com o instante e as versões dos modelos em que foi calculado"""
+    conteudo: bytes
+    etag: str
+    gerado_em: float
+    versoes: tuple
+
+    def fresca(self, soft_ttl, versoes):
+        return time.time() - self.gerado_em < soft_ttl and self.versoes == versoes
+
+
+def em_segundo_plano(funcao):
+    """Executa `funcao` em uma thread daemon, fechando a conexão com o banco ao final"""
+    def executar():
+        try:
+            funcao()
+        except Exception:
+            logger.exception('Falha no recálculo em segundo plano')
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=executar, daemon=True)
+    thread.start()
+    return thread
+
+
+def _calcular_entrada(chave, calcular, labels, timeout):
+    # Versões lidas antes do cálculo: uma alteração durante ele deixa a entrada já velha
+    versoes = get_versions(labels)
+    conteudo = calcular()
+    entrada = EntradaSWR(
+        conteudo=conteudo,
+        etag=f'"{hashlib.md5(conteudo).hexdigest()}"',
+        gerado_em=time.time(),
+        versoes=versoes,
+    )
+    cache.set(chave, entrada, timeout or getattr(settings, 'VERSIONED_CACHE_TIMEOUT', 60 * 60 * 6))
+    return entrada
+
+
+def stale_while_revalidate(chave, calcular, soft_ttl, labels=MODELOS_VERSIONADOS, timeout=None, lock_timeout=60):
+    """
+    Devolve a EntradaSWR de `chave`, com `calcular()` -> bytes.
+
+    - Sem entrada: calcula na hora (swr.miss).
+    - Entrada mais nova que `soft_ttl` segundos e sem alteração nos modelos de
+      `labels`: devolvida direto (swr.hit).
+    - Caso contrário, devolve a entrada antiga na hora (swr.stale) e agenda
+      um recálculo em segundo plano. Uma trava no cache (cache.add) garante
+      um único recálculo por chave, mesmo com várias requisições simultâneas
+      e vários workers.
+    """
+    entrada = cache.get(chave)
+    if entrada is None:
+        contar('swr.miss')
+        return _calcular_entrada(chave, calcular, labels, timeout)
+
+    if entrada.fresca(soft_ttl, get_versions(labels)):
+        contar('swr.hit')
+        return entrada
+
+    contar('swr.stale')
+    trava = f'{chave}:recalculando'
+    if cache.add(trava, 1, lock_timeout):
+        def recalcular():
+            try:
+                _calcular_entrada(chave, calcular, labels, timeout)
+            finally:
+                cache.delete(trava)
+
+        em_segundo_plano(recalcular)
+    return entrada
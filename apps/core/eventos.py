@@ -0,0 +1,139 @@
+import json
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from apps.core.cache import get_versions
+from apps.core.profiling import contar
+
+# Canal de pub/sub dos eventos ao vivo do dashboard
+CANAL = 'pactum:dashboard:eventos'
+
+logger = logging.getLogger('apps')
+
+
+def formatar_evento(tipo, dados):
+    """Quadro Server-Sent Events (event + data JSON), montado uma única vez por alteração"""
+    return f'event: {tipo}\ndata: {json.dumps(dados, cls=DjangoJSONEncoder)}\n\n'
+
+
+class BrokerLocal:
+    """
+    Pub/sub em memória: só entrega para assinantes do mesmo processo.
+    Usado em testes e no runserver; com vários workers use o BrokerRedis.
+    """
+    TAMANHO_FILA = 1000
+
+    def __init__(self):
+        self._filas = set()
+        self._lock = threading.Lock()
+
+    def publicar(self, mensagem):
+        with self._lock:
+            filas = list(self._filas)
+        for fila in filas:
+            try:
+                fila.put_nowait(mensagem)
+            except queue.Full:
+                # Assinante parado: descarta em vez de crescer sem limite
+                contar('eventos.descartados')
+
+    def assinar(self):
+        fila = queue.Queue(maxsize=self.TAMANHO_FILA)
+        with self._lock:
+            self._filas.add(fila)
+        return AssinaturaLocal(self, fila)
+
+    def _cancelar(self, fila):
+        with self._lock:
+            self._filas.discard(fila)
+
+
+class AssinaturaLocal:
+
+    def __init__(self, broker, fila):
+        self.broker = broker
+        self.fila = fila
+
+    def receber(self, timeout):
+        """Próxima mensagem, ou None se nada chegou em `timeout` segundos"""
+        try:
+            return self.fila.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def fechar(self):
+        self.broker._cancelar(self.fila)
+
+
+class BrokerRedis:
+    """Pub/sub do Redis: cada alteração publicada uma vez chega a todos os workers"""
+
+    def __init__(self, url):
+        import redis
+        self.cliente = redis.Redis.from_url(url)
+
+    def publicar(self, mensagem):
+        self.cliente.publish(CANAL, mensagem)
+
+    def assinar(self):
+        pubsub = self.cliente.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(CANAL)
+        return AssinaturaRedis(pubsub)
+
+
+class AssinaturaRedis:
+
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    def receber(self, timeout):
+        """Próxima mensagem, ou None se nada chegou (pode retornar antes de `timeout`)"""
+        mensagem = self.pubsub.get_message(timeout=timeout)
+        if mensagem is None:
+            return None
+        return mensagem['data'].decode()
+
+    def fechar(self):
+        self.pubsub.close()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Broker do processo, conforme settings.DASHBOARD_EVENTS_BROKER ('redis' ou 'local')"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                if getattr(settings, 'DASHBOARD_EVENTS_BROKER', 'local') == 'redis':
+                    _broker = BrokerRedis(settings.REDIS_URL)
+                else:
+                    _broker = BrokerLocal()
+    return _broker
+
+
+def publicar(tipo, dados):
+    """
+    Publica um evento após o commit da transação corrente (imediatamente fora
+    de transação): alterações desfeitas por rollback não chegam aos clientes.
+    Falhas do broker são registradas e não afetam a gravação.
+
+    O evento leva as versões do cache (apps.core.cache) após a alteração: o
+    cliente que reconecta compara com as suas e recarrega se perdeu algo.
+    """
+    def enviar():
+        try:
+            mensagem = formatar_evento(tipo, {**dados, 'versoes': get_versions()})
+            get_broker().publicar(mensagem)
+            contar('eventos.publicados')
+        except Exception:
+            logger.exception('Falha ao publicar evento %s', tipo)
+
+    transaction.on_commit(enviar)
@@ -0,0 +1,267 @@
+"""
+Carga em massa das planilhas FUNETEC (tb_*.xlsx).
+
+- TABELAS_FUNETEC: layout de cada planilha (coluna -> campo e tipo), a chave
+  única usada no upsert e a tabela pai da chave estrangeira, em ordem de dependência.
+- converter_planilha: conversão e validação vetorizadas com pandas, sem acesso ao banco.
+- carregar_planilha: valida as chaves estrangeiras com um in_bulk() por tabela pai
+  e grava com bulk_create(update_conflicts=True) em lotes.
+"""
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+import pandas as pd
+from django.apps import apps
+
+from apps.core.sql_loader import TableStats
+
+
+@dataclass(frozen=True)
+class Coluna:
+    origem: str
+    campo: str
+    tipo: str = 'texto'  # texto, codigo, inteiro, data ou decimal
+    obrigatoria: bool = True
+
+
+@dataclass(frozen=True)
+class TabelaFunetec:
+    nome: str
+    arquivo: str
+    model: str
+    colunas: tuple
+    unique_fields: tuple
+    # (coluna da planilha, modelo pai) validada antes da gravação
+    pai: tuple = None
+
+    @property
+    def chave(self):
+        origem = {coluna.campo: coluna.origem for coluna in self.colunas}
+        return [origem[campo] for campo in self.unique_fields]
+
+
+TABELAS_FUNETEC = (
+    TabelaFunetec(
+        'projetos', 'tb_projetos.xlsx', 'projetos.Projeto',
+        colunas=(
+            Coluna('codProjeto', 'cod_projeto', 'inteiro'),
+            Coluna('nome', 'nome'),
+            Coluna('dataInicio', 'data_inicio', 'data'),
+            Coluna('dataEncerramento', 'data_encerramento', 'data'),
+            Coluna('valor', 'valor', 'decimal'),
+            Coluna('situacao', 'situacao', 'codigo'),
+        ),
+        unique_fields=('cod_projeto',),
+    ),
+    TabelaFunetec(
+        'requisicoes', 'tb_requisicao.xlsx', 'projetos.Requisicao',
+        colunas=(
+            Coluna('codRequisicao', 'cod_requisicao', 'inteiro'),
+            Coluna('codProjeto', 'cod_projeto', 'inteiro'),
+            Coluna('descricao', 'descricao'),
+            Coluna('dataSolicitacao', 'data_solicitacao', 'data'),
+            Coluna('dataLimite', 'data_limite', 'data'),
+            Coluna('valor', 'valor', 'decimal'),
+            Coluna('situacao', 'situacao', 'codigo'),
+        ),
+        unique_fields=('cod_requisicao',),
+        pai=('codProjeto', 'projetos.Projeto'),
+    ),
+    TabelaFunetec(
+        'ordens', 'tb_ordem.xlsx', 'projetos.Ordem',
+        colunas=(
+            Coluna('codOrdem', 'cod_ordem', 'inteiro'),
+            Coluna('codRequisicao', 'cod_requisicao', 'inteiro'),
+            Coluna('descricao', 'descricao'),
+            Coluna('dataSolicitacao', 'data_solicitacao', 'data'),
+            Coluna('dataLimite', 'data_limite', 'data'),
+            Coluna('valor', 'valor', 'decimal'),
+            Coluna('situacao', 'situacao', 'codigo'),
+        ),
+        unique_fields=('cod_ordem',),
+        pai=('codRequisicao', 'projetos.Requisicao'),
+    ),
+    TabelaFunetec(
+        'itens_ordem', 'tb_itens_ordem.xlsx', 'projetos.ItemOrdem',
+        colunas=(
+            Coluna('codOrdem', 'cod_ordem', 'inteiro'),
+            Coluna('codItem', 'cod_item', 'inteiro'),
+            Coluna('descricao', 'descricao'),
+            Coluna('dataSolicitacao', 'data_solicitacao', 'data'),
+            Coluna('dataLimite', 'data_limite', 'data'),
+            Coluna('valor', 'valor', 'decimal'),
+            Coluna('dataRecebido', 'data_recebido', 'data', obrigatoria=False),
+            Coluna('situacao', 'situacao', 'codigo'),
+        ),
+        unique_fields=('cod_ordem', 'cod_item'),
+        pai=('codOrdem', 'projetos.Ordem'),
+    ),
+    TabelaFunetec(
+        'contratos', 'tb_contratos.xlsx', 'contratos.Contrato',
+        colunas=(
+            Coluna('numContrato', 'num_contrato', 'codigo'),
+            # Contrato.cod_ordem é um IntegerField: grava o código, validado contra Ordem
+            Coluna('codOrdem', 'cod_ordem', 'inteiro'),
+            Coluna('descricao', 'descricao'),
+            Coluna('cpfcnpj', 'cpf_cnpj', 'codigo', obrigatoria=False),
+            Coluna('contratado', 'contratado', obrigatoria=False),
+            Coluna('tipoPessoa', 'tipo_pessoa', 'inteiro', obrigatoria=False),
+            Coluna('dataInicio', 'data_inicio', 'data', obrigatoria=False),
+            Coluna('dataFim', 'data_fim', 'data', obrigatoria=False),
+            Coluna('valor', 'valor', 'decimal', obrigatoria=False),
+            Coluna('parcelas', 'parcelas', 'inteiro', obrigatoria=False),
+            Coluna('dataParcelaInicial', 'data_parcela_inicial', 'data', obrigatoria=False),
+            Coluna('situacao', 'situacao', 'codigo', obrigatoria=False),
+        ),
+        unique_fields=('num_contrato',),
+        pai=('codOrdem', 'projetos.Ordem'),
+    ),
+    TabelaFunetec(
+        'itens_contrato', 'tb_itens_contrato.xlsx', 'contratos.ItemContrato',
+        colunas=(
+            Coluna('numContrato', 'num_contrato', 'codigo'),
+            Coluna('codLancamento', 'cod_lancamento', 'inteiro'),
+            Coluna('dataLancamento', 'data_lancamento', 'data'),
+            Coluna('numParcela', 'num_parcela', 'inteiro'),
+            Coluna('valorParcela', 'valor_parcela', 'decimal'),
+            Coluna('dataVencimento', 'data_vencimento', 'data'),
+            Coluna('valorPago', 'valor_pago', 'decimal'),
+            Coluna('dataPagamento', 'data_pagamento', 'data', obrigatoria=False),
+            Coluna('situacao', 'situacao', 'codigo'),
+        ),
+        unique_fields=('num_contrato', 'cod_lancamento'),
+        pai=('numContrato', 'contratos.Contrato'),
+    ),
+)
+
+
+@dataclass
+class PlanilhaConvertida:
+    tabela: TabelaFunetec
+    dados: pd.DataFrame
+    lidas: int = 0
+    invalidas: list = field(default_factory=list)
+    duplicadas: int = 0
+
+
+@dataclass
+class ResultadoCarga:
+    stats: TableStats
+    sem_pai: list = field(default_factory=list)
+
+
+def _texto(serie):
+    texto = serie.astype('string').str.strip()
+    return texto.mask(texto == '')
+
+
+def _codigo(serie):
+    # Códigos lidos como número pelo Excel (1.0) voltam ao texto original ("1")
+    return _texto(serie).str.replace(r'\.0+$', '', regex=True)
+
+
+def _inteiro(serie):
+    numeros = pd.to_numeric(serie, errors='coerce')
+    return numeros.where(numeros == numeros.round()).astype('Int64')
+
+
+def _data(serie):
+    return pd.to_datetime(serie, errors='coerce').dt.date
+
+
+def _decimal(serie):
+    numeros = pd.to_numeric(serie, errors='coerce').round(2)
+    return numeros.map(lambda valor: Decimal(f'{valor:.2f}'), na_action='ignore')
+
+
+CONVERSORES = {
+    'texto': _texto,
+    'codigo': _codigo,
+    'inteiro': _inteiro,
+    'data': _data,
+    'decimal': _decimal,
+}
+
+
+def converter_planilha(tabela, df):
+    """
+    Converte as colunas da planilha para os tipos dos campos e descarta
+    linhas inválidas (campo obrigatório vazio ou não conversível) e chaves
+    repetidas, mantendo a última ocorrência como faria o upsert linha a linha.
+    """
+    faltando = [coluna.origem for coluna in tabela.colunas if coluna.origem not in df.columns]
+    if faltando:
+        raise ValueError(f'{tabela.arquivo}: colunas ausentes {", ".join(faltando)}')
+
+    dados = pd.DataFrame(
+        {coluna.origem: CONVERSORES[coluna.tipo](df[coluna.origem]) for coluna in tabela.colunas},
+        index=df.index,
+    )
+
+    obrigatorias = [coluna.origem for coluna in tabela.colunas if coluna.obrigatoria]
+    validas = dados[obrigatorias].notna().all(axis=1)
+    # Linha da planilha: índice + 2 (cabeçalho e base 1)
+    invalidas = (dados.index[~validas] + 2).tolist()
+    dados = dados[validas]
+
+    total = len(dados)
+    dados = dados.drop_duplicates(subset=tabela.chave, keep='last')
+
+    return PlanilhaConvertida(
+        tabela=tabela,
+        dados=dados,
+        lidas=len(df),
+        invalidas=invalidas,
+        duplicadas=total - len(dados),
+    )
+
+
+def ler_planilha(tabela, diretorio):
+    return converter_planilha(tabela, pd.read_excel(f'{diretorio}{tabela.arquivo}'))
+
+
+def carregar_planilha(convertida, batch_size=2000):
+    """
+    Grava a planilha convertida com upsert em lotes. Linhas cuja chave
+    estrangeira não existe são descartadas e retornadas em `sem_pai`.
+    """
+    tabela = convertida.tabela
+    model = apps.get_model(tabela.model)
+    inicio = time.perf_counter()
+
+    # Tipos do pandas (Int64, string, NaT) viram valores Python, com None para ausentes
+    dados = convertida.dados
+    dados = dados.astype(object).where(dados.notna(), None)
+
+    sem_pai = []
+    if tabela.pai and not dados.empty:
+        coluna, model_pai = tabela.pai
+        chaves = dados[coluna].unique().tolist()
+        existentes = apps.get_model(model_pai).objects.only('pk').in_bulk(chaves)
+        encontrados = dados[coluna].isin(list(existentes))
+        sem_pai = dados.loc[~encontrados, coluna].unique().tolist()
+        dados = dados[encontrados]
+
+    campos = [model._meta.get_field(coluna.campo) for coluna in tabela.colunas]
+    dados.columns = [campo.attname for campo in campos]
+    update_fields = [
+        campo.name for campo in campos
+        if campo.name not in tabela.unique_fields and not campo.primary_key
+    ]
+
+    stats = TableStats()
+    registros = dados.to_dict('records')
+    for posicao in range(0, len(registros), batch_size):
+        lote = [model(**registro) for registro in registros[posicao:posicao + batch_size]]
+        model.objects.bulk_create(
+            lote,
+            update_conflicts=True,
+            update_fields=update_fields,
+            unique_fields=list(tabela.unique_fields),
+        )
+        stats.rows += len(lote)
+        stats.batches += 1
+
+    stats.seconds = time.perf_counter() - inicio
+    return ResultadoCarga(stats=stats, sem_pai=sem_pai)
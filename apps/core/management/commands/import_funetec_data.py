@@ -1,11 +1,20 @@
 # apps/core/management/commands/import_funetec_data.py
+import os
 import pandas as pd
+import time
+from concurrent.futures import ProcessPoolExecutor
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from datetime import datetime
 from decimal import Decimal
 from apps.projetos.models import Projeto, Requisicao, Ordem, ItemOrdem
-from apps.contratos.models import Contrato, ItemContrato
+from apps.contratos.models import Contrato, ItemContrato, MonthlyFinancialRollup, SequenciaContrato
+from apps.core.cache import MODELOS_VERSIONADOS, bump_version
+from apps.core.funetec_loader import TABELAS_FUNETEC, carregar_planilha, ler_planilha
+from apps.core.models import ImportRun
+
+TIPO_IMPORTACAO = 'funetec'
+
 
 class Command(BaseCommand):
     help = 'Importa dados dos arquivos Excel do FUNETEC'
@@ -17,9 +26,35 @@ class Command(BaseCommand):
             default='data/',
             help='Caminho para os arquivos Excel'
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Conversão vetorizada e gravação com upsert em lote (bulk_create)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Linhas por lote no modo --bulk (padrão: 2000)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=min(len(TABELAS_FUNETEC), os.cpu_count() or 1),
+            help='Processos para leitura das planilhas no modo --bulk'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Retoma a última importação em lote com falha a partir da etapa que falhou'
+        )
 
     def handle(self, *args, **options):
         path = options['path']
+
+        if options['bulk']:
+            self.import_bulk(path, options['batch_size'], options['workers'], options['resume'])
+            return
         
         with transaction.atomic():
             self.stdout.write('Iniciando importação dos dados FUNETEC...')
@@ -142,7 +177,7 @@ class Command(BaseCommand):
                 Contrato.objects.update_or_create(
                     num_contrato=row['numContrato'],
                     defaults={
-                        'cod_ordem': ordem,
+                        'cod_ordem': ordem.cod_ordem,
                         'descricao': row['descricao'],
                         'cpf_cnpj': str(row['cpfcnpj']),
                         'contratado': row['contratado'],
@@ -183,4 +218,91 @@ class Command(BaseCommand):
             except Contrato.DoesNotExist:
                 self.stdout.write(f'  ⚠ Contrato {row["numContrato"]} não encontrado')
         
-        self.stdout.write(f'  ✓ {len(df)} parcelas importadas')
\ No newline at end of file
+        self.stdout.write(f'  ✓ {len(df)} parcelas importadas')
+
+    def import_bulk(self, path, batch_size, workers, resume):
+        """
+        Modo em lote: as planilhas são lidas em paralelo (processos) e carregadas
+        em ordem de dependência, com commit e checkpoint por tabela em ImportRun.
+        """
+        origem = os.path.abspath(path)
+        run = ImportRun.ultima_pendente(TIPO_IMPORTACAO, origem) if resume else None
+
+        if run is None:
+            if resume:
+                self.stdout.write(self.style.WARNING('Nenhuma importação pendente; iniciando uma nova.'))
+            run = ImportRun.objects.create(tipo=TIPO_IMPORTACAO, origem=origem)
+            self.stdout.write(f'Iniciando importação em lote dos dados FUNETEC (execução #{run.pk})...')
+        else:
+            run.status = ImportRun.STATUS_EM_ANDAMENTO
+            run.save(update_fields=['status'])
+            self.stdout.write(
+                f'Retomando execução #{run.pk} a partir de {run.etapa_erro or "primeira etapa pendente"}...'
+            )
+
+        pendentes = [tabela for tabela in TABELAS_FUNETEC if not run.etapa_concluida(tabela.nome)]
+        carregadas = 0
+        inicio = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # A leitura (pd.read_excel + conversão) não acessa o banco e roda em paralelo;
+            # a gravação segue a ordem de TABELAS_FUNETEC para respeitar as chaves estrangeiras
+            futuros = {tabela.nome: executor.submit(ler_planilha, tabela, path) for tabela in pendentes}
+
+            for tabela in pendentes:
+                try:
+                    convertida = futuros[tabela.nome].result()
+                    with transaction.atomic():
+                        resultado = carregar_planilha(convertida, batch_size=batch_size)
+                        run.registrar_etapa(tabela.nome, resultado.stats)
+                except Exception as e:
+                    for futuro in futuros.values():
+                        futuro.cancel()
+                    run.registrar_erro(tabela.nome, e)
+                    self.stdout.write(self.style.ERROR(
+                        f'Erro na etapa {tabela.nome}: {e}. '
+                        f'Etapas anteriores foram gravadas; use --resume para continuar.'
+                    ))
+                    break
+
+                carregadas += 1
+                self.relatar_etapa(convertida, resultado)
+            else:
+                run.concluir()
+
+        if carregadas:
+            # bulk_create não dispara signals: atualiza consolidado, resumo e sequências dos contratos e versões de cache
+            MonthlyFinancialRollup.rebuild()
+            Contrato.atualizar_resumo()
+            SequenciaContrato.sincronizar()
+            for label in MODELOS_VERSIONADOS:
+                bump_version(label)
+
+        if run.status == ImportRun.STATUS_CONCLUIDO:
+            self.stdout.write(self.style.SUCCESS(
+                f'Importação concluída com sucesso em {time.perf_counter() - inicio:.2f}s!'
+            ))
+
+    def relatar_etapa(self, convertida, resultado):
+        tabela = convertida.tabela
+
+        if convertida.invalidas:
+            linhas = ', '.join(str(linha) for linha in convertida.invalidas[:10])
+            self.stdout.write(self.style.WARNING(
+                f'  ⚠ {len(convertida.invalidas)} linhas inválidas em {tabela.arquivo} (linhas {linhas})'
+            ))
+        if convertida.duplicadas:
+            self.stdout.write(self.style.WARNING(
+                f'  ⚠ {convertida.duplicadas} chaves repetidas em {tabela.arquivo} (mantida a última)'
+            ))
+        if resultado.sem_pai:
+            chaves = ', '.join(str(chave) for chave in resultado.sem_pai[:10])
+            self.stdout.write(self.style.WARNING(
+                f'  ⚠ {tabela.pai[0]} não encontrado: {chaves}'
+            ))
+
+        stats = resultado.stats
+        self.stdout.write(
+            f'  ✓ {tabela.nome:<15} {stats.rows:>8} linhas  {stats.seconds:>7.3f}s  '
+            f'{stats.rows_per_second:>10,.0f} linhas/s'
+        )
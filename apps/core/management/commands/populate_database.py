@@ -1,17 +1,113 @@
 """
 Comando de gerenciamento para popular o banco de dados com dados do arquivo inserts_postgres.sql
+ou com uma massa sintética para testes de carga
 """
-import re
 import os
+import random
+import time
+from collections import Counter
+from datetime import date, timedelta
 from decimal import Decimal
-from datetime import datetime
-from django.core.management.base import BaseCommand
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
-from django.conf import settings
+from django.db.models import Max
 
 # Import models
-from apps.projetos.models import Projeto
-from apps.contratos.models import Contrato
+from apps.projetos.models import Projeto, Requisicao, Ordem, ItemOrdem
+from apps.contratos.models import Contrato, ItemContrato, MonthlyFinancialRollup, SequenciaContrato
+from apps.core.cache import MODELOS_VERSIONADOS, bump_version
+from apps.core.sql_loader import format_insert, iter_rows, model_column_resolver
+
+# Linhas geradas por projeto sintético: projeto, requisição, ordem,
+# 2 itens da ordem, contrato e 10 parcelas
+LINHAS_POR_PROJETO = 16
+PARCELAS_SINTETICAS = 10
+ITENS_ORDEM_SINTETICOS = 2
+
+
+def _valor(rnd, minimo, maximo):
+    return Decimal(rnd.randint(minimo * 100, maximo * 100)).scaleb(-2)
+
+
+def gerar_linhas_sinteticas(total, inicio=1, seed=42):
+    """
+    Gera (tabela, colunas, linha) para uma massa sintética de aproximadamente
+    `total` linhas, tabela a tabela em ordem de dependência. Nada é acumulado:
+    cada tabela recria o gerador pseudoaleatório de cada código, de modo que as
+    datas coincidem entre projeto, requisição, ordem e contrato.
+    """
+    projetos = max(1, -(-total // LINHAS_POR_PROJETO))
+    codigos = range(inicio, inicio + projetos)
+    base = date(2023, 1, 1)
+
+    def datas(codigo):
+        rnd = random.Random(seed * 1_000_003 + codigo)
+        data_inicio = base + timedelta(days=rnd.randint(0, 900))
+        return rnd, data_inicio
+
+    for codigo in codigos:
+        rnd, data_inicio = datas(codigo)
+        yield 'projetos', ['codProjeto', 'nome', 'dataInicio', 'dataEncerramento', 'valor', 'situacao'], (
+            codigo, f'Projeto sintético {codigo:07d}', data_inicio.isoformat(),
+            (data_inicio + timedelta(days=365)).isoformat(), _valor(rnd, 50_000, 2_000_000),
+            str(rnd.randint(1, 6)),
+        )
+
+    colunas = ['codRequisicao', 'codProjeto', 'descricao', 'dataSolicitacao', 'dataLimite', 'valor', 'situacao']
+    for codigo in codigos:
+        rnd, data_inicio = datas(codigo)
+        yield 'requisicao', colunas, (
+            codigo, codigo, f'Requisição sintética {codigo:07d}', data_inicio.isoformat(),
+            (data_inicio + timedelta(days=60)).isoformat(), _valor(rnd, 10_000, 500_000), '1',
+        )
+
+    colunas = ['codOrdem', 'codRequisicao', 'descricao', 'dataSolicitacao', 'dataLimite', 'valor', 'situacao']
+    for codigo in codigos:
+        rnd, data_inicio = datas(codigo)
+        yield 'ordem', colunas, (
+            codigo, codigo, f'Ordem sintética {codigo:07d}', data_inicio.isoformat(),
+            (data_inicio + timedelta(days=30)).isoformat(), _valor(rnd, 10_000, 500_000), '1',
+        )
+
+    colunas = ['codOrdem', 'codItem', 'descricao', 'dataSolicitacao', 'dataLimite', 'valor', 'dataRecebido', 'situacao']
+    for codigo in codigos:
+        rnd, data_inicio = datas(codigo)
+        for item in range(1, ITENS_ORDEM_SINTETICOS + 1):
+            yield 'itens_ordem', colunas, (
+                codigo, item, f'Item {item} da OS {codigo}', data_inicio.isoformat(),
+                (data_inicio + timedelta(days=15)).isoformat(), _valor(rnd, 100, 50_000), None, '1',
+            )
+
+    colunas = ['numContrato', 'codOrdem', 'descricao', 'cpfcnpj', 'contratado', 'tipoPessoa',
+               'dataInicio', 'dataFim', 'valor', 'parcelas', 'dataParcelaInicial', 'situacao']
+    for codigo in codigos:
+        rnd, data_inicio = datas(codigo)
+        tipo_pessoa = rnd.randint(1, 2)
+        yield 'contrato', colunas, (
+            f'S{codigo:07d}/{data_inicio.year}', codigo, f'Contrato sintético OS {codigo}',
+            f'{rnd.randint(0, 10 ** (11 if tipo_pessoa == 1 else 14) - 1):0{11 if tipo_pessoa == 1 else 14}d}',
+            f'Contratado {codigo:07d}', tipo_pessoa, data_inicio.isoformat(),
+            (data_inicio + timedelta(days=30 * (PARCELAS_SINTETICAS + 1))).isoformat(),
+            _valor(rnd, 10_000, 1_000_000), PARCELAS_SINTETICAS,
+            (data_inicio + timedelta(days=30)).isoformat(), '2',
+        )
+
+    colunas = ['numContrato', 'codLancamento', 'dataLancamento', 'numParcela', 'valorParcela',
+               'dataVencimento', 'valorPago', 'dataPagamento', 'situacao']
+    for codigo in codigos:
+        rnd, data_inicio = datas(codigo)
+        num_contrato = f'S{codigo:07d}/{data_inicio.year}'
+        valor_parcela = _valor(rnd, 1_000, 100_000)
+        for parcela in range(1, PARCELAS_SINTETICAS + 1):
+            vencimento = data_inicio + timedelta(days=30 * parcela)
+            pago = vencimento < date.today() and rnd.random() < 0.8
+            yield 'itens_contrato', colunas, (
+                num_contrato, parcela, data_inicio.isoformat(), parcela, valor_parcela,
+                vencimento.isoformat(), valor_parcela if pago else Decimal('0.00'),
+                (vencimento + timedelta(days=rnd.randint(-5, 20))).isoformat() if pago else None,
+                '3' if pago else '1',
+            )
 
 
 class Command(BaseCommand):
@@ -29,27 +125,53 @@ class Command(BaseCommand):
             action='store_true',
             help='Limpa os dados existentes antes de inserir novos'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Registros por bulk_create (padrão: 2000)'
+        )
+        parser.add_argument(
+            '--synthetic',
+            type=int,
+            metavar='LINHAS',
+            help='Gera uma massa sintética com aproximadamente LINHAS registros em vez de ler --file'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Com --synthetic, grava a massa em um arquivo SQL em vez de carregá-la no banco'
+        )
 
     def handle(self, *args, **options):
         file_path = options['file']
         clear_data = options['clear']
-        
+        synthetic = options['synthetic']
+
+        if synthetic and options['output']:
+            self.write_synthetic_file(options['output'], synthetic)
+            return
+
         # Verificar se o arquivo existe
-        if not os.path.exists(file_path):
+        if not synthetic and not os.path.exists(file_path):
             self.stdout.write(
                 self.style.ERROR(f'Arquivo {file_path} não encontrado!')
             )
             return
 
-        self.stdout.write(f'Lendo arquivo: {file_path}')
-        
         # Limpar dados se solicitado
         if clear_data:
             self.clear_existing_data()
 
-        # Processar arquivo SQL
-        self.process_sql_file(file_path)
-        
+        if synthetic:
+            inicio = self.next_synthetic_code()
+            self.stdout.write(f'Gerando massa sintética de ~{synthetic} registros (códigos a partir de {inicio})')
+            self.load_rows(gerar_linhas_sinteticas(synthetic, inicio=inicio), options['batch_size'])
+        else:
+            self.stdout.write(f'Lendo arquivo: {file_path}')
+            with open(file_path, 'r', encoding='utf-8') as file:
+                self.load_rows(iter_rows(file), options['batch_size'])
+
         self.stdout.write(
             self.style.SUCCESS('Population completa!')
         )
@@ -57,143 +179,105 @@ class Command(BaseCommand):
     def clear_existing_data(self):
         """Limpa dados existentes das tabelas"""
         self.stdout.write('Limpando dados existentes...')
-        
+
         # Ordem de exclusão para respeitar FKs
-        models_to_clear = [Projeto, Contrato]
-        
+        models_to_clear = [ItemContrato, Contrato, ItemOrdem, Ordem, Requisicao, Projeto]
+
         for model in models_to_clear:
             count = model.objects.count()
             if count > 0:
                 model.objects.all().delete()
                 self.stdout.write(f'  - {model.__name__}: {count} registros removidos')
 
-    def process_sql_file(self, file_path):
-        """Processa o arquivo SQL e insere os dados"""
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-
-        # Extrair e processar INSERT statements para projetos
-        self.process_projetos_inserts(content)
-        
-        # Processar outros modelos se existirem
-        self.process_contratos_inserts(content)
-
-    def process_projetos_inserts(self, content):
-        """Processa INSERTs da tabela projetos"""
-        self.stdout.write('Processando projetos...')
-        
-        # Regex para capturar INSERT statements de projetos
-        pattern = r"INSERT INTO projetos \([^)]+\) VALUES \(([^)]+)\);"
-        matches = re.findall(pattern, content)
-        
-        projetos_to_create = []
-        
-        for match in matches:
-            # Parse dos valores
-            values = self.parse_sql_values(match)
-            
-            if len(values) >= 6:
-                try:
-                    projeto = Projeto(
-                        cod_projeto=int(values[0]),
-                        nome=values[1].strip("'"),
-                        data_inicio=datetime.strptime(values[2].strip("'"), '%Y-%m-%d').date(),
-                        data_encerramento=datetime.strptime(values[3].strip("'"), '%Y-%m-%d').date(),
-                        valor=Decimal(values[4]),
-                        situacao=values[5].strip("'")
-                    )
-                    projetos_to_create.append(projeto)
-                except (ValueError, TypeError) as e:
-                    self.stdout.write(
-                        self.style.WARNING(f'Erro ao processar projeto: {values} - {e}')
-                    )
-                    continue
-        
-        # Bulk create em lotes
-        if projetos_to_create:
-            batch_size = 1000
-            with transaction.atomic():
-                for i in range(0, len(projetos_to_create), batch_size):
-                    batch = projetos_to_create[i:i + batch_size]
-                    Projeto.objects.bulk_create(batch, ignore_conflicts=True)
-                    
-            self.stdout.write(
-                self.style.SUCCESS(f'  - {len(projetos_to_create)} projetos inseridos')
-            )
+    def next_synthetic_code(self):
+        """Primeiro código livre em projetos, requisições e ordens"""
+        maiores = [
+            Projeto.objects.aggregate(maior=Max('cod_projeto'))['maior'],
+            Requisicao.objects.aggregate(maior=Max('cod_requisicao'))['maior'],
+            Ordem.objects.aggregate(maior=Max('cod_ordem'))['maior'],
+        ]
+        return max(maior or 0 for maior in maiores) + 1
+
+    def write_synthetic_file(self, output, total, por_insert=1000):
+        """Grava a massa sintética como INSERTs de várias linhas, sem mantê-la em memória"""
+        linhas = 0
+        with open(output, 'w', encoding='utf-8') as arquivo:
+            arquivo.write('-- MASSA SINTÉTICA GERADA POR populate_database --synthetic\nBEGIN;\n')
+            chave = None
+            bloco = []
+            for table, columns, row in gerar_linhas_sinteticas(total):
+                if (table, columns) != chave or len(bloco) >= por_insert:
+                    if bloco:
+                        arquivo.write(format_insert(*chave, bloco))
+                    chave = (table, columns)
+                    bloco = []
+                bloco.append(row)
+                linhas += 1
+            if bloco:
+                arquivo.write(format_insert(*chave, bloco))
+            arquivo.write('COMMIT;\n')
+
+        self.stdout.write(self.style.SUCCESS(f'{linhas} linhas gravadas em {output}'))
+
+    def load_rows(self, rows, batch_size):
+        """
+        Converte as linhas tipadas em instâncias do modelo da tabela e grava com
+        bulk_create a cada `batch_size` registros (ou ao mudar de tabela).
+        """
+        modelos = {model._meta.db_table.lower(): model for model in apps.get_models()}
+        resolver = model_column_resolver()
+        inseridos = Counter()
+        ignoradas = Counter()
+
+        chave = model = None
+        lote = []
+
+        def flush():
+            if lote:
+                model.objects.bulk_create(lote, ignore_conflicts=True)
+                inseridos[model] += len(lote)
+                lote.clear()
 
-    def process_contratos_inserts(self, content):
-        """Processa INSERTs da tabela contrato"""
-        self.stdout.write('Processando contratos...')
-        
-        # Regex para capturar INSERT statements de contrato
-        pattern = r"INSERT INTO contrato \([^)]+\) VALUES \(([^)]+)\);"
-        matches = re.findall(pattern, content)
-        
-        contratos_to_create = []
-        
-        for match in matches:
-            # Parse dos valores
-            values = self.parse_sql_values(match)
-            
-            if len(values) >= 3:  # Ajustar conforme estrutura real
-                try:
-                    # Ajustar campos conforme o modelo Contrato
-                    contrato_data = {}
-                    
-                    # Mapear campos do SQL para o modelo Django
-                    if len(values) > 0:
-                        contrato_data['num_contrato'] = values[0].strip("'")
-                    if len(values) > 1:
-                        contrato_data['cod_ordem'] = int(values[1]) if values[1] != 'NULL' else None
-                    if len(values) > 2:
-                        contrato_data['descricao'] = values[2].strip("'") if values[2] != 'NULL' else ''
-                    
-                    contrato = Contrato(**contrato_data)
-                    contratos_to_create.append(contrato)
-                    
-                except (ValueError, TypeError) as e:
-                    self.stdout.write(
-                        self.style.WARNING(f'Erro ao processar contrato: {values} - {e}')
-                    )
+        inicio = time.perf_counter()
+        with transaction.atomic():
+            for table, columns, row in rows:
+                if (table, columns) != chave:
+                    flush()
+                    chave = (table, columns)
+                    model = modelos.get(table.lower())
+                    if model is not None:
+                        # Colunas do script (ex.: codItem) -> colunas reais -> atributos do modelo
+                        atributos = {campo.column: campo.attname for campo in model._meta.concrete_fields}
+                        resolvidas = resolver(table, columns)
+                        desconhecidas = [original for original, coluna in zip(columns, resolvidas)
+                                         if coluna not in atributos]
+                        if desconhecidas:
+                            raise CommandError(
+                                f'Tabela {table}: coluna(s) sem campo no modelo {model.__name__}: '
+                                f'{", ".join(desconhecidas)}'
+                            )
+                        campos = [atributos[coluna] for coluna in resolvidas]
+
+                if model is None:
+                    ignoradas[table] += 1
                     continue
-        
-        # Bulk create em lotes
-        if contratos_to_create:
-            batch_size = 1000
-            with transaction.atomic():
-                for i in range(0, len(contratos_to_create), batch_size):
-                    batch = contratos_to_create[i:i + batch_size]
-                    Contrato.objects.bulk_create(batch, ignore_conflicts=True)
-                    
-            self.stdout.write(
-                self.style.SUCCESS(f'  - {len(contratos_to_create)} contratos inseridos')
-            )
 
-    def parse_sql_values(self, values_string):
-        """Parse dos valores de um INSERT SQL"""
-        # Remove espaços em branco no início e fim
-        values_string = values_string.strip()
-        
-        # Split por vírgulas mas respeitando strings entre aspas
-        values = []
-        current_value = ""
-        in_quotes = False
-        
-        for char in values_string:
-            if char == "'" and not in_quotes:
-                in_quotes = True
-                current_value += char
-            elif char == "'" and in_quotes:
-                in_quotes = False
-                current_value += char
-            elif char == "," and not in_quotes:
-                values.append(current_value.strip())
-                current_value = ""
-            else:
-                current_value += char
-        
-        # Adicionar último valor
-        if current_value.strip():
-            values.append(current_value.strip())
-        
-        return values
\ No newline at end of file
+                lote.append(model(**dict(zip(campos, row))))
+                if len(lote) >= batch_size:
+                    flush()
+            flush()
+        duracao = time.perf_counter() - inicio
+
+        # bulk_create não dispara signals: atualiza consolidado, resumo e sequências dos contratos e versões de cache
+        MonthlyFinancialRollup.rebuild()
+        Contrato.atualizar_resumo()
+        SequenciaContrato.sincronizar()
+        for label in MODELOS_VERSIONADOS:
+            bump_version(label)
+
+        for model, total in inseridos.items():
+            self.stdout.write(f'  - {model._meta.db_table}: {total} registros processados')
+        for table, total in ignoradas.items():
+            self.stdout.write(self.style.WARNING(f'  - {table}: tabela sem modelo, {total} linhas ignoradas'))
+        total = sum(inseridos.values())
+        self.stdout.write(f'{total} registros em {duracao:.2f}s ({total / duracao if duracao else 0:,.0f}/s)')
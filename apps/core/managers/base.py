@@ -1,7 +1,16 @@
+from django.apps import apps
 from django.db import models
+from django.db.models import Count, DecimalField, Exists, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 
+def soma(expressao, output_field=None):
+    """Sum que devolve 0 (e não None) quando não há linhas"""
+    output_field = output_field or DecimalField(max_digits=16, decimal_places=2)
+    return Coalesce(Sum(expressao, output_field=output_field), Value(0), output_field=output_field)
+
+
 class ActiveManager(models.Manager):
     """
     Manager para objetos ativos.
@@ -36,35 +45,44 @@ class ProjetoManager(models.Manager):
     Implementa padrões Factory Method e Strategy.
     """
     
+    # Condições compartilhadas pelos filtros e pelas métricas agregadas
+    ATIVOS = ~Q(situacao__in=['5', '6'])
+    EM_ANDAMENTO = Q(situacao='2')
+    CONCLUIDOS = Q(situacao='6')
+    CANCELADOS = Q(situacao='5')
+
+    @classmethod
+    def q_atrasados(cls, hoje):
+        return cls.ATIVOS & Q(data_encerramento__lt=hoje)
+
+    @classmethod
+    def q_proximos_vencimento(cls, hoje, dias=7):
+        data_limite = hoje + timezone.timedelta(days=dias)
+        return cls.ATIVOS & Q(data_encerramento__gte=hoje, data_encerramento__lte=data_limite)
+    
     def ativos(self):
         """Projetos ativos (não cancelados nem concluídos)"""
-        return self.exclude(situacao__in=['5', '6'])
+        return self.filter(self.ATIVOS)
     
     def em_andamento(self):
         """Projetos em andamento"""
-        return self.filter(situacao='2')
+        return self.filter(self.EM_ANDAMENTO)
     
     def concluidos(self):
         """Projetos concluídos"""
-        return self.filter(situacao='6')
+        return self.filter(self.CONCLUIDOS)
     
     def cancelados(self):
         """Projetos cancelados"""
-        return self.filter(situacao='5')
+        return self.filter(self.CANCELADOS)
     
     def atrasados(self):
         """Projetos atrasados"""
-        hoje = timezone.now().date()
-        return self.ativos().filter(data_encerramento__lt=hoje)
+        return self.filter(self.q_atrasados(timezone.now().date()))
     
     def proximos_vencimento(self, dias=7):
         """Projetos próximos do vencimento"""
-        hoje = timezone.now().date()
-        data_limite = hoje + timezone.timedelta(days=dias)
-        return self.ativos().filter(
-            data_encerramento__gte=hoje,
-            data_encerramento__lte=data_limite
-        )
+        return self.filter(self.q_proximos_vencimento(timezone.now().date(), dias))
     
     def por_responsavel(self, user):
         """Projetos por responsável"""
@@ -78,24 +96,26 @@ class ProjetoManager(models.Manager):
         """Projetos com orçamento estourado"""
         return self.filter(valor_realizado__gt=models.F('valor'))
     
-    def dashboard_metricas(self):
+    def dashboard_metricas(self, queryset=None, hoje=None):
         """
         Factory Method para métricas do dashboard.
-        Retorna dados agregados para visualização.
+        Retorna dados agregados para visualização, calculados com um único
+        aggregate() (COUNT/SUM com FILTER). `queryset` permite partir de um
+        conjunto já filtrado (ex.: projetos visíveis ao usuário).
         """
-        hoje = timezone.now().date()
+        hoje = hoje or timezone.now().date()
+        queryset = self.get_queryset() if queryset is None else queryset
         
-        return {
-            'total': self.count(),
-            'ativos': self.ativos().count(),
-            'em_andamento': self.em_andamento().count(),
-            'concluidos': self.concluidos().count(),
-            'cancelados': self.cancelados().count(),
-            'atrasados': self.atrasados().count(),
-            'proximos_vencimento': self.proximos_vencimento().count(),
-            'valor_total': self.aggregate(total=models.Sum('valor'))['total'] or 0,
-            'valor_realizado': self.aggregate(total=models.Sum('valor_realizado'))['total'] or 0,
-        }
+        return queryset.aggregate(
+            total=Count('pk'),
+            ativos=Count('pk', filter=self.ATIVOS),
+            em_andamento=Count('pk', filter=self.EM_ANDAMENTO),
+            concluidos=Count('pk', filter=self.CONCLUIDOS),
+            cancelados=Count('pk', filter=self.CANCELADOS),
+            atrasados=Count('pk', filter=self.q_atrasados(hoje)),
+            proximos_vencimento=Count('pk', filter=self.q_proximos_vencimento(hoje)),
+            valor_total=soma('valor'),
+        )
 
 
 class ContratoManager(models.Manager):
@@ -104,64 +124,103 @@ class ContratoManager(models.Manager):
     Implementa padrões Strategy e Observer.
     """
     
+    # Condições compartilhadas pelos filtros e pelas métricas agregadas
+    ATIVOS = Q(situacao__in=['1', '2'])
+    EM_ANDAMENTO = Q(situacao='2')
+    FINALIZADOS = Q(situacao='4')
+    PESSOA_FISICA = Q(tipo_pessoa=1)
+    PESSOA_JURIDICA = Q(tipo_pessoa=2)
+
+    @staticmethod
+    def existe_parcela_pendente(**filtros):
+        """EXISTS correlacionado nas parcelas pendentes do contrato: sem JOIN nem distinct()"""
+        ItemContrato = apps.get_model('contratos', 'ItemContrato')
+        return Exists(ItemContrato.objects.filter(num_contrato=OuterRef('pk'), situacao='1', **filtros))
+
+    @classmethod
+    def q_parcelas_vencidas(cls, hoje):
+        return cls.PESSOA_FISICA & cls.existe_parcela_pendente(data_vencimento__lt=hoje)
+
+    @classmethod
+    def q_proximas_parcelas(cls, hoje, dias=7):
+        data_limite = hoje + timezone.timedelta(days=dias)
+        return cls.PESSOA_FISICA & cls.existe_parcela_pendente(
+            data_vencimento__gte=hoje, data_vencimento__lte=data_limite
+        )
+    
     def ativos(self):
         """Contratos ativos"""
-        return self.filter(situacao__in=['1', '2'])
+        return self.filter(self.ATIVOS)
     
     def em_andamento(self):
         """Contratos em andamento"""
-        return self.filter(situacao='2')
+        return self.filter(self.EM_ANDAMENTO)
     
     def finalizados(self):
         """Contratos finalizados"""
-        return self.filter(situacao='4')
+        return self.filter(self.FINALIZADOS)
     
     def pessoa_fisica(self):
         """Contratos de pessoa física"""
-        return self.filter(tipo_pessoa=1)
+        return self.filter(self.PESSOA_FISICA)
     
     def pessoa_juridica(self):
         """Contratos de pessoa jurídica"""
-        return self.filter(tipo_pessoa=2)
+        return self.filter(self.PESSOA_JURIDICA)
     
+    def com_vencimentos(self, hoje=None):
+        """
+        Anota parcelas_vencidas e proximo_vencimento (parcelas pendentes), que
+        dependem da data e por isso são calculados na consulta, em relação a `hoje`
+        """
+        ItemContrato = apps.get_model('contratos', 'ItemContrato')
+        hoje = hoje or timezone.now().date()
+        pendentes = ItemContrato.objects.filter(num_contrato=OuterRef('pk'), situacao='1').order_by()
+        vencidas = pendentes.filter(data_vencimento__lt=hoje).values('num_contrato').annotate(
+            total=Count('pk')
+        ).values('total')
+        proximo = pendentes.filter(data_vencimento__gte=hoje).order_by('data_vencimento').values(
+            'data_vencimento'
+        )[:1]
+        return self.annotate(
+            parcelas_vencidas=Coalesce(Subquery(vencidas), 0),
+            proximo_vencimento=Subquery(proximo),
+        )
+
     def com_parcelas_vencidas(self):
         """Contratos com parcelas vencidas"""
-        hoje = timezone.now().date()
-        return self.pessoa_fisica().filter(
-            itens__situacao='1',
-            itens__data_vencimento__lt=hoje
-        ).distinct()
+        return self.filter(self.q_parcelas_vencidas(timezone.now().date()))
     
     def proximas_parcelas(self, dias=7):
         """Contratos com parcelas próximas do vencimento"""
-        hoje = timezone.now().date()
-        data_limite = hoje + timezone.timedelta(days=dias)
-        return self.pessoa_fisica().filter(
-            itens__situacao='1',
-            itens__data_vencimento__gte=hoje,
-            itens__data_vencimento__lte=data_limite
-        ).distinct()
+        return self.filter(self.q_proximas_parcelas(timezone.now().date(), dias))
     
     def por_prestador(self, cpf_cnpj):
         """Contratos por prestador"""
         return self.filter(cpf_cnpj=cpf_cnpj)
     
-    def dashboard_financeiro(self):
+    def dashboard_financeiro(self, queryset=None, hoje=None):
         """
         Factory Method para métricas financeiras.
-        Retorna dados financeiros para dashboard.
+        Retorna dados financeiros para dashboard com um único aggregate(),
+        a partir do resumo de pagamentos de cada contrato; parcelas vencidas e
+        próximas são comparadas com `hoje` na própria consulta. `queryset` permite
+        partir de um conjunto já filtrado (ex.: contratos visíveis ao usuário).
         """
-        return {
-            'total_contratos': self.count(),
-            'contratos_ativos': self.ativos().count(),
-            'contratos_pf': self.pessoa_fisica().count(),
-            'contratos_pj': self.pessoa_juridica().count(),
-            'valor_total': self.aggregate(total=models.Sum('valor'))['total'] or 0,
-            'valor_pago': self.aggregate(total=models.Sum('valor_pago'))['total'] or 0,
-            'valor_pendente': self.aggregate(total=models.Sum('valor_pendente'))['total'] or 0,
-            'parcelas_vencidas': self.com_parcelas_vencidas().count(),
-            'proximas_parcelas': self.proximas_parcelas().count(),
-        }
+        hoje = hoje or timezone.now().date()
+        queryset = self.get_queryset() if queryset is None else queryset
+        
+        return queryset.aggregate(
+            total_contratos=Count('pk'),
+            contratos_ativos=Count('pk', filter=self.ATIVOS),
+            contratos_pf=Count('pk', filter=self.PESSOA_FISICA),
+            contratos_pj=Count('pk', filter=self.PESSOA_JURIDICA),
+            valor_total=soma('valor'),
+            valor_pago=soma('total_pago'),
+            valor_pendente=soma(F('total_previsto') - F('total_pago')),
+            parcelas_vencidas=Count('pk', filter=self.q_parcelas_vencidas(hoje)),
+            proximas_parcelas=Count('pk', filter=self.q_proximas_parcelas(hoje)),
+        )
 
 
 class ItemContratoManager(models.Manager):
@@ -5,6 +5,8 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 import threading
 
+from apps.core.profiling import RequestProfile, contar, registrar_perfil
+
 logger = logging.getLogger('apps')
 User = get_user_model()
 
@@ -129,75 +131,176 @@ class CacheMiddleware(MiddlewareMixin):
     """
     Middleware para cache de requisições.
     Implementa padrão Decorator para otimização.
+
+    As chaves incluem as versões de Projeto, Contrato e ItemContrato
+    (apps.core.cache), incrementadas pelos signals de post_save/post_delete:
+    qualquer alteração nesses modelos invalida as páginas em cache em todos
+    os workers que compartilham o backend. Respostas levam ETag e
+    requisições condicionais recebem 304.
     """
     
     CACHEABLE_PATHS = [
         '/dashboard/',
         '/api/',
     ]
+    # Payloads dos gráficos têm cache próprio (stale-while-revalidate, ChartPayloadCacheMixin);
+    # o fluxo de eventos (SSE) é uma resposta em streaming
+    EXCLUDED_PATHS = [
+        '/dashboard/api/chart-data/',
+        '/dashboard/api/eventos/',
+    ]
     
-    CACHE_DURATION = 300  # 5 minutos
+    def __init__(self, get_response=None):
+        from django.conf import settings
+        super().__init__(get_response)
+        self.cache_duration = getattr(settings, 'VERSIONED_CACHE_TIMEOUT', 60 * 60 * 6)
+        self.html_cache_duration = getattr(settings, 'HTML_CACHE_TIMEOUT', 300)
     
     def process_request(self, request):
         """Verificar cache antes de processar requisição"""
         from django.core.cache import cache
         
-        # Só cachear GETs
-        if request.method != 'GET':
+        if not self._is_cacheable(request):
             return None
         
-        # Verificar se path é cacheável
-        if not any(request.path.startswith(path) for path in self.CACHEABLE_PATHS):
+        request._cache_key = self._generate_cache_key(request)
+        
+        # Tentar obter do cache
+        cached = cache.get(request._cache_key)
+        if cached is None:
+            contar('page_cache.miss')
             return None
         
-        # Gerar chave do cache
-        cache_key = self._generate_cache_key(request)
+        contar('page_cache.hit')
+        logger.info(f'CACHE_HIT {request.path}')
+        content, status, content_type, etag = cached
         
-        # Tentar obter do cache
-        cached_response = cache.get(cache_key)
-        if cached_response:
-            logger.info(f'CACHE_HIT {request.path}')
-            return cached_response
+        if self._etag_matches(request, etag):
+            return self._not_modified(etag)
         
-        return None
+        from django.http import HttpResponse
+        response = HttpResponse(content, status=status, content_type=content_type)
+        response['ETag'] = etag
+        response._from_cache = True
+        return response
     
     def process_response(self, request, response):
         """Armazenar resposta no cache"""
         from django.core.cache import cache
         
-        # Só cachear responses 200
-        if response.status_code != 200:
+        cache_key = getattr(request, '_cache_key', None)
+        if not cache_key or getattr(response, '_from_cache', False):
             return response
         
-        # Só cachear GETs
-        if request.method != 'GET':
+        # Só cachear responses 200 completas e que não alteram cookies (sessão, mensagens)
+        if response.status_code != 200 or response.streaming or response.cookies:
             return response
-        
-        # Verificar se path é cacheável
-        if not any(request.path.startswith(path) for path in self.CACHEABLE_PATHS):
+        # Página com token CSRF embutido (o cookie é gravado depois, pelo CsrfViewMiddleware)
+        if request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
             return response
         
-        # Gerar chave do cache e armazenar
-        cache_key = self._generate_cache_key(request)
-        cache.set(cache_key, response, self.CACHE_DURATION)
+        content_type = response.get('Content-Type', '')
+        # HTML inclui dados de sessão/usuário além dos modelos versionados: prazo curto
+        timeout = self.html_cache_duration if content_type.startswith('text/html') else self.cache_duration
+        etag = self._generate_etag(response.content)
+        response['ETag'] = etag
+        cache.set(
+            cache_key,
+            (response.content, response.status_code, content_type, etag),
+            timeout,
+        )
         
         logger.info(f'CACHE_SET {request.path}')
         
+        if self._etag_matches(request, etag):
+            return self._not_modified(etag)
+        
         return response
     
+    def _is_cacheable(self, request):
+        """Só GETs em paths cacheáveis"""
+        if request.method != 'GET':
+            return False
+        if any(request.path.startswith(path) for path in self.EXCLUDED_PATHS):
+            return False
+        return any(request.path.startswith(path) for path in self.CACHEABLE_PATHS)
+    
     def _generate_cache_key(self, request):
-        """Gerar chave única para o cache"""
-        import hashlib
+        """Gerar chave versionada para o cache"""
+        from apps.core.cache import versioned_key
         
-        # Incluir path, query params e usuário
-        key_parts = [
+        # Incluir path, query params, formato, usuário e data (relatórios dependem de "hoje")
+        return versioned_key(
+            'page_cache',
             request.path,
             request.GET.urlencode(),
-            str(request.user.id) if request.user.is_authenticated else 'anonymous'
-        ]
-        
-        key_string = '|'.join(key_parts)
-        return f"page_cache_{hashlib.md5(key_string.encode()).hexdigest()}"
+            request.META.get('HTTP_ACCEPT', ''),
+            str(request.user.id) if request.user.is_authenticated else 'anonymous',
+            timezone.localdate().isoformat(),
+        )
+    
+    def _generate_etag(self, content):
+        import hashlib
+        return f'"{hashlib.md5(content).hexdigest()}"'
+    
+    def _etag_matches(self, request, etag):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+        return etag in [value.strip() for value in if_none_match.split(',')]
+    
+    def _not_modified(self, etag):
+        from django.http import HttpResponseNotModified
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Middleware de instrumentação (apps.core.profiling).
+    Mede consultas SQL (quantidade, tempo e repetições), tempo de Python e
+    tempo total de cada requisição, identificada pelo nome da URL
+    ("dashboard:index"), e aplica os orçamentos de settings.PERF_BUDGETS.
+    Em respostas em streaming, mede apenas até o início da resposta.
+    """
+
+    def __init__(self, get_response):
+        from django.conf import settings
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PROFILING_ENABLED', True)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        from contextlib import ExitStack
+        from django.db import connections
+
+        perfil = RequestProfile(method=request.method, path=request.path)
+        token = perfil.iniciar()
+        try:
+            with ExitStack() as stack:
+                for conexao in connections.all():
+                    stack.enter_context(conexao.execute_wrapper(perfil))
+                response = self.get_response(request)
+        finally:
+            perfil.finalizar(token)
+
+        perfil.view = self._view_name(request)
+        perfil.status = response.status_code
+        request.profile = perfil
+        registrar_perfil(perfil)
+        return response
+
+    def _view_name(self, request):
+        # Respostas servidas pelo CacheMiddleware não passam pela resolução de URL
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            from django.urls import Resolver404, resolve
+            try:
+                match = resolve(request.path_info)
+            except Resolver404:
+                return '<sem rota>'
+        return match.view_name
 
 
 class SecurityMiddleware(MiddlewareMixin):
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-17 12:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=50, verbose_name='Tipo de Importação')),
+                ('origem', models.CharField(max_length=255, verbose_name='Origem dos Dados')),
+                ('status', models.CharField(choices=[('em_andamento', 'Em andamento'), ('concluido', 'Concluído'), ('erro', 'Erro')], default='em_andamento', max_length=20, verbose_name='Status')),
+                ('etapas', models.JSONField(default=dict, verbose_name='Etapas Concluídas')),
+                ('etapa_erro', models.CharField(blank=True, max_length=50, verbose_name='Etapa com Erro')),
+                ('erro', models.TextField(blank=True, verbose_name='Erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Iniciada em')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Concluída em')),
+            ],
+            options={
+                'verbose_name': 'Execução de Importação',
+                'verbose_name_plural': 'Execuções de Importação',
+                'db_table': 'import_runs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -1,3 +1,4 @@
 # apps/core/models/__init__.py
 from .base import AuditableModel, BaseModel, EnderecoMixin, PessoaMixin, SituacaoMixin
-from .mixins import AuditMixin, DataMixin, SoftDeleteMixin, StatusMixin, TimestampMixin, ValorMixin
\ No newline at end of file
+from .mixins import AuditMixin, DataMixin, SoftDeleteMixin, StatusMixin, TimestampMixin, ValorMixin
+from .import_run import ImportRun
@@ -0,0 +1,91 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ImportRun(models.Model):
+    '''
+    Execução de uma importação em etapas (uma por tabela).
+    Cada etapa é gravada na mesma transação dos seus dados, de modo que
+    `etapas` reflete exatamente o que já está no banco e uma execução com
+    falha pode ser retomada a partir da etapa que falhou.
+    '''
+
+    STATUS_EM_ANDAMENTO = 'em_andamento'
+    STATUS_CONCLUIDO = 'concluido'
+    STATUS_ERRO = 'erro'
+
+    STATUS_CHOICES = [
+        (STATUS_EM_ANDAMENTO, 'Em andamento'),
+        (STATUS_CONCLUIDO, 'Concluído'),
+        (STATUS_ERRO, 'Erro'),
+    ]
+
+    tipo = models.CharField(
+        max_length=50,
+        verbose_name='Tipo de Importação'
+    )
+    origem = models.CharField(
+        max_length=255,
+        verbose_name='Origem dos Dados'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_EM_ANDAMENTO,
+        verbose_name='Status'
+    )
+    etapas = models.JSONField(
+        default=dict,
+        verbose_name='Etapas Concluídas'
+    )
+    etapa_erro = models.CharField(
+        max_length=50,
+        blank=True,
+        verbose_name='Etapa com Erro'
+    )
+    erro = models.TextField(
+        blank=True,
+        verbose_name='Erro'
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Iniciada em')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Concluída em')
+
+    class Meta:
+        db_table = 'import_runs'
+        verbose_name = 'Execução de Importação'
+        verbose_name_plural = 'Execuções de Importação'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.tipo} ({self.origem}) - {self.get_status_display()}"
+
+    @classmethod
+    def ultima_pendente(cls, tipo, origem):
+        """Última execução não concluída para a mesma importação, se houver"""
+        return cls.objects.filter(tipo=tipo, origem=origem).exclude(
+            status=cls.STATUS_CONCLUIDO
+        ).first()
+
+    def etapa_concluida(self, nome):
+        return nome in self.etapas
+
+    def registrar_etapa(self, nome, stats):
+        self.etapas[nome] = {
+            'linhas': stats.rows,
+            'segundos': round(stats.seconds, 3),
+            'concluida_em': timezone.now().isoformat(),
+        }
+        self.save(update_fields=['etapas'])
+
+    def registrar_erro(self, nome, erro):
+        self.status = self.STATUS_ERRO
+        self.etapa_erro = nome
+        self.erro = str(erro)
+        self.save(update_fields=['status', 'etapa_erro', 'erro'])
+
+    def concluir(self):
+        self.status = self.STATUS_CONCLUIDO
+        self.etapa_erro = ''
+        self.erro = ''
+        self.finished_at = timezone.now()
+        self.save(update_fields=['status', 'etapa_erro', 'erro', 'finished_at'])
@@ -0,0 +1,212 @@
+"""
+Paginação por cursor (keyset) sobre chaves de ordenação estáveis.
+
+Em vez de OFFSET, cada página continua a partir dos valores de ordenação do
+último registro da página anterior (WHERE chave > cursor ORDER BY chave
+LIMIT n), de modo que a página 5.000 custa o mesmo que a primeira. O
+"tem próxima" vem de buscar um registro a mais, sem COUNT.
+
+A última chave da ordenação deve ser única (normalmente a pk) para que a
+ordem seja total. Só a primeira chave pode ser anulável: os registros com
+ela nula formam um segmento à parte, lido depois dos demais, para que cada
+consulta continue sendo uma busca por intervalo no índice.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import and_, or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from django.http import Http404
+
+PROXIMA = 'n'
+ANTERIOR = 'p'
+
+
+class CursorInvalido(ValueError):
+    """Cursor malformado ou incompatível com a ordenação da listagem"""
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    has_next: bool
+    has_previous: bool
+    next_cursor: str = None
+    previous_cursor: str = None
+    number: int = field(default=None, repr=False)  # sem OFFSET não há número de página
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+class KeysetPaginator:
+    """
+    Pagina `queryset` pela `ordering` informada (ex.: ['-data_inicio',
+    'num_contrato']). page(cursor) devolve uma KeysetPage com os cursores
+    opacos das páginas vizinhas.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        if not ordering:
+            raise ValueError('KeysetPaginator requer uma ordenação')
+        self.queryset = queryset
+        self.per_page = per_page
+        self.chaves = []
+        for nome in ordering:
+            campo = queryset.model._meta.get_field(nome.lstrip('-'))
+            self.chaves.append((campo, nome.startswith('-')))
+        if any(campo.null for campo, _ in self.chaves[1:]):
+            raise ValueError('Apenas a primeira chave da ordenação pode aceitar nulos')
+
+    # Cursor -----------------------------------------------------------------
+
+    @staticmethod
+    def valor(objeto, campo):
+        """Valor da chave em uma instância ou em uma linha de .values()"""
+        if isinstance(objeto, dict):
+            return objeto[campo.name]
+        return getattr(objeto, campo.attname)
+
+    def codificar(self, objeto, direcao):
+        valores = []
+        for campo, _ in self.chaves:
+            valor = self.valor(objeto, campo)
+            if valor is not None:
+                valor = valor.isoformat() if hasattr(valor, 'isoformat') else str(valor)
+            valores.append(valor)
+        dados = json.dumps([direcao, valores], separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(dados).decode().rstrip('=')
+
+    def decodificar(self, cursor):
+        try:
+            dados = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            direcao, valores = json.loads(dados)
+            if direcao not in (PROXIMA, ANTERIOR) or len(valores) != len(self.chaves):
+                raise CursorInvalido(cursor)
+            return direcao, [
+                None if valor is None else campo.to_python(valor)
+                for (campo, _), valor in zip(self.chaves, valores)
+            ]
+        except (binascii.Error, ValueError, TypeError, ValidationError) as exc:
+            raise CursorInvalido(cursor) from exc
+
+    # SQL ----------------------------------------------------------------------
+
+    @staticmethod
+    def _ordem(chaves, reverso):
+        return [F(campo.name).desc() if desc != reverso else F(campo.name).asc() for campo, desc in chaves]
+
+    @staticmethod
+    def _filtro(chaves, valores, reverso):
+        """
+        WHERE da continuação: (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...,
+        precedido de k1 >= v1 para que o índice da primeira chave delimite a busca.
+        """
+        def comparacao(campo, desc, valor, inclusiva=False):
+            operador = ('lt' if desc != reverso else 'gt') + ('e' if inclusiva else '')
+            return Q(**{f'{campo.name}__{operador}': valor})
+
+        termos = [
+            reduce(and_, [Q(**{c.name: v}) for (c, _), v in zip(chaves[:posicao], valores)],
+                   comparacao(campo, desc, valor))
+            for posicao, ((campo, desc), valor) in enumerate(zip(chaves, valores))
+        ]
+        (campo, desc), valor = chaves[0], valores[0]
+        return comparacao(campo, desc, valor, inclusiva=True) & reduce(or_, termos)
+
+    def _segmento(self, queryset, chaves, valores, reverso):
+        queryset = queryset.order_by(*self._ordem(chaves, reverso))
+        if valores is not None:
+            queryset = queryset.filter(self._filtro(chaves, valores, reverso))
+        return queryset[:self.per_page + 1]
+
+    def segmentos(self, valores=None, reverso=False):
+        """
+        Consultas, em ordem de leitura, da página que segue `valores`; cada
+        uma traz um registro a mais para indicar se há próxima página.
+        """
+        primeira, _ = self.chaves[0]
+        if not primeira.null:
+            return [self._segmento(self.queryset, self.chaves, valores, reverso)]
+
+        preenchidos = self.queryset.filter(**{f'{primeira.name}__isnull': False})
+        nulos = self.queryset.filter(**{f'{primeira.name}__isnull': True})
+        restantes = self.chaves[1:]
+
+        if valores is None:
+            ordem = [(preenchidos, self.chaves), (nulos, restantes)]
+            return [self._segmento(qs, chaves, None, reverso) for qs, chaves in ordem[::-1 if reverso else 1]]
+        if valores[0] is None:
+            segmentos = [self._segmento(nulos, restantes, valores[1:], reverso)]
+            if reverso:
+                segmentos.append(self._segmento(preenchidos, self.chaves, None, reverso))
+            return segmentos
+        segmentos = [self._segmento(preenchidos, self.chaves, valores, reverso)]
+        if not reverso:
+            segmentos.append(self._segmento(nulos, restantes, None, reverso))
+        return segmentos
+
+    # Página ---------------------------------------------------------------------
+
+    def page(self, cursor=None):
+        direcao, valores = self.decodificar(cursor) if cursor else (PROXIMA, None)
+        reverso = direcao == ANTERIOR
+
+        linhas = []
+        for queryset in self.segmentos(valores, reverso):
+            linhas.extend(queryset[:self.per_page + 1 - len(linhas)])
+            if len(linhas) > self.per_page:
+                break
+        mais = len(linhas) > self.per_page
+        linhas = linhas[:self.per_page]
+        if reverso:
+            linhas.reverse()
+
+        # Quem chegou por um cursor sabe que há registros do lado de onde veio
+        has_next = True if reverso else mais
+        has_previous = mais if reverso else cursor is not None
+        return KeysetPage(
+            object_list=linhas,
+            has_next=has_next and bool(linhas),
+            has_previous=has_previous and bool(linhas),
+            next_cursor=self.codificar(linhas[-1], PROXIMA) if has_next and linhas else None,
+            previous_cursor=self.codificar(linhas[0], ANTERIOR) if has_previous and linhas else None,
+        )
+
+
+class KeysetPaginationMixin:
+    """
+    Substitui a paginação por OFFSET de ListView pela paginação por cursor.
+    A ordenação vem de get_ordering() (`ordering` da view); o template recebe
+    page_obj com next_cursor/previous_cursor e `keyset_query` com os demais
+    parâmetros da URL (ver base/keyset_pagination.html).
+    """
+
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, self.get_ordering(), page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg) or None)
+        except CursorInvalido:
+            raise Http404('Cursor de paginação inválido')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        parametros = self.request.GET.copy()
+        parametros.pop(self.cursor_kwarg, None)
+        parametros.pop('page', None)
+        context['keyset_query'] = parametros.urlencode()
+        context['cursor_kwarg'] = self.cursor_kwarg
+        return context
@@ -0,0 +1,209 @@
+"""
+Instrumentação de desempenho por view.
+
+- ProfilingMiddleware (apps.core.middleware) mede cada requisição com um
+  RequestProfile: número de consultas SQL, tempo de SQL, tempo de Python e
+  assinaturas de consultas repetidas (indício de N+1).
+- Cada perfil é gravado como uma linha JSON no logger "apps.profiling" e
+  agregado em `metrics` (p50/p95 por nome de URL), exposto em /ops/metrics.
+- contar() registra contadores (ex.: acertos de cache) no perfil da
+  requisição atual e nos totais do processo.
+- settings.PERF_BUDGETS define limites por nome de URL, verificados por
+  verificar_orcamento(); com PERF_BUDGETS_ENFORCE o estouro levanta
+  PerfBudgetExceeded (usado nos testes).
+"""
+import contextvars
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import asdict, dataclass, field
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger('apps.profiling')
+
+_perfil_atual = contextvars.ContextVar('perfil_atual', default=None)
+
+_LITERAIS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTAS = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+
+
+class PerfBudgetExceeded(AssertionError):
+    """Requisição acima do orçamento definido em settings.PERF_BUDGETS"""
+
+
+def assinatura_sql(sql):
+    """SQL sem literais e com listas IN colapsadas: consultas que diferem só nos valores coincidem"""
+    return _LISTAS.sub('(...)', _LITERAIS.sub('?', sql))
+
+
+@dataclass
+class RequestProfile:
+    view: str = ''
+    method: str = ''
+    path: str = ''
+    status: int = 0
+    queries: int = 0
+    sql_ms: float = 0.0
+    python_ms: float = 0.0
+    total_ms: float = 0.0
+    duplicadas: dict = field(default_factory=dict)
+    contadores: dict = field(default_factory=dict)
+    timestamp: str = ''
+
+    def __post_init__(self):
+        self._assinaturas = Counter()
+        self._inicio = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """execute_wrapper: mede cada consulta executada durante a requisição"""
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_ms += (time.perf_counter() - inicio) * 1000
+            self.queries += 1
+            self._assinaturas[assinatura_sql(sql)] += 1
+
+    def iniciar(self):
+        self._inicio = time.perf_counter()
+        self.timestamp = timezone.now().isoformat()
+        return _perfil_atual.set(self)
+
+    def finalizar(self, token, maximo_duplicadas=5):
+        _perfil_atual.reset(token)
+        self.total_ms = (time.perf_counter() - self._inicio) * 1000
+        self.python_ms = max(self.total_ms - self.sql_ms, 0.0)
+        self.duplicadas = {
+            sql: quantidade
+            for sql, quantidade in self._assinaturas.most_common(maximo_duplicadas)
+            if quantidade > 1
+        }
+
+    @property
+    def maior_repeticao(self):
+        return max(self.duplicadas.values(), default=1)
+
+    def to_json(self):
+        dados = asdict(self)
+        dados['sql_ms'] = round(self.sql_ms, 3)
+        dados['python_ms'] = round(self.python_ms, 3)
+        dados['total_ms'] = round(self.total_ms, 3)
+        return json.dumps(dados, ensure_ascii=False)
+
+
+def perfil_atual():
+    return _perfil_atual.get()
+
+
+def contar(nome, quantidade=1):
+    """Incrementa um contador na requisição atual (se houver) e nos totais do processo"""
+    perfil = _perfil_atual.get()
+    if perfil is not None:
+        perfil.contadores[nome] = perfil.contadores.get(nome, 0) + quantidade
+    metrics.contar(nome, quantidade)
+
+
+def _percentil(valores, percentil):
+    """Percentil pelo método nearest-rank"""
+    if not valores:
+        return 0
+    ordenados = sorted(valores)
+    posicao = max(0, -(-len(ordenados) * percentil // 100) - 1)
+    return ordenados[int(posicao)]
+
+
+class MetricsStore:
+    """
+    Amostras recentes por nome de URL (janela de PROFILING_SAMPLES) e
+    contadores do processo. Cada worker mantém a própria agregação.
+    """
+
+    CAMPOS = ('total_ms', 'sql_ms', 'python_ms', 'queries')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._amostras = defaultdict(self._nova_janela)
+            self._requisicoes = Counter()
+            self._contadores = Counter()
+
+    def _nova_janela(self):
+        return deque(maxlen=getattr(settings, 'PROFILING_SAMPLES', 1000))
+
+    def registrar(self, perfil):
+        with self._lock:
+            self._amostras[perfil.view].append(
+                tuple(getattr(perfil, campo) for campo in self.CAMPOS) + (perfil.maior_repeticao,)
+            )
+            self._requisicoes[perfil.view] += 1
+
+    def contar(self, nome, quantidade=1):
+        with self._lock:
+            self._contadores[nome] += quantidade
+
+    def resumo(self):
+        with self._lock:
+            amostras = {view: list(janela) for view, janela in self._amostras.items()}
+            requisicoes = dict(self._requisicoes)
+            contadores = dict(self._contadores)
+
+        views = {}
+        for view, linhas in sorted(amostras.items()):
+            colunas = list(zip(*linhas))
+            resumo = {'requisicoes': requisicoes[view], 'amostras': len(linhas)}
+            for indice, campo in enumerate(self.CAMPOS):
+                resumo[f'{campo}_p50'] = round(_percentil(colunas[indice], 50), 3)
+                resumo[f'{campo}_p95'] = round(_percentil(colunas[indice], 95), 3)
+            resumo['maior_repeticao'] = max(colunas[-1])
+            views[view] = resumo
+
+        return {'views': views, 'contadores': contadores}
+
+
+metrics = MetricsStore()
+
+
+def verificar_orcamento(perfil):
+    """
+    Compara o perfil com settings.PERF_BUDGETS[view], que aceita as chaves
+    queries, sql_ms, total_ms e duplicadas (maior repetição de uma consulta).
+    Retorna a lista de estouros.
+    """
+    orcamento = getattr(settings, 'PERF_BUDGETS', {}).get(perfil.view)
+    if not orcamento:
+        return []
+
+    medidas = {
+        'queries': perfil.queries,
+        'sql_ms': perfil.sql_ms,
+        'total_ms': perfil.total_ms,
+        'duplicadas': perfil.maior_repeticao,
+    }
+    return [
+        f'{chave}={medidas[chave]:g} (limite {limite:g})'
+        for chave, limite in orcamento.items()
+        if medidas[chave] > limite
+    ]
+
+
+def registrar_perfil(perfil):
+    """Exporta o perfil (JSON lines), agrega nas métricas e aplica o orçamento"""
+    logger.info(perfil.to_json())
+    metrics.registrar(perfil)
+
+    estouros = verificar_orcamento(perfil)
+    if not estouros:
+        return
+
+    mensagem = f'{perfil.view} ({perfil.method} {perfil.path}): {", ".join(estouros)}'
+    if getattr(settings, 'PERF_BUDGETS_ENFORCE', False):
+        raise PerfBudgetExceeded(mensagem)
+    logging.getLogger('apps').warning(f'PERF_BUDGET_EXCEEDED {mensagem}')
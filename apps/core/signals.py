@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+
+from .cache import MODELOS_VERSIONADOS, bump_version_on_commit
+
+
+def invalidar_cache(sender, **kwargs):
+    """Incrementa a versão do modelo alterado no cache compartilhado, após o commit"""
+    bump_version_on_commit(sender._meta.label)
+
+
+for label in MODELOS_VERSIONADOS:
+    post_save.connect(invalidar_cache, sender=label, dispatch_uid=f'invalidar_cache_{label}')
+    post_delete.connect(invalidar_cache, sender=label, dispatch_uid=f'invalidar_cache_{label}')
@@ -0,0 +1,356 @@
+"""
+Leitura e carga em massa de scripts SQL de INSERT (ex.: inserts_postgres.sql).
+
+- iter_statements: divide o script em declarações lendo linha a linha,
+  respeitando strings entre aspas simples e comentários "--".
+- parse_insert: converte um INSERT ... VALUES (...), (...) em linhas tipadas.
+- iter_rows: gera as linhas tipadas de todas as tabelas do script, uma a uma.
+- BulkLoader: agrupa as linhas por tabela e carrega com COPY FROM STDIN no
+  PostgreSQL ou com INSERT de múltiplas linhas nos demais bancos, completando
+  as colunas que o script omite com os defaults dos modelos.
+"""
+import io
+import re
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.apps import apps
+
+
+TRANSACTION_STATEMENTS = {'BEGIN', 'COMMIT', 'ROLLBACK', 'START TRANSACTION', 'END'}
+
+_SPECIAL = re.compile(r"'|;|--")
+
+_INSERT_HEADER = re.compile(
+    r'INSERT\s+INTO\s+"?(?P<table>[\w.]+)"?\s*\((?P<columns>[^)]*)\)\s*VALUES\s*',
+    re.IGNORECASE,
+)
+
+_VALUE_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>'(?:[^']|'')*')
+      | (?P<null>NULL)\b
+      | (?P<bool>TRUE|FALSE)\b
+      | (?P<number>[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+      | (?P<open>\()
+      | (?P<close>\))
+      | (?P<comma>,)
+    )""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+@dataclass
+class SqlInsert:
+    table: str
+    columns: list
+    rows: list
+
+
+@dataclass
+class TableStats:
+    rows: int = 0
+    seconds: float = 0.0
+    batches: int = 0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def iter_statements(arquivo):
+    """
+    Gera as declarações de um script SQL sem ler o arquivo inteiro.
+    Pontos e vírgulas dentro de strings ('a;b', 'it''s') não encerram a declaração.
+    """
+    partes = []
+    em_string = False
+
+    for linha in arquivo:
+        pos = 0
+        tamanho = len(linha)
+
+        while pos < tamanho:
+            if em_string:
+                fim = linha.find("'", pos)
+                if fim == -1:
+                    partes.append(linha[pos:])
+                    break
+                if linha.startswith("''", fim):
+                    partes.append(linha[pos:fim + 2])
+                    pos = fim + 2
+                    continue
+                partes.append(linha[pos:fim + 1])
+                pos = fim + 1
+                em_string = False
+                continue
+
+            match = _SPECIAL.search(linha, pos)
+            if not match:
+                partes.append(linha[pos:])
+                break
+
+            partes.append(linha[pos:match.start()])
+            token = match.group()
+            pos = match.end()
+
+            if token == "'":
+                partes.append(token)
+                em_string = True
+            elif token == '--':
+                partes.append('\n')
+                break
+            else:
+                declaracao = ''.join(partes).strip()
+                partes = []
+                if declaracao:
+                    yield declaracao
+
+    declaracao = ''.join(partes).strip()
+    if declaracao:
+        yield declaracao
+
+
+def is_transaction_control(statement):
+    return statement.strip().upper() in TRANSACTION_STATEMENTS
+
+
+def _converter(match):
+    if match.group('string') is not None:
+        return match.group('string')[1:-1].replace("''", "'")
+    if match.group('null') is not None:
+        return None
+    if match.group('bool') is not None:
+        return match.group('bool').upper() == 'TRUE'
+    numero = match.group('number')
+    if any(caractere in numero for caractere in '.eE'):
+        return Decimal(numero)
+    return int(numero)
+
+
+def _iter_values(statement, pos, table, quantidade):
+    """Gera as tuplas tipadas de um VALUES (...), (...) a partir de `pos`"""
+    atual = None
+    tamanho = len(statement)
+
+    while pos < tamanho:
+        match = _VALUE_TOKEN.match(statement, pos)
+        if not match:
+            if statement[pos:].strip():
+                raise ValueError(f'Valor SQL não reconhecido: {statement[pos:pos + 40]!r}')
+            break
+        pos = match.end()
+
+        if match.group('open'):
+            atual = []
+        elif match.group('close'):
+            if atual is None or len(atual) != quantidade:
+                raise ValueError(f'Número de valores difere das colunas em {table}')
+            yield tuple(atual)
+            atual = None
+        elif match.group('comma'):
+            continue
+        elif atual is not None:
+            atual.append(_converter(match))
+
+
+def _header(statement):
+    header = _INSERT_HEADER.match(statement)
+    if not header:
+        return None, None, None
+    columns = [coluna.strip().strip('"') for coluna in header.group('columns').split(',')]
+    return header.group('table'), columns, header.end()
+
+
+def parse_insert(statement):
+    """Retorna um SqlInsert com as linhas tipadas, ou None se não for um INSERT ... VALUES"""
+    table, columns, pos = _header(statement)
+    if table is None:
+        return None
+    return SqlInsert(table, columns, list(_iter_values(statement, pos, table, len(columns))))
+
+
+def iter_rows(arquivo, resolver=None):
+    """
+    Gera (tabela, colunas, linha) para cada tupla dos INSERTs do script,
+    uma de cada vez; as demais declarações são ignoradas.
+    """
+    for statement in iter_statements(arquivo):
+        table, columns, pos = _header(statement)
+        if table is None:
+            continue
+        if resolver:
+            columns = resolver(table, columns)
+        for row in _iter_values(statement, pos, table, len(columns)):
+            yield table, columns, row
+
+
+def _sql_literal(valor):
+    if valor is None:
+        return 'NULL'
+    if isinstance(valor, bool):
+        return 'TRUE' if valor else 'FALSE'
+    if isinstance(valor, (int, Decimal)):
+        return str(valor)
+    return "'" + str(valor).replace("'", "''") + "'"
+
+
+def format_insert(table, columns, rows):
+    """Inverso de parse_insert: um INSERT de várias linhas no formato do script"""
+    valores = ',\n'.join(
+        '(' + ', '.join(_sql_literal(valor) for valor in row) + ')' for row in rows
+    )
+    return f'INSERT INTO {table} ({", ".join(columns)}) VALUES\n{valores};\n'
+
+
+def model_column_resolver():
+    """
+    Resolve os nomes de coluna do script para as colunas reais das tabelas dos
+    modelos: aceita a própria coluna (db_column) ou o nome do campo sem
+    sublinhados, de modo que "codItem" encontra o campo cod_item.
+    """
+    tabelas = {}
+    for model in apps.get_models():
+        colunas = {}
+        for campo in model._meta.concrete_fields:
+            colunas[campo.name.replace('_', '').lower()] = campo.column
+            colunas[campo.column.lower()] = campo.column
+        tabelas[model._meta.db_table.lower()] = colunas
+
+    def resolver(table, columns):
+        colunas = tabelas.get(table.lower())
+        if not colunas:
+            return list(columns)
+        return [colunas.get(coluna.lower(), colunas.get(coluna.replace('_', '').lower(), coluna))
+                for coluna in columns]
+
+    return resolver
+
+
+def model_column_defaults():
+    """
+    Colunas NOT NULL com default no modelo, por tabela. O default do Django não
+    existe no banco: sem ele, um script anterior a um campo novo (ex.: totalPago
+    em contrato) falha com NOT NULL ao ser carregado por SQL direto.
+    """
+    return {
+        model._meta.db_table.lower(): [
+            campo for campo in model._meta.concrete_fields
+            if campo.has_default() and not campo.null
+        ]
+        for model in apps.get_models()
+    }
+
+
+def completar_defaults(defaults, table, columns, rows):
+    """Acrescenta às linhas as colunas com default (model_column_defaults) que o INSERT omite"""
+    omitidos = [campo for campo in defaults.get(table.lower(), ()) if campo.column not in columns]
+    if not omitidos:
+        return columns, rows
+    return (
+        [*columns, *(campo.column for campo in omitidos)],
+        [(*row, *(campo.get_default() for campo in omitidos)) for row in rows],
+    )
+
+
+def _copy_value(valor):
+    """Formato texto do COPY: \\N para NULL e escape de barra, tab e quebras de linha"""
+    if valor is None:
+        return '\\N'
+    if isinstance(valor, bool):
+        return 't' if valor else 'f'
+    return (str(valor)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r'))
+
+
+@dataclass
+class BulkLoader:
+    """
+    Acumula linhas de INSERT por tabela e grava em lotes.
+    As tabelas são gravadas na ordem em que aparecem no script, o que
+    preserva a ordem de dependência das chaves estrangeiras.
+    """
+    connection: object
+    batch_size: int = 5000
+    resolver: object = None
+    # Tabela -> campos com default (model_column_defaults) gravados quando o script omite a coluna
+    defaults: dict = None
+    stats: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._chave = None
+        self._linhas = []
+
+    @property
+    def usa_copy(self):
+        return self.connection.vendor == 'postgresql'
+
+    def add(self, insert):
+        columns = self.resolver(insert.table, insert.columns) if self.resolver else insert.columns
+        rows = insert.rows
+        if self.defaults:
+            columns, rows = completar_defaults(self.defaults, insert.table, columns, rows)
+
+        chave = (insert.table, tuple(columns))
+        if chave != self._chave:
+            self.flush()
+            self._chave = chave
+        self._linhas.extend(rows)
+        if len(self._linhas) >= self.batch_size:
+            self.flush()
+
+    def execute(self, statement):
+        """Declarações que não são INSERT são executadas após gravar o lote pendente"""
+        self.flush()
+        with self.connection.cursor() as cursor:
+            cursor.execute(statement)
+
+    def flush(self):
+        if not self._linhas:
+            return
+
+        table, columns = self._chave
+        inicio = time.perf_counter()
+        if self.usa_copy:
+            self._copy(table, columns, self._linhas)
+        else:
+            self._insert_many(table, columns, self._linhas)
+
+        stats = self.stats.setdefault(table, TableStats())
+        stats.rows += len(self._linhas)
+        stats.seconds += time.perf_counter() - inicio
+        stats.batches += 1
+        self._linhas = []
+
+    def _quote(self, nome):
+        return self.connection.ops.quote_name(nome)
+
+    def _copy(self, table, columns, linhas):
+        buffer = io.StringIO()
+        for linha in linhas:
+            buffer.write('\t'.join(_copy_value(valor) for valor in linha))
+            buffer.write('\n')
+        buffer.seek(0)
+
+        colunas = ', '.join(self._quote(coluna) for coluna in columns)
+        with self.connection.cursor() as cursor:
+            cursor.cursor.copy_expert(f'COPY {self._quote(table)} ({colunas}) FROM STDIN', buffer)
+
+    def _insert_many(self, table, columns, linhas):
+        # INSERT de várias linhas por comando, limitado ao número máximo de parâmetros do banco
+        max_params = self.connection.features.max_query_params or 999
+        por_comando = max(1, min(500, max_params // len(columns)))
+
+        colunas = ', '.join(self._quote(coluna) for coluna in columns)
+        placeholder = '(' + ', '.join(['%s'] * len(columns)) + ')'
+
+        with self.connection.cursor() as cursor:
+            for inicio in range(0, len(linhas), por_comando):
+                bloco = linhas[inicio:inicio + por_comando]
+                sql = (f'INSERT INTO {self._quote(table)} ({colunas}) VALUES '
+                       + ', '.join([placeholder] * len(bloco)))
+                cursor.execute(sql, [valor for linha in bloco for valor in linha])
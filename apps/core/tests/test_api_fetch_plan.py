@@ -0,0 +1,79 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.contratos.models import Contrato
+from apps.projetos.models import Ordem, Projeto, Requisicao
+
+
+class ContratoApiFetchPlanTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='api', email='api@funetec.br', password='x',
+        )
+        self.client.force_login(self.user)
+        self.projeto = Projeto.objects.create(
+            cod_projeto=10, nome='Projeto API', data_inicio=date(2025, 1, 1),
+            data_encerramento=date(2025, 12, 31), valor=Decimal('1000.00'), situacao='1',
+        )
+        requisicao = Requisicao.objects.create(
+            cod_requisicao=10, cod_projeto=self.projeto, descricao='Requisição',
+            data_solicitacao=date(2025, 1, 1), data_limite=date(2025, 3, 1), valor=Decimal('100.00'), situacao='1',
+        )
+        Ordem.objects.create(
+            cod_ordem=10, cod_requisicao=requisicao, descricao='Ordem',
+            data_solicitacao=date(2025, 1, 1), data_limite=date(2025, 3, 1), valor=Decimal('100.00'), situacao='1',
+        )
+
+    def _contratos(self, inicio, quantidade):
+        for indice in range(inicio, inicio + quantidade):
+            Contrato.objects.create(
+                num_contrato=f'{indice:04d}/2025', cod_ordem=10, descricao='Contrato', tipo_pessoa=1,
+                contratado=f'Contratado {indice}', data_inicio=date(2025, 2, 1),
+                valor=Decimal('100.00'), situacao='2',
+            )
+
+    def _consultas(self, **params):
+        cache.clear()
+        # O orçamento de 'contrato-list' (PERF_BUDGETS) vale para qualquer tamanho de página
+        with self.settings(PERF_BUDGETS_ENFORCE=True), CaptureQueriesContext(connection) as contexto:
+            response = self.client.get('/api/contratos/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), contexto.captured_queries
+
+    def test_listagem_com_numero_constante_de_consultas(self):
+        self._contratos(0, 3)
+        dados, poucos = self._consultas()
+        self.assertEqual(dados['results'][0]['projeto'], '10 - Projeto API')
+        self.assertEqual(dados['results'][0]['valor'], '100.00')
+
+        self._contratos(3, 40)
+        dados, muitos = self._consultas(page_size=100)
+        self.assertEqual(len(dados['results']), 43)
+        self.assertEqual(len(muitos), len(poucos))
+
+    def test_fields_reduz_resposta_e_select(self):
+        self._contratos(0, 2)
+        dados, consultas = self._consultas(fields='num_contrato,valor')
+        self.assertEqual(set(dados['results'][0]), {'num_contrato', 'valor'})
+
+        select = consultas[-1]['sql']
+        self.assertNotIn('"contratado"', select)
+        self.assertNotIn('"ordem"', select)  # sem a subconsulta do projeto
+
+        response = self.client.get('/api/contratos/', {'fields': 'num_contrato,inexistente'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_detalhe_usa_o_mesmo_plano(self):
+        self._contratos(0, 1)
+        with self.assertNumQueries(3):  # sessão, usuário e contrato com o projeto anotado
+            response = self.client.get('/api/contratos/0000/2025/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['projeto'], '10 - Projeto API')
@@ -0,0 +1,87 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, TestCase, override_settings
+from unittest import mock
+from datetime import date
+from decimal import Decimal
+from apps.contratos.models import Contrato
+from apps.core.cache import get_versions
+from apps.core.middleware import CacheMiddleware
+
+
+class VersionedCacheMiddlewareTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.chamadas = 0
+
+        def view(request):
+            self.chamadas += 1
+            return HttpResponse(f'resposta {self.chamadas}')
+
+        self.middleware = CacheMiddleware(view)
+
+    def _get(self, path='/dashboard/', **headers):
+        request = self.factory.get(path, **headers)
+        request.user = AnonymousUser()
+        return self.middleware(request)
+
+    def _criar_contrato(self):
+        return Contrato.objects.create(
+            num_contrato='0001/2025', cod_ordem=1, descricao='Contrato', tipo_pessoa=1,
+            data_inicio=date(2025, 1, 1), valor=Decimal('1000.00'), situacao='1',
+        )
+
+    def test_signals_incrementam_versao(self):
+        antes = get_versions()
+        with self.captureOnCommitCallbacks(execute=True):
+            contrato = self._criar_contrato()
+            # Antes do commit a versão não muda: leituras concorrentes ainda veem os dados antigos
+            self.assertEqual(get_versions(), antes)
+        depois_save = get_versions()
+        with self.captureOnCommitCallbacks(execute=True):
+            contrato.delete()
+
+        self.assertNotEqual(antes, depois_save)
+        self.assertNotEqual(depois_save, get_versions())
+
+    def test_hit_invalidacao_e_etag(self):
+        primeira = self._get()
+        segunda = self._get()
+        self.assertEqual(self.chamadas, 1)
+        self.assertEqual(segunda.content, primeira.content)
+
+        condicional = self._get(HTTP_IF_NONE_MATCH=primeira['ETag'])
+        self.assertEqual(condicional.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._criar_contrato()
+        terceira = self._get()
+        self.assertEqual(self.chamadas, 2)
+        self.assertNotEqual(terceira['ETag'], primeira['ETag'])
+
+    def test_paths_nao_cacheaveis(self):
+        self._get('/contratos/')
+        self._get('/contratos/')
+        self.assertEqual(self.chamadas, 2)
+
+    @override_settings(HTML_CACHE_TIMEOUT=300, VERSIONED_CACHE_TIMEOUT=21600)
+    def test_html_com_prazo_curto_e_sem_token_csrf(self):
+        def view(request):
+            if request.path == '/dashboard/form/':
+                get_token(request)
+            if request.path.startswith('/api/'):
+                return JsonResponse({'ok': True})
+            return HttpResponse('<html></html>')
+
+        middleware = CacheMiddleware(view)
+        with mock.patch('django.core.cache.cache.set', wraps=cache.set) as cache_set:
+            for path in ('/dashboard/', '/api/contratos/', '/dashboard/form/'):
+                request = self.factory.get(path)
+                request.user = AnonymousUser()
+                middleware(request)
+
+        self.assertEqual([chamada.args[2] for chamada in cache_set.call_args_list], [300, 21600])
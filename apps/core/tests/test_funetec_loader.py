@@ -0,0 +1,116 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.contratos.models import Contrato
+from apps.core.funetec_loader import TABELAS_FUNETEC, carregar_planilha, converter_planilha
+from apps.core.management.commands.import_funetec_data import TIPO_IMPORTACAO
+from apps.core.models import ImportRun
+from apps.core.sql_loader import TableStats
+from apps.projetos.models import Ordem, Projeto, Requisicao
+
+
+class FunetecLoaderTest(TestCase):
+
+    def setUp(self):
+        self.tabelas = {tabela.nome: tabela for tabela in TABELAS_FUNETEC}
+
+    def test_conversao_vetorizada_descarta_invalidas_e_repetidas(self):
+        df = pd.DataFrame({
+            'codProjeto': [1, 2, 'x', 1],
+            'nome': ['Antigo', 'Dois', 'Inválido', ' Um '],
+            'dataInicio': ['2025-01-01', '2025-02-01', '2025-03-01', '2025-01-15'],
+            'dataEncerramento': ['2025-12-31', '2025-12-31', '2025-12-31', '2025-12-31'],
+            'valor': [10, 20.456, 30, 1500.5],
+            'situacao': [1.0, 2.0, 1.0, 1.0],
+        })
+        convertida = converter_planilha(self.tabelas['projetos'], df)
+
+        self.assertEqual(convertida.lidas, 4)
+        self.assertEqual(convertida.invalidas, [4])
+        self.assertEqual(convertida.duplicadas, 1)
+
+        um = convertida.dados[convertida.dados['codProjeto'] == 1].iloc[0]
+        self.assertEqual(um['nome'], 'Um')
+        self.assertEqual(um['dataInicio'], date(2025, 1, 15))
+        self.assertEqual(um['valor'], Decimal('1500.50'))
+        self.assertEqual(um['situacao'], '1')
+
+    def test_upsert_em_lote_resolve_pais_com_in_bulk(self):
+        Projeto.objects.create(
+            cod_projeto=1, nome='Projeto', data_inicio=date(2025, 1, 1),
+            data_encerramento=date(2025, 12, 31), valor=Decimal('100'), situacao='1',
+        )
+        Requisicao.objects.create(
+            cod_requisicao=10, cod_projeto_id=1, descricao='Antiga',
+            data_solicitacao=date(2025, 1, 1), data_limite=date(2025, 2, 1),
+            valor=Decimal('1'), situacao='1',
+        )
+        df = pd.DataFrame({
+            'codRequisicao': [10, 11, 12],
+            'codProjeto': [1, 1, 99],
+            'descricao': ['Atualizada', 'Nova', 'Sem projeto'],
+            'dataSolicitacao': ['2025-03-01'] * 3,
+            'dataLimite': ['2025-04-01'] * 3,
+            'valor': [5, 6, 7],
+            'situacao': ['2', '1', '1'],
+        })
+
+        with self.assertNumQueries(2):
+            resultado = carregar_planilha(
+                converter_planilha(self.tabelas['requisicoes'], df), batch_size=100
+            )
+
+        self.assertEqual(resultado.sem_pai, [99])
+        self.assertEqual(resultado.stats.rows, 2)
+        self.assertEqual(Requisicao.objects.count(), 2)
+        self.assertEqual(Requisicao.objects.get(pk=10).descricao, 'Atualizada')
+
+    def test_comando_bulk_sincroniza_sequencia(self):
+        Projeto.objects.create(
+            cod_projeto=1, nome='Projeto', data_inicio=date(2025, 1, 1),
+            data_encerramento=date(2025, 12, 31), valor=Decimal('100'), situacao='1',
+        )
+        Requisicao.objects.create(
+            cod_requisicao=1, cod_projeto_id=1, descricao='Requisição', data_solicitacao=date(2025, 1, 1),
+            data_limite=date(2025, 2, 1), valor=Decimal('1'), situacao='1',
+        )
+        Ordem.objects.create(
+            cod_ordem=1, cod_requisicao_id=1, descricao='Ordem', data_solicitacao=date(2025, 1, 1),
+            data_limite=date(2025, 2, 1), valor=Decimal('1'), situacao='1',
+        )
+        Contrato.gerar_numero_contrato(2025)
+
+        diretorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, diretorio, ignore_errors=True)
+        pd.DataFrame({
+            'numContrato': ['0005/2025'], 'codOrdem': [1], 'descricao': ['Importado'], 'cpfcnpj': [None],
+            'contratado': ['Ana'], 'tipoPessoa': [1], 'dataInicio': ['2025-01-01'], 'dataFim': [None],
+            'valor': [100], 'parcelas': [1], 'dataParcelaInicial': [None], 'situacao': ['2'],
+        }).to_excel(os.path.join(diretorio, 'tb_contratos.xlsx'), index=False)
+        pd.DataFrame({
+            'numContrato': ['0005/2025'], 'codLancamento': [1], 'dataLancamento': ['2025-01-01'],
+            'numParcela': [1], 'valorParcela': [100], 'dataVencimento': ['2025-02-01'],
+            'valorPago': [0], 'dataPagamento': [None], 'situacao': ['1'],
+        }).to_excel(os.path.join(diretorio, 'tb_itens_contrato.xlsx'), index=False)
+
+        # Retoma a partir dos contratos: as etapas anteriores já constam como gravadas
+        caminho = diretorio + os.sep
+        run = ImportRun.objects.create(tipo=TIPO_IMPORTACAO, origem=os.path.abspath(caminho))
+        for nome in ('projetos', 'requisicoes', 'ordens', 'itens_ordem'):
+            run.registrar_etapa(nome, TableStats())
+
+        call_command(
+            'import_funetec_data', '--bulk', '--path', caminho, '--batch-size', '100', '--workers', '1', '--resume',
+            stdout=io.StringIO(),
+        )
+
+        self.assertTrue(Contrato.objects.filter(pk='0005/2025').exists())
+        self.assertEqual(Contrato.gerar_numero_contrato(2025), '0006/2025')
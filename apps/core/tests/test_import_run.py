@@ -0,0 +1,23 @@
+from django.test import TestCase
+
+from apps.core.models import ImportRun
+from apps.core.sql_loader import TableStats
+
+
+class ImportRunTest(TestCase):
+
+    def test_retomada_a_partir_da_etapa_com_erro(self):
+        run = ImportRun.objects.create(tipo='funetec', origem='/dados')
+        run.registrar_etapa('projetos', TableStats(rows=10, seconds=0.5, batches=1))
+        run.registrar_erro('requisicoes', ValueError('coluna ausente'))
+
+        pendente = ImportRun.ultima_pendente('funetec', '/dados')
+        self.assertEqual(pendente, run)
+        self.assertTrue(pendente.etapa_concluida('projetos'))
+        self.assertFalse(pendente.etapa_concluida('requisicoes'))
+        self.assertEqual(pendente.etapas['projetos']['linhas'], 10)
+        self.assertEqual(pendente.etapa_erro, 'requisicoes')
+
+        pendente.concluir()
+        self.assertIsNone(ImportRun.ultima_pendente('funetec', '/dados'))
+        self.assertIsNone(ImportRun.ultima_pendente('funetec', '/outros'))
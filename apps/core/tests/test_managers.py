@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+
+from apps.contratos.models import Contrato, ItemContrato
+from apps.projetos.models import Projeto
+
+
+class DashboardManagersTest(TestCase):
+
+    def setUp(self):
+        self.hoje = date.today()
+        projetos = [
+            # (cod, encerramento, valor, situação)
+            (1, self.hoje - timedelta(days=5), '100.00', '2'),   # atrasado
+            (2, self.hoje + timedelta(days=3), '200.00', '1'),   # vence em breve
+            (3, self.hoje + timedelta(days=60), '300.00', '2'),
+            (4, self.hoje - timedelta(days=30), '400.00', '6'),
+            (5, self.hoje - timedelta(days=30), '500.00', '5'),
+        ]
+        for cod, encerramento, valor, situacao in projetos:
+            Projeto.objects.create(
+                cod_projeto=cod, nome=f'Projeto {cod}', data_inicio=date(2024, 1, 1),
+                data_encerramento=encerramento, valor=Decimal(valor), situacao=situacao,
+            )
+
+        for numero, tipo_pessoa, situacao in [('0001/2025', 1, '2'), ('0002/2025', 1, '1'), ('0003/2025', 2, '4')]:
+            Contrato.objects.create(
+                num_contrato=numero, cod_ordem=1, descricao='Contrato', tipo_pessoa=tipo_pessoa,
+                data_inicio=date(2025, 1, 1), valor=Decimal('1000.00'), situacao=situacao,
+            )
+        parcelas = [
+            ('0001/2025', 1, self.hoje - timedelta(days=10), '500.00', '0'),
+            ('0001/2025', 2, self.hoje + timedelta(days=20), '500.00', '0'),
+            ('0002/2025', 1, self.hoje + timedelta(days=2), '400.00', '100.00'),
+        ]
+        for numero, cod, vencimento, valor, pago in parcelas:
+            ItemContrato.objects.create(
+                num_contrato_id=numero, cod_lancamento=cod, num_parcela=cod, data_lancamento=date(2025, 1, 1),
+                data_vencimento=vencimento, valor_parcela=Decimal(valor), valor_pago=Decimal(pago), situacao='1',
+            )
+
+    def test_dashboard_metricas_em_uma_consulta(self):
+        with self.assertNumQueries(1):
+            metricas = Projeto.objects.dashboard_metricas()
+
+        self.assertEqual(metricas, {
+            'total': 5, 'ativos': 3, 'em_andamento': 2, 'concluidos': 1, 'cancelados': 1,
+            'atrasados': 1, 'proximos_vencimento': 1,
+            'valor_total': Decimal('1500.00'),
+        })
+        self.assertEqual(metricas['atrasados'], Projeto.objects.atrasados().count())
+
+        with self.assertNumQueries(1):
+            escopo = Projeto.objects.dashboard_metricas(Projeto.objects.filter(situacao='2'))
+        self.assertEqual((escopo['total'], escopo['atrasados']), (2, 1))
+
+    def test_dashboard_financeiro_em_uma_consulta(self):
+        with self.assertNumQueries(1):
+            financeiro = Contrato.objects.dashboard_financeiro()
+
+        self.assertEqual(financeiro, {
+            'total_contratos': 3, 'contratos_ativos': 2, 'contratos_pf': 2, 'contratos_pj': 1,
+            'valor_total': Decimal('3000.00'), 'valor_pago': Decimal('100.00'),
+            'valor_pendente': Decimal('1300.00'), 'parcelas_vencidas': 1, 'proximas_parcelas': 1,
+        })
+
+        with self.assertNumQueries(1):
+            escopo = Contrato.objects.dashboard_financeiro(Contrato.objects.filter(pk='0002/2025'))
+        self.assertEqual((escopo['total_contratos'], escopo['parcelas_vencidas']), (1, 0))
+
+    def test_parcelas_vencidas_relativas_a_hoje(self):
+        # Virada de data sem nenhum salvamento: a parcela de 0002/2025 (hoje + 2) passa a vencida
+        depois = Contrato.objects.dashboard_financeiro(hoje=self.hoje + timedelta(days=3))
+        self.assertEqual((depois['parcelas_vencidas'], depois['proximas_parcelas']), (2, 0))
+
+        # A parcela de 0001/2025 (hoje + 20) entra na janela de 7 dias
+        depois = Contrato.objects.dashboard_financeiro(hoje=self.hoje + timedelta(days=15))
+        self.assertEqual((depois['parcelas_vencidas'], depois['proximas_parcelas']), (2, 1))
+        self.assertEqual(
+            set(Contrato.objects.com_parcelas_vencidas().values_list('pk', flat=True)), {'0001/2025'}
+        )
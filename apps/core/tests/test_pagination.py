@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.contratos.models import Contrato
+from apps.core.pagination import CursorInvalido, KeysetPaginator
+from apps.projetos.models import Projeto
+
+
+class KeysetPaginatorTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        # Datas repetidas e nulas para exercitar o desempate e o segmento de nulos
+        for indice in range(23):
+            Contrato.objects.create(
+                num_contrato=f'{indice:04d}/2025', cod_ordem=indice, descricao='Contrato', tipo_pessoa=1,
+                data_inicio=None if indice % 7 == 0 else date(2025, 1, 1) + timedelta(days=indice % 4),
+                valor=Decimal('100.00'), situacao='2',
+            )
+        cls.ordering = ['-data_inicio', 'num_contrato']
+        cls.esperado = [c.pk for c in Contrato.objects.filter(data_inicio__isnull=False).order_by(*cls.ordering)]
+        cls.esperado += [c.pk for c in Contrato.objects.filter(data_inicio__isnull=True).order_by('num_contrato')]
+
+    def test_percorre_nos_dois_sentidos(self):
+        paginador = KeysetPaginator(Contrato.objects.all(), self.ordering, 5)
+
+        paginas, cursor = [], None
+        while True:
+            pagina = paginador.page(cursor)
+            paginas.append([contrato.pk for contrato in pagina])
+            if not pagina.has_next:
+                break
+            cursor = pagina.next_cursor
+        self.assertEqual(sum(paginas, []), self.esperado)
+        self.assertEqual(len(paginas), 5)
+
+        # Volta da última até a primeira pelos cursores "anterior"
+        voltando = [paginas[-1]]
+        while pagina.has_previous:
+            pagina = paginador.page(pagina.previous_cursor)
+            voltando.insert(0, [contrato.pk for contrato in pagina])
+        self.assertEqual(voltando, paginas)
+
+    def test_pagina_sem_count(self):
+        paginador = KeysetPaginator(Contrato.objects.all(), self.ordering, 10)
+        with self.assertNumQueries(1):
+            pagina = paginador.page()
+        self.assertTrue(pagina.has_next)
+        self.assertFalse(pagina.has_previous)
+
+    def test_cursor_invalido(self):
+        paginador = KeysetPaginator(Contrato.objects.all(), self.ordering, 5)
+        with self.assertRaises(CursorInvalido):
+            paginador.page('nao-e-um-cursor')
+
+
+class KeysetPaginationViewsTest(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='gestor', email='gestor@funetec.br', password='x', is_staff=True,
+        )
+        self.client.force_login(self.user)
+        for codigo in range(1, 8):
+            Projeto.objects.create(
+                cod_projeto=codigo, nome=f'Projeto {codigo}', data_inicio=date(2025, 1, codigo),
+                data_encerramento=date(2025, 12, 31), valor=Decimal('1000.00'), situacao='1',
+            )
+
+    def test_api_projetos_paginada_por_cursor(self):
+        response = self.client.get('/api/projetos/', {'page_size': 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['cod_projeto'] for p in response.json()['results']], [7, 6, 5, 4, 3])
+        self.assertIsNone(response.json()['previous'])
+
+        response = self.client.get(response.json()['next'])
+        self.assertEqual([p['cod_projeto'] for p in response.json()['results']], [2, 1])
+        self.assertIsNone(response.json()['next'])
+
+        self.assertEqual(self.client.get('/api/projetos/', {'cursor': 'x'}).status_code, 404)
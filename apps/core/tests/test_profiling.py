@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from apps.core.profiling import PerfBudgetExceeded, RequestProfile, assinatura_sql, metrics
+from apps.projetos.models import Projeto
+
+
+class ProfilingTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        self.user = get_user_model().objects.create_user(
+            username='ops', email='ops@funetec.br', password='x', is_staff=True,
+        )
+        self.client.force_login(self.user)
+
+    def test_assinatura_detecta_consultas_repetidas(self):
+        self.assertEqual(
+            assinatura_sql("SELECT * FROM t WHERE a = 10 AND b IN (%s, %s) AND c = 'x'"),
+            'SELECT * FROM t WHERE a = ? AND b IN (...) AND c = ?',
+        )
+
+        perfil = RequestProfile()
+        token = perfil.iniciar()
+        with connection.execute_wrapper(perfil):
+            for codigo in range(3):
+                Projeto.objects.filter(pk=codigo).first()
+        perfil.finalizar(token)
+
+        self.assertEqual(perfil.queries, 3)
+        self.assertEqual(perfil.maior_repeticao, 3)
+
+    @override_settings(PERF_BUDGETS_ENFORCE=True)
+    def test_dashboard_dentro_do_orcamento(self):
+        response = self.client.get('/dashboard/')
+
+        self.assertEqual(response.status_code, 200)
+        perfil = response.wsgi_request.profile
+        self.assertEqual(perfil.view, 'dashboard:index')
+        self.assertGreater(perfil.queries, 0)
+
+        dados = self.client.get('/ops/metrics').json()
+        self.assertEqual(dados['views']['dashboard:index']['requisicoes'], 1)
+        self.assertIn('total_ms_p95', dados['views']['dashboard:index'])
+        self.assertEqual(dados['contadores']['page_cache.miss'], 1)
+
+    @override_settings(PERF_BUDGETS_ENFORCE=True, PERF_BUDGETS={'dashboard:index': {'queries': 1}})
+    def test_orcamento_estourado_falha(self):
+        with self.assertRaises(PerfBudgetExceeded):
+            self.client.get('/dashboard/')
@@ -0,0 +1,138 @@
+import io
+import os
+import tempfile
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from apps.core.sql_loader import (
+    BulkLoader, format_insert, iter_rows, iter_statements, model_column_resolver, parse_insert,
+)
+from apps.contratos.models import Contrato, ItemContrato, SequenciaContrato
+from apps.projetos.models import Projeto
+
+
+SCRIPT = """-- comentário; com ponto e vírgula
+BEGIN;
+INSERT INTO projetos (codProjeto, nome, dataInicio, dataEncerramento, valor, situacao) VALUES (1, 'Obra; fase ''A''', '2024-01-01', '2024-06-30', 1500.50, '2');
+INSERT INTO projetos (codProjeto, nome, dataInicio, dataEncerramento, valor, situacao) VALUES
+    (2, 'Linha
+quebrada -- sem comentário', '2024-02-01', '2024-12-31', 10, '1'), (3, 'Terceiro', '2024-03-01', '2024-09-30', 0.0, '6');
+COMMIT;
+"""
+
+
+def trecho_do_dump(tabela, quantidade):
+    """Primeiros INSERTs da tabela no inserts_postgres.sql real"""
+    with open(os.path.join(settings.BASE_DIR, 'inserts_postgres.sql'), encoding='utf-8') as dump:
+        inserts = (s for s in iter_statements(dump) if s.startswith(f'INSERT INTO {tabela} ('))
+        return [next(inserts) for _ in range(quantidade)]
+
+
+class SqlLoaderTest(TestCase):
+
+    def test_tokenizer_respeita_strings_e_comentarios(self):
+        statements = list(iter_statements(io.StringIO(SCRIPT)))
+        self.assertEqual(statements[0], 'BEGIN')
+        self.assertEqual(statements[-1], 'COMMIT')
+
+        primeiro = parse_insert(statements[1])
+        self.assertEqual(primeiro.table, 'projetos')
+        self.assertEqual(primeiro.rows, [(1, "Obra; fase 'A'", '2024-01-01', '2024-06-30', Decimal('1500.50'), '2')])
+
+        segundo = parse_insert(statements[2])
+        self.assertEqual(len(segundo.rows), 2)
+        self.assertEqual(segundo.rows[0][1], 'Linha\nquebrada -- sem comentário')
+
+        nulos = parse_insert("INSERT INTO t (a, b, c) VALUES (NULL, TRUE, -1e3)")
+        self.assertEqual(nulos.rows, [(None, True, Decimal('-1e3'))])
+
+    def test_bulk_loader_agrupa_por_tabela(self):
+        loader = BulkLoader(connection, batch_size=1, resolver=model_column_resolver())
+        for statement in iter_statements(io.StringIO(SCRIPT)):
+            insert = parse_insert(statement)
+            if insert:
+                loader.add(insert)
+        loader.flush()
+
+        self.assertEqual(loader.stats['projetos'].rows, 3)
+        self.assertEqual(loader.stats['projetos'].batches, 2)
+        projeto = Projeto.objects.get(pk=1)
+        self.assertEqual(projeto.nome, "Obra; fase 'A'")
+        self.assertEqual(projeto.data_inicio, date(2024, 1, 1))
+        self.assertEqual(projeto.valor, Decimal('1500.50'))
+
+    def test_comando_modo_bulk(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.sql', delete=False, encoding='utf-8') as arquivo:
+            arquivo.write(SCRIPT)
+        self.addCleanup(os.remove, arquivo.name)
+
+        saida = io.StringIO()
+        call_command('import_legacy_data', file=arquivo.name, bulk=True, stdout=saida)
+
+        self.assertIn('linhas/s', saida.getvalue())
+        self.assertEqual(Projeto.objects.count(), 3)
+
+    def test_dump_legado_sem_colunas_de_resumo(self):
+        # O dump é anterior a totalPago, totalPrevisto e ultimoLancamento
+        # (NOT NULL, default só no modelo); as 8 primeiras parcelas são do contrato 0001/2025
+        statements = trecho_do_dump('contrato', 3) + trecho_do_dump('itens_contrato', 8)
+        self.assertNotIn('totalPago', statements[0])
+
+        for bulk in (True, False):
+            Contrato.objects.all().delete()
+            with tempfile.NamedTemporaryFile('w', suffix='.sql', delete=False, encoding='utf-8') as arquivo:
+                arquivo.write(';\n'.join(statements) + ';\n')
+            self.addCleanup(os.remove, arquivo.name)
+
+            call_command('import_legacy_data', file=arquivo.name, bulk=bulk, stdout=io.StringIO())
+
+            self.assertEqual(Contrato.objects.count(), 3)
+            contrato = Contrato.objects.get(pk='0001/2025')
+            self.assertEqual(contrato.contratado, 'Ana Silva')
+            self.assertEqual(contrato.total_previsto, sum(item.valor_parcela for item in contrato.itens.all()))
+
+            # O contador segue os lançamentos importados
+            self.assertEqual(contrato.ultimo_lancamento, 8)
+            self.assertEqual(Contrato.reservar_lancamentos('0001/2025'), [(9, 9)])
+
+    def test_iter_rows_e_format_insert_sao_inversos(self):
+        linhas = list(iter_rows(io.StringIO(SCRIPT)))
+        self.assertEqual([linha[2][0] for linha in linhas], [1, 2, 3])
+
+        _, columns, row = linhas[0]
+        gerado = format_insert('projetos', columns, [row, (4, None, '2024-01-01', '2024-01-02', Decimal('1.5'), '1')])
+        self.assertEqual(
+            [linha[2] for linha in iter_rows(io.StringIO(gerado))],
+            [row, (4, None, '2024-01-01', '2024-01-02', Decimal('1.5'), '1')],
+        )
+
+    def test_populate_database_massa_sintetica(self):
+        call_command('populate_database', synthetic=32, batch_size=7, stdout=io.StringIO())
+
+        self.assertEqual(Projeto.objects.count(), 2)
+        self.assertEqual(ItemContrato.objects.count(), 20)
+
+    def test_populate_database_sincroniza_sequencia(self):
+        # Linha do ano criada antes da carga: sem sincronizar, a próxima reserva repetiria 0002/2025
+        Contrato.gerar_numero_contrato(2025)
+        with tempfile.NamedTemporaryFile('w', suffix='.sql', delete=False, encoding='utf-8') as arquivo:
+            arquivo.write(';\n'.join(trecho_do_dump('contrato', 3)) + ';\n')
+        self.addCleanup(os.remove, arquivo.name)
+
+        call_command('populate_database', file=arquivo.name, stdout=io.StringIO())
+
+        self.assertEqual(SequenciaContrato.objects.get(ano=2024).ultimo, 3)
+        self.assertEqual(Contrato.gerar_numero_contrato(2025), '0003/2025')
+
+    def test_populate_database_coluna_desconhecida(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.sql', delete=False, encoding='utf-8') as arquivo:
+            arquivo.write("INSERT INTO projetos (codProjeto, nome, colunaInexistente) VALUES (1, 'Projeto', 'x');\n")
+        self.addCleanup(os.remove, arquivo.name)
+
+        with self.assertRaisesMessage(CommandError, 'Tabela projetos: coluna(s) sem campo no modelo Projeto: colunaInexistente'):
+            call_command('populate_database', file=arquivo.name, stdout=io.StringIO())
+
+        self.assertFalse(Projeto.objects.exists())
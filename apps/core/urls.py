@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+app_name = 'ops'
+
+urlpatterns = [
+    path('metrics', views.MetricsView.as_view(), name='metrics'),
+]
@@ -0,0 +1,14 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from apps.core.profiling import metrics
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class MetricsView(View):
+    """p50/p95 de tempo, SQL e consultas por nome de URL, e contadores do processo"""
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(metrics.resumo())
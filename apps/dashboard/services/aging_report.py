@@ -0,0 +1,91 @@
+# apps/dashboard/services/aging_report.py
+from datetime import timedelta
+
+from django.db.models import Case, CharField, Count, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.contratos.models import ItemContrato
+from apps.dashboard.services.dashboard_metrics import MONEY, ZERO
+
+
+# (faixa, maior atraso em dias da faixa); a última faixa é aberta
+FAIXAS_ATRASO = [
+    ('0-30', 30),
+    ('31-60', 60),
+    ('61-90', 90),
+    ('90+', None),
+]
+
+# Agrupamentos opcionais: nome -> campo de ItemContrato
+AGRUPAMENTOS = {
+    'contrato': 'num_contrato',
+    'tipo_pessoa': 'num_contrato__tipo_pessoa',
+}
+
+VALOR_PENDENTE = F('valor_parcela') - F('valor_pago')
+
+
+class AgingReport:
+    """
+    Inadimplência por faixa de atraso (aging) calculada no banco: a faixa
+    de cada parcela vencida é um Case/When sobre data_vencimento e as somas
+    saem de um único GROUP BY, independente do volume de parcelas em atraso.
+    """
+
+    def __init__(self, hoje=None, queryset=None):
+        self.hoje = hoje or timezone.now().date()
+        self.queryset = queryset if queryset is not None else ItemContrato.objects.all()
+
+    def _faixa(self):
+        # Atraso <= N dias equivale a vencimento >= hoje - N
+        casos = [
+            When(data_vencimento__gte=self.hoje - timedelta(days=limite), then=Value(faixa))
+            for faixa, limite in FAIXAS_ATRASO if limite is not None
+        ]
+        return Case(*casos, default=Value(FAIXAS_ATRASO[-1][0]), output_field=CharField())
+
+    def vencidas(self):
+        """Parcelas lançadas (não pagas nem canceladas) com vencimento anterior a hoje"""
+        return self.queryset.filter(situacao='1', data_vencimento__lt=self.hoje)
+
+    def _vazio(self):
+        return {faixa: {'count': 0, 'valor': 0} for faixa, _ in FAIXAS_ATRASO}
+
+    def faixas(self, por=None):
+        """
+        Retorna {faixa: {'count', 'valor'}}; com `por` ('contrato' ou
+        'tipo_pessoa'), retorna {chave: {faixa: {'count', 'valor'}}}.
+        """
+        campos = ['faixa']
+        if por is not None:
+            campos.append(AGRUPAMENTOS[por])
+
+        linhas = self.vencidas().annotate(faixa=self._faixa()).values(*campos).annotate(
+            count=Count('pk'),
+            valor=Sum(VALOR_PENDENTE, output_field=MONEY),
+        ).order_by()
+
+        if por is None:
+            resultado = self._vazio()
+            for linha in linhas:
+                resultado[linha['faixa']] = {'count': linha['count'], 'valor': float(linha['valor'] or 0)}
+            return resultado
+
+        resultado = {}
+        for linha in linhas:
+            grupo = resultado.setdefault(linha[AGRUPAMENTOS[por]], self._vazio())
+            grupo[linha['faixa']] = {'count': linha['count'], 'valor': float(linha['valor'] or 0)}
+        return dict(sorted(resultado.items(), key=lambda item: (item[0] is None, item[0])))
+
+    def totais(self):
+        """Total pendente (parcelas lançadas) e total inadimplente (lançadas e vencidas)"""
+        lancado = Q(situacao='1')
+        return self.queryset.aggregate(
+            total_pendente=Coalesce(Sum(VALOR_PENDENTE, filter=lancado), Value(ZERO), output_field=MONEY),
+            inadimplencia_total=Coalesce(
+                Sum(VALOR_PENDENTE, filter=lancado & Q(data_vencimento__lt=self.hoje)),
+                Value(ZERO),
+                output_field=MONEY,
+            ),
+        )
@@ -0,0 +1,238 @@
+# apps/dashboard/services/dashboard_metrics.py
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from apps.projetos.models import Projeto
+from apps.contratos.models import Contrato, ItemContrato, MonthlyFinancialRollup
+
+
+SITUACAO_PROJETO_LABELS = {
+    '1': 'Aguardando',
+    '2': 'Em Andamento',
+    '3': 'Paralisado',
+    '4': 'Suspenso',
+    '5': 'Cancelado',
+    '6': 'Concluído',
+}
+# Situações fora da tabela acima, agrupadas em uma única fatia do gráfico
+SITUACAO_OUTROS = 'outros'
+
+VENCIMENTOS_PERIODOS = [
+    ('Hoje', 0),
+    ('Amanhã', 1),
+    ('3 dias', 3),
+    ('7 dias', 7),
+    ('15 dias', 15),
+    ('30 dias', 30),
+]
+
+MESES_ABREV = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+               'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+ZERO = Decimal('0')
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+def inicio_mes(dia):
+    """Primeiro dia do mês de `dia`"""
+    return dia.replace(day=1)
+
+
+def somar_meses(dia, meses):
+    """Desloca um primeiro-dia-de-mês em `meses` meses de calendário"""
+    total = dia.year * 12 + (dia.month - 1) + meses
+    return date(total // 12, total % 12 + 1, 1)
+
+
+@dataclass
+class SerieMensal:
+    """Série mensal densa (um ponto por mês, em ordem cronológica)"""
+    meses: list
+    previsto: list
+    realizado: list
+
+    @property
+    def labels(self):
+        return [MESES_ABREV[mes.month - 1] for mes in self.meses]
+
+
+@dataclass
+class DashboardMetrics:
+    """Resultado tipado do DashboardMetricsEngine"""
+    projetos_ativos: int = 0
+    projetos_crescimento: float = 0
+    contratos_pf_total: int = 0
+    contratos_pf_ativos: int = 0
+    contratos_pf_pendentes: int = 0
+    contratos_pj_total: int = 0
+    contratos_pj_ativos: int = 0
+    contratos_pj_vencidos: int = 0
+    valor_inadimplencia: Decimal = ZERO
+    valor_total_contratos: Decimal = ZERO
+    status_projetos: dict = field(default_factory=dict)
+    vencimentos: list = field(default_factory=list)
+    serie_mensal: SerieMensal = None
+
+    @property
+    def percentual_inadimplencia(self):
+        if not self.valor_total_contratos:
+            return 0
+        return float(self.valor_inadimplencia / self.valor_total_contratos * 100)
+
+    def kpis(self):
+        """KPIs no formato esperado pelo template do dashboard"""
+        return {
+            'projetos_ativos': self.projetos_ativos,
+            'projetos_crescimento': self.projetos_crescimento,
+            'contratos_pf_total': self.contratos_pf_total,
+            'contratos_pf_ativos': self.contratos_pf_ativos,
+            'contratos_pf_pendentes': self.contratos_pf_pendentes,
+            'contratos_pj_total': self.contratos_pj_total,
+            'contratos_pj_ativos': self.contratos_pj_ativos,
+            'contratos_pj_vencidos': self.contratos_pj_vencidos,
+            'valor_inadimplencia': float(self.valor_inadimplencia),
+            'percentual_inadimplencia': self.percentual_inadimplencia,
+        }
+
+    def grafico_previsto_realizado(self):
+        return {
+            'labels': self.serie_mensal.labels,
+            'previsto': [float(valor) for valor in self.serie_mensal.previsto],
+            'realizado': [float(valor) for valor in self.serie_mensal.realizado],
+        }
+
+    def grafico_status_projetos(self):
+        return {
+            'labels': [SITUACAO_PROJETO_LABELS.get(situacao, 'Outros') for situacao in self.status_projetos],
+            'data': list(self.status_projetos.values()),
+        }
+
+    def grafico_vencimentos(self):
+        return {
+            'labels': [label for label, _ in VENCIMENTOS_PERIODOS],
+            'data': self.vencimentos,
+        }
+
+
+class DashboardMetricsEngine:
+    """
+    Calcula todos os KPIs do dashboard com agregações condicionais.
+    Uma consulta por tabela (projetos, contratos, itens_contrato) e uma
+    consulta agrupada por mês para a série previsto x realizado, cujo
+    realizado vem do consolidado mensal (MonthlyFinancialRollup).
+    """
+
+    def __init__(self, hoje=None, meses=6):
+        self.hoje = hoje or timezone.now().date()
+        self.meses = meses
+
+    def calcular(self):
+        """Executa as agregações e retorna um DashboardMetrics"""
+        metrics = DashboardMetrics()
+        self._agregar_projetos(metrics)
+        self._agregar_contratos(metrics)
+        self._agregar_itens(metrics)
+        metrics.serie_mensal = self._serie_previsto_realizado()
+        return metrics
+
+    def _agregar_projetos(self, metrics):
+        hoje = self.hoje
+        mes_atual = inicio_mes(hoje)
+        mes_anterior = somar_meses(mes_atual, -1)
+
+        agregados = {
+            'ativos': Count('pk', filter=Q(situacao='2')),
+            'mes_atual': Count('pk', filter=Q(data_inicio__gte=mes_atual)),
+            'mes_anterior': Count('pk', filter=Q(data_inicio__gte=mes_anterior, data_inicio__lt=mes_atual)),
+        }
+        for situacao in SITUACAO_PROJETO_LABELS:
+            agregados[f'situacao_{situacao}'] = Count('pk', filter=Q(situacao=situacao))
+        agregados[f'situacao_{SITUACAO_OUTROS}'] = Count('pk', filter=~Q(situacao__in=list(SITUACAO_PROJETO_LABELS)))
+
+        dados = Projeto.objects.aggregate(**agregados)
+
+        metrics.projetos_ativos = dados['ativos']
+        if dados['mes_anterior'] > 0:
+            crescimento = (dados['mes_atual'] - dados['mes_anterior']) / dados['mes_anterior'] * 100
+            metrics.projetos_crescimento = round(crescimento, 1)
+        metrics.status_projetos = {
+            situacao: dados[f'situacao_{situacao}']
+            for situacao in [*SITUACAO_PROJETO_LABELS, SITUACAO_OUTROS]
+            if dados[f'situacao_{situacao}']
+        }
+
+    def _agregar_contratos(self, metrics):
+        pf = Q(tipo_pessoa=1)
+        pj = Q(tipo_pessoa=2)
+        ativos = Q(situacao__in=['1', '2'])
+
+        dados = Contrato.objects.aggregate(
+            pf_total=Count('pk', filter=pf),
+            pf_ativos=Count('pk', filter=pf & ativos),
+            pj_total=Count('pk', filter=pj),
+            pj_ativos=Count('pk', filter=pj & ativos),
+            pj_vencidos=Count('pk', filter=pj & Q(data_fim__lt=self.hoje, situacao='2')),
+            valor_total=Coalesce(Sum('valor'), Value(ZERO), output_field=MONEY),
+        )
+
+        metrics.contratos_pf_total = dados['pf_total']
+        metrics.contratos_pf_ativos = dados['pf_ativos']
+        metrics.contratos_pj_total = dados['pj_total']
+        metrics.contratos_pj_ativos = dados['pj_ativos']
+        metrics.contratos_pj_vencidos = dados['pj_vencidos']
+        metrics.valor_total_contratos = dados['valor_total']
+
+    def _agregar_itens(self, metrics):
+        lancado = Q(situacao='1')
+        agregados = {
+            'pf_pendentes': Count('pk', filter=lancado & Q(num_contrato__tipo_pessoa=1)),
+            'inadimplencia': Coalesce(
+                Sum(F('valor_parcela') - F('valor_pago'), filter=lancado & Q(data_vencimento__lt=self.hoje)),
+                Value(ZERO),
+                output_field=MONEY,
+            ),
+        }
+        for indice, (_, dias) in enumerate(VENCIMENTOS_PERIODOS):
+            agregados[f'vence_{indice}'] = Count(
+                'pk', filter=lancado & Q(data_vencimento=self.hoje + timedelta(days=dias))
+            )
+
+        dados = ItemContrato.objects.aggregate(**agregados)
+
+        metrics.contratos_pf_pendentes = dados['pf_pendentes']
+        metrics.valor_inadimplencia = dados['inadimplencia']
+        metrics.vencimentos = [dados[f'vence_{indice}'] for indice in range(len(VENCIMENTOS_PERIODOS))]
+
+    def _serie_previsto_realizado(self):
+        """Previsto (contratos iniciados) x realizado (consolidado mensal), via UNION ALL"""
+        fim = somar_meses(inicio_mes(self.hoje), 1)
+        inicio = somar_meses(fim, -self.meses)
+        meses = [somar_meses(inicio, i) for i in range(self.meses)]
+
+        previsto = (Contrato.objects
+                    .filter(data_inicio__gte=inicio, data_inicio__lt=fim)
+                    .annotate(ano=ExtractYear('data_inicio'), mes=ExtractMonth('data_inicio'), serie=Value('previsto'))
+                    .values('ano', 'mes', 'serie')
+                    .annotate(total=Sum('valor'))
+                    .values_list('ano', 'mes', 'serie', 'total'))
+        realizado = (MonthlyFinancialRollup.objects
+                     .periodo(inicio, fim)
+                     .annotate(serie=Value('realizado'))
+                     .values('ano', 'mes', 'serie')
+                     .annotate(total=Sum('valor_pago'))
+                     .values_list('ano', 'mes', 'serie', 'total'))
+
+        valores = {'previsto': {}, 'realizado': {}}
+        for ano, mes, serie, total in previsto.union(realizado, all=True):
+            valores[serie][date(ano, mes, 1)] = total or ZERO
+
+        return SerieMensal(
+            meses=meses,
+            previsto=[valores['previsto'].get(mes, ZERO) for mes in meses],
+            realizado=[valores['realizado'].get(mes, ZERO) for mes in meses],
+        )
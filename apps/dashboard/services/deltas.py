@@ -0,0 +1,56 @@
+# apps/dashboard/services/deltas.py
+from decimal import Decimal
+
+ZERO = Decimal('0')
+
+# Campos de cada modelo que entram nos KPIs do dashboard
+CAMPOS_PROJETO = ('situacao',)
+CAMPOS_CONTRATO = ('situacao', 'tipo_pessoa', 'data_fim')
+CAMPOS_PARCELA = ('situacao', 'valor_parcela', 'valor_pago', 'data_vencimento')
+
+
+def parcela_vencida(estado, hoje):
+    """Lançada ('1') e com vencimento passado, como em ItemContratoManager.vencidas"""
+    return estado['situacao'] == '1' and estado['data_vencimento'] is not None and estado['data_vencimento'] < hoje
+
+
+def contadores_projeto(estado, hoje):
+    """Contribuição de um projeto para DashboardMetrics.kpis()"""
+    return {'projetos_ativos': int(estado['situacao'] == '2')}
+
+
+def contadores_contrato(estado, hoje):
+    """Contribuição de um contrato, com os filtros de DashboardMetricsEngine._agregar_contratos"""
+    pf = estado['tipo_pessoa'] == 1
+    pj = estado['tipo_pessoa'] == 2
+    ativo = estado['situacao'] in ('1', '2')
+    vencido = estado['situacao'] == '2' and estado['data_fim'] is not None and estado['data_fim'] < hoje
+    return {
+        'contratos_pf_total': int(pf),
+        'contratos_pf_ativos': int(pf and ativo),
+        'contratos_pj_total': int(pj),
+        'contratos_pj_ativos': int(pj and ativo),
+        'contratos_pj_vencidos': int(pj and vencido),
+    }
+
+
+def contadores_parcela(estado, hoje):
+    """Contribuição de uma parcela, com os filtros de DashboardMetricsEngine._agregar_itens"""
+    em_aberto = ZERO
+    if parcela_vencida(estado, hoje):
+        em_aberto = (estado['valor_parcela'] or ZERO) - (estado['valor_pago'] or ZERO)
+    return {
+        'contratos_pf_pendentes': int(estado['situacao'] == '1' and estado['tipo_pessoa'] == 1),
+        'valor_inadimplencia': em_aberto,
+    }
+
+
+def delta_kpis(contadores, anterior, atual, hoje):
+    """
+    Variação dos KPIs entre dois estados de um registro (dicts com os CAMPOS_*;
+    None quando o registro não existia). Só os KPIs que mudaram são devolvidos.
+    """
+    antes = contadores(anterior, hoje) if anterior else {}
+    depois = contadores(atual, hoje) if atual else {}
+    variacao = {kpi: depois.get(kpi, 0) - antes.get(kpi, 0) for kpi in {**antes, **depois}}
+    return {kpi: valor for kpi, valor in variacao.items() if valor}
@@ -2,6 +2,8 @@
 from calendar import monthrange
 from django.utils import timezone
 
+from apps.core.cache import memoizar
+
 class FinanceiroAnalyticsService:
     """Service de analytics financeiro. Implementação mínima para não quebrar a view."""
 
@@ -14,22 +16,26 @@ class FinanceiroAnalyticsService:
 
     def get_receitas_por_mes(self, ano=None):
         """Retorna dict {1..12: valor} baseado nos pagamentos de contratos."""
-        ano = ano or self.hoje.year
+        # Resumo, fluxo de caixa, impostos e gráficos partem das receitas: a
+        # consulta roda uma vez por ano pedido (ver _receitas_do_ano)
+        return dict(self._receitas_do_ano(ano or self.hoje.year))
+
+    @memoizar(compartilhado=True)
+    def _receitas_do_ano(self, ano):
         data = self._meses_zero()
 
-        # Integrado com ItemContrato (parcelas pagas)
+        # Lido do consolidado mensal (rollup_financeiro_mensal), no máximo 12 linhas
         from django.db.models import Sum
-        from django.db.models.functions import ExtractMonth
         from django.apps import apps
         
-        ItemContrato = apps.get_model('contratos', 'ItemContrato')
-        qs = (ItemContrato.objects
-              .filter(data_pagamento__year=ano, valor_pago__gt=0)
-              .values(m=ExtractMonth('data_pagamento'))
+        MonthlyFinancialRollup = apps.get_model('contratos', 'MonthlyFinancialRollup')
+        qs = (MonthlyFinancialRollup.objects
+              .filter(ano=ano)
+              .values('mes')
               .annotate(total=Sum('valor_pago')))
         
         for row in qs:
-            data[row['m']] = float(row['total'] or 0)
+            data[row['mes']] = float(row['total'] or 0)
             
         return data
 
@@ -0,0 +1,92 @@
+# apps/dashboard/services/series.py
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .dashboard_metrics import inicio_mes, somar_meses
+
+MES = 'mes'
+SEMANA = 'semana'
+TRUNC = {MES: TruncMonth, SEMANA: TruncWeek}
+
+
+def inicio_periodo(dia, periodo=MES):
+    """Primeiro dia do mês, ou a segunda-feira da semana (como TruncWeek), de `dia`"""
+    if periodo == MES:
+        return inicio_mes(dia)
+    return dia - timedelta(days=dia.weekday())
+
+
+def avancar(inicio, quantidade, periodo=MES):
+    """Desloca um início de período em `quantidade` meses ou semanas de calendário"""
+    if periodo == MES:
+        return somar_meses(inicio, quantidade)
+    return inicio + timedelta(weeks=quantidade)
+
+
+def ultimos_periodos(quantidade, periodo=MES, hoje=None):
+    """Intervalo [inicio, fim) dos últimos `quantidade` períodos, incluindo o atual"""
+    fim = avancar(inicio_periodo(hoje or timezone.now().date(), periodo), 1, periodo)
+    return avancar(fim, -quantidade, periodo), fim
+
+
+def proximos_periodos(quantidade, periodo=MES, hoje=None):
+    """Intervalo [inicio, fim) do período atual e dos `quantidade - 1` seguintes"""
+    inicio = inicio_periodo(hoje or timezone.now().date(), periodo)
+    return inicio, avancar(inicio, quantidade, periodo)
+
+
+def calendario(inicio, fim, periodo=MES):
+    """Inícios dos períodos de [inicio, fim), gerados em Python (sem consulta)"""
+    atual = inicio_periodo(inicio, periodo)
+    periodos = []
+    while atual < fim:
+        periodos.append(atual)
+        atual = avancar(atual, 1, periodo)
+    return periodos
+
+
+@dataclass
+class SerieTemporal:
+    """Série densa: um valor por período para cada métrica, em ordem cronológica"""
+    periodo: str
+    periodos: list
+    valores: dict
+
+    def labels(self, formato='%b/%Y'):
+        return [inicio.strftime(formato) for inicio in self.periodos]
+
+    def pontos(self):
+        """Um dict por período: {'periodo': date, <métrica>: valor, ...}"""
+        return [
+            {'periodo': inicio, **{nome: valores[indice] for nome, valores in self.valores.items()}}
+            for indice, inicio in enumerate(self.periodos)
+        ]
+
+
+def serie_temporal(queryset, campo, metricas, inicio, fim, periodo=MES, vazio=0):
+    """
+    Agrega `queryset` por mês ou semana de `campo` (uma data) no intervalo
+    [inicio, fim) com uma única consulta (Trunc + GROUP BY). `metricas` é um
+    dict {nome: agregado}, ex.: {'quantidade': Count('pk'), 'valor':
+    Sum('valor', filter=Q(situacao='2'))}. Períodos sem linhas recebem
+    `vazio`, de modo que a série não tem buracos.
+    """
+    periodos = calendario(inicio, fim, periodo)
+    linhas = (queryset
+              .filter(**{f'{campo}__gte': periodos[0] if periodos else inicio, f'{campo}__lt': fim})
+              .annotate(inicio_periodo=TRUNC[periodo](campo))
+              .values('inicio_periodo')
+              .annotate(**metricas)
+              .order_by())
+
+    por_periodo = {linha.pop('inicio_periodo'): linha for linha in linhas}
+    valores = {nome: [] for nome in metricas}
+    for inicio in periodos:
+        linha = por_periodo.get(inicio, {})
+        for nome in metricas:
+            valor = linha.get(nome)
+            valores[nome].append(vazio if valor is None else valor)
+    return SerieTemporal(periodo=periodo, periodos=periodos, valores=valores)
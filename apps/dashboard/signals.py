@@ -0,0 +1,96 @@
+from django.db.models.signals import pre_save, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.contratos.models import Contrato, ItemContrato
+from apps.core.eventos import publicar
+from apps.projetos.models import Projeto
+
+from .services.deltas import (
+    CAMPOS_CONTRATO, CAMPOS_PARCELA, CAMPOS_PROJETO,
+    contadores_contrato, contadores_parcela, contadores_projeto, delta_kpis, parcela_vencida,
+)
+
+# Deltas dos KPIs calculados uma vez por alteração e publicados no broker de
+# eventos (apps.core.eventos), que os repassa aos dashboards conectados (SSE)
+
+CAMPOS = {Projeto: CAMPOS_PROJETO, Contrato: CAMPOS_CONTRATO}
+CONTADORES = {Projeto: contadores_projeto, Contrato: contadores_contrato}
+IGNORAR = object()
+
+
+def _estado(instance, campos):
+    return {campo: getattr(instance, campo) for campo in campos}
+
+
+@receiver(pre_save, sender=Projeto)
+@receiver(pre_save, sender=Contrato)
+def guardar_situacao_anterior(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Lê do banco os campos que entram nos KPIs antes da alteração"""
+    instance._kpis_anterior = None
+    if raw or instance._state.adding:
+        return
+
+    campos = CAMPOS[sender]
+    if update_fields is not None and not set(update_fields) & set(campos):
+        instance._kpis_anterior = IGNORAR
+        return
+    instance._kpis_anterior = sender.objects.filter(pk=instance.pk).values(*campos).first()
+
+
+@receiver(post_save, sender=Projeto)
+@receiver(post_save, sender=Contrato)
+def publicar_situacao(sender, instance, raw=False, **kwargs):
+    """Mudança de situação (ou criação) de projeto/contrato"""
+    anterior = getattr(instance, '_kpis_anterior', None)
+    if raw or anterior is IGNORAR:
+        return
+
+    atual = _estado(instance, CAMPOS[sender])
+    kpis = delta_kpis(CONTADORES[sender], anterior, atual, timezone.now().date())
+    situacao_anterior = anterior['situacao'] if anterior else None
+    if situacao_anterior == atual['situacao'] and not kpis:
+        return
+
+    publicar('situacao' if situacao_anterior != atual['situacao'] else 'alteracao', {
+        'modelo': sender._meta.label,
+        'id': instance.pk,
+        'de': situacao_anterior,
+        'para': atual['situacao'],
+        'kpis': kpis,
+    })
+
+
+@receiver(post_save, sender=ItemContrato)
+def publicar_parcela(sender, instance, raw=False, **kwargs):
+    """
+    Pagamento, parcela que passou a vencida ou mudança de situação. O estado
+    anterior vem do pre_save de apps.contratos.signals, sem nova consulta.
+    """
+    if raw:
+        return
+
+    hoje = timezone.now().date()
+    anterior = getattr(instance, '_estado_anterior', None)
+    if anterior:
+        anterior = {**{campo: anterior[campo] for campo in CAMPOS_PARCELA},
+                    'tipo_pessoa': anterior['num_contrato__tipo_pessoa']}
+    atual = {**_estado(instance, CAMPOS_PARCELA), 'tipo_pessoa': instance.num_contrato.tipo_pessoa}
+    kpis = delta_kpis(contadores_parcela, anterior, atual, hoje)
+
+    dados = {'modelo': sender._meta.label, 'id': instance.pk, 'contrato': instance.num_contrato_id}
+    pago = (atual['valor_pago'] or 0) - ((anterior or {}).get('valor_pago') or 0)
+    if pago > 0:
+        tipo = 'pagamento'
+        dados['valor'] = pago
+    elif parcela_vencida(atual, hoje) and not (anterior and parcela_vencida(anterior, hoje)):
+        tipo = 'vencimento'
+    elif anterior is None or anterior['situacao'] != atual['situacao']:
+        tipo = 'situacao'
+        dados.update({'de': anterior['situacao'] if anterior else None, 'para': atual['situacao']})
+    elif kpis:
+        tipo = 'alteracao'
+    else:
+        return
+
+    publicar(tipo, {**dados, 'kpis': kpis})
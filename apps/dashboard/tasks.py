@@ -0,0 +1,43 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from celery import shared_task
+from django.db.models import Count, DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.contratos.models import Contrato, ItemContrato
+from apps.core.eventos import publicar
+
+ZERO = Decimal('0')
+
+
+@shared_task
+def publicar_vencimentos_do_dia(hoje=None):
+    """
+    Na virada do dia parcelas passam a vencidas sem nenhum salvamento (e sem
+    signal): publica de uma vez as que venceram ontem e os contratos PJ cujo
+    prazo terminou ontem, com os deltas de valor_inadimplencia e
+    contratos_pj_vencidos.
+    """
+    hoje = hoje or timezone.now().date()
+    ontem = hoje - timedelta(days=1)
+
+    parcelas = ItemContrato.objects.filter(situacao='1', data_vencimento=ontem).aggregate(
+        quantidade=Count('pk'),
+        valor=Coalesce(
+            Sum(F('valor_parcela') - F('valor_pago')), Value(ZERO),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+    )
+    contratos = Contrato.objects.filter(tipo_pessoa=2, situacao='2', data_fim=ontem).count()
+    if not parcelas['quantidade'] and not contratos:
+        return 0
+
+    kpis = {'valor_inadimplencia': parcelas['valor'], 'contratos_pj_vencidos': contratos}
+    publicar('vencimento', {
+        'parcelas': parcelas['quantidade'],
+        'contratos': contratos,
+        'kpis': {kpi: valor for kpi, valor in kpis.items() if valor},
+    })
+    return parcelas['quantidade']
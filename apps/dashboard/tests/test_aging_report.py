@@ -0,0 +1,75 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+
+from apps.contratos.models import Contrato, ItemContrato
+from apps.dashboard.services.aging_report import AgingReport
+from apps.dashboard.views.analytics_views import FinanceiroAnalyticsServiceOLD
+
+
+class AgingReportTest(TestCase):
+
+    def setUp(self):
+        self.hoje = date(2025, 6, 30)
+        pf = Contrato.objects.create(
+            num_contrato='0001/2025', cod_ordem=1, descricao='PF', tipo_pessoa=1, valor=Decimal('5000.00'),
+        )
+        pj = Contrato.objects.create(
+            num_contrato='0002/2025', cod_ordem=1, descricao='PJ', tipo_pessoa=2, valor=Decimal('5000.00'),
+        )
+        parcelas = [
+            # (contrato, cod, dias de atraso, valor_parcela, valor_pago, situacao)
+            (pf, 1, 1, '100.00', '40.00', '1'),
+            (pf, 2, 30, '100.00', '0', '1'),
+            (pf, 3, 31, '200.00', '0', '1'),
+            (pj, 1, 90, '300.00', '0', '1'),
+            (pj, 2, 91, '400.00', '0', '1'),
+            (pj, 3, 200, '400.00', '400.00', '3'),
+            (pj, 4, 0, '500.00', '0', '1'),
+            (pj, 5, -10, '600.00', '0', '1'),
+        ]
+        for contrato, cod, atraso, valor, pago, situacao in parcelas:
+            ItemContrato.objects.create(
+                num_contrato=contrato, cod_lancamento=cod, num_parcela=cod,
+                data_lancamento=date(2025, 1, 1), data_vencimento=self.hoje - timedelta(days=atraso),
+                valor_parcela=Decimal(valor), valor_pago=Decimal(pago), situacao=situacao,
+            )
+
+    def test_faixas_em_uma_consulta(self):
+        report = AgingReport(hoje=self.hoje)
+        with self.assertNumQueries(1):
+            faixas = report.faixas()
+
+        self.assertEqual(faixas, {
+            '0-30': {'count': 2, 'valor': 160.0},
+            '31-60': {'count': 1, 'valor': 200.0},
+            '61-90': {'count': 1, 'valor': 300.0},
+            '90+': {'count': 1, 'valor': 400.0},
+        })
+
+    def test_faixas_por_tipo_pessoa_e_totais(self):
+        report = AgingReport(hoje=self.hoje)
+        por_tipo = report.faixas(por='tipo_pessoa')
+
+        self.assertEqual(list(por_tipo), [1, 2])
+        self.assertEqual(por_tipo[1]['0-30']['count'], 2)
+        self.assertEqual(por_tipo[1]['90+']['count'], 0)
+        self.assertEqual(por_tipo[2]['61-90']['valor'], 300.0)
+        self.assertEqual(report.faixas(por='contrato')['0002/2025']['90+']['valor'], 400.0)
+
+        totais = report.totais()
+        self.assertEqual(totais['inadimplencia_total'], Decimal('1060.00'))
+        self.assertEqual(totais['total_pendente'], Decimal('2160.00'))
+
+    def test_resumo_financeiro_le_totais_uma_vez(self):
+        service = FinanceiroAnalyticsServiceOLD()
+
+        # Pendente e inadimplência vêm do mesmo aggregate, memoizado no service
+        with self.assertNumQueries(1):
+            pendente = service._calcular_total_pendente()
+            inadimplencia = service._calcular_inadimplencia_total()
+
+        # Todas as parcelas lançadas já venceram em relação à data real
+        self.assertEqual(pendente, 2160.0)
+        self.assertEqual(inadimplencia, 2160.0)
@@ -0,0 +1,61 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.core.profiling import metrics
+from apps.projetos.models import Projeto
+
+
+@override_settings(CHART_CACHE_SOFT_TTL=30)
+class ChartPayloadCacheTest(TestCase):
+    url = '/dashboard/api/chart-data/projetos/?type=situacao'
+
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create_user(username='admin', email='a@funetec.br', password='x', role='admin')
+        self.client.force_login(user)
+        self._projeto(1)
+
+    def _projeto(self, cod):
+        return Projeto.objects.create(
+            cod_projeto=cod, nome=f'Projeto {cod}', data_inicio=date(2025, 1, 1),
+            data_encerramento=date(2025, 12, 31), valor=Decimal('100.00'), situacao='2',
+        )
+
+    def _contador(self, nome):
+        return metrics.resumo()['contadores'].get(nome, 0)
+
+    def test_etag_e_304(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        self.assertEqual(response.json()['data']['datasets'][0]['data'], [1])
+
+        revalidado = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidado.status_code, 304)
+        self.assertEqual(revalidado['ETag'], response['ETag'])
+
+    def test_payload_antigo_servido_enquanto_recalcula_uma_vez(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self._projeto(2)  # avança a versão de Projeto (no commit): o payload fica velho
+
+        agendados = []
+        with mock.patch('apps.core.cache.em_segundo_plano', side_effect=agendados.append):
+            stale = self._contador('swr.stale')
+            primeira = self.client.get(self.url)
+            segunda = self.client.get(self.url)
+
+        # As duas requisições recebem o payload antigo; só a primeira agenda o recálculo
+        self.assertEqual((primeira['ETag'], segunda['ETag']), (etag, etag))
+        self.assertEqual(self._contador('swr.stale') - stale, 2)
+        self.assertEqual(len(agendados), 1)
+
+        agendados[0]()
+        atualizado = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(atualizado.status_code, 200)
+        self.assertEqual(atualizado.json()['data']['datasets'][0]['data'], [2])
@@ -0,0 +1,83 @@
+from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
+from apps.projetos.models import Projeto
+from apps.contratos.models import Contrato, ItemContrato
+from apps.dashboard.services.dashboard_metrics import DashboardMetricsEngine
+
+
+class DashboardMetricsEngineTest(TestCase):
+
+    def setUp(self):
+        self.hoje = date(2025, 3, 15)
+        Projeto.objects.create(
+            cod_projeto=1, nome='Projeto A', data_inicio=date(2025, 3, 1),
+            data_encerramento=date(2025, 12, 31), valor=Decimal('1000.00'), situacao='2',
+        )
+        Projeto.objects.create(
+            cod_projeto=2, nome='Projeto B', data_inicio=date(2025, 2, 10),
+            data_encerramento=date(2025, 3, 1), valor=Decimal('500.00'), situacao='6',
+        )
+        self.contrato_pf = Contrato.objects.create(
+            num_contrato='0001/2025', cod_ordem=1, descricao='PF', tipo_pessoa=1,
+            data_inicio=date(2025, 1, 10), data_fim=date(2025, 12, 31),
+            valor=Decimal('3000.00'), situacao='2',
+        )
+        Contrato.objects.create(
+            num_contrato='0002/2025', cod_ordem=1, descricao='PJ', tipo_pessoa=2,
+            data_inicio=date(2024, 12, 5), data_fim=date(2025, 2, 1),
+            valor=Decimal('1000.00'), situacao='2',
+        )
+        parcelas = [
+            # (cod, vencimento, valor_parcela, valor_pago, data_pagamento, situacao)
+            (1, date(2025, 2, 10), '1000.00', '1000.00', date(2025, 2, 10), '3'),
+            (2, date(2025, 3, 10), '1000.00', '250.00', None, '1'),
+            (3, self.hoje, '500.00', '0', None, '1'),
+            (4, self.hoje + timedelta(days=7), '500.00', '0', None, '1'),
+        ]
+        for cod, vencimento, valor, pago, data_pagamento, situacao in parcelas:
+            ItemContrato.objects.create(
+                num_contrato=self.contrato_pf, cod_lancamento=cod, num_parcela=cod,
+                data_lancamento=date(2025, 1, 10), data_vencimento=vencimento,
+                valor_parcela=Decimal(valor), valor_pago=Decimal(pago),
+                data_pagamento=data_pagamento, situacao=situacao,
+            )
+
+    def test_kpis(self):
+        metrics = DashboardMetricsEngine(hoje=self.hoje).calcular()
+        kpis = metrics.kpis()
+
+        self.assertEqual(kpis['projetos_ativos'], 1)
+        self.assertEqual(kpis['projetos_crescimento'], 0.0)
+        self.assertEqual(kpis['contratos_pf_total'], 1)
+        self.assertEqual(kpis['contratos_pf_ativos'], 1)
+        self.assertEqual(kpis['contratos_pf_pendentes'], 3)
+        self.assertEqual(kpis['contratos_pj_total'], 1)
+        self.assertEqual(kpis['contratos_pj_vencidos'], 1)
+        self.assertEqual(kpis['valor_inadimplencia'], 750.0)
+        self.assertAlmostEqual(kpis['percentual_inadimplencia'], 18.75)
+
+    def test_series_e_vencimentos(self):
+        metrics = DashboardMetricsEngine(hoje=self.hoje).calcular()
+
+        grafico = metrics.grafico_previsto_realizado()
+        self.assertEqual(grafico['labels'], ['Out', 'Nov', 'Dez', 'Jan', 'Fev', 'Mar'])
+        self.assertEqual(grafico['previsto'], [0.0, 0.0, 1000.0, 3000.0, 0.0, 0.0])
+        self.assertEqual(grafico['realizado'], [0.0, 0.0, 0.0, 0.0, 1000.0, 0.0])
+        self.assertEqual(metrics.grafico_vencimentos()['data'], [1, 0, 0, 1, 0, 0])
+        self.assertEqual(metrics.status_projetos, {'2': 1, '6': 1})
+
+    def test_status_projetos_com_situacao_fora_da_tabela(self):
+        for cod, situacao in [(3, '9'), (4, '')]:
+            Projeto.objects.create(
+                cod_projeto=cod, nome=f'Projeto {cod}', data_inicio=date(2025, 1, 1),
+                data_encerramento=date(2025, 12, 31), valor=Decimal('1.00'), situacao=situacao,
+            )
+        metrics = DashboardMetricsEngine(hoje=self.hoje).calcular()
+
+        self.assertEqual(metrics.status_projetos, {'2': 1, '6': 1, 'outros': 2})
+        self.assertEqual(metrics.grafico_status_projetos()['labels'], ['Em Andamento', 'Concluído', 'Outros'])
+
+    def test_query_count(self):
+        with self.assertNumQueries(4):
+            DashboardMetricsEngine(hoje=self.hoje).calcular()
@@ -0,0 +1,127 @@
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.contratos.models import Contrato, ItemContrato
+from apps.core.cache import MODELOS_VERSIONADOS
+from apps.core.eventos import formatar_evento, get_broker
+from apps.dashboard.tasks import publicar_vencimentos_do_dia
+from apps.projetos.models import Projeto
+
+
+def ler_evento(mensagem):
+    campos = dict(linha.split(': ', 1) for linha in mensagem.strip().splitlines())
+    return campos['event'], json.loads(campos['data'])
+
+
+class DeltasKpisTest(TestCase):
+
+    def setUp(self):
+        self.hoje = timezone.now().date()
+        self.assinatura = get_broker().assinar()
+        self.addCleanup(self.assinatura.fechar)
+        self.contrato = Contrato.objects.create(
+            num_contrato='0001/2025', cod_ordem=1, descricao='Contrato', tipo_pessoa=1,
+            data_inicio=date(2025, 1, 1), valor=Decimal('1000.00'), situacao='2',
+        )
+
+    def _eventos(self):
+        eventos = []
+        while (mensagem := self.assinatura.receber(timeout=0)) is not None:
+            eventos.append(ler_evento(mensagem))
+        return eventos
+
+    def test_pagamentos_de_parcela_vencida(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            parcela = ItemContrato.objects.create(
+                num_contrato=self.contrato, cod_lancamento=1, num_parcela=1, data_lancamento=date(2025, 1, 1),
+                data_vencimento=self.hoje - timedelta(days=3), valor_parcela=Decimal('1000.00'),
+                valor_pago=Decimal('0'), situacao='1',
+            )
+        [(tipo, dados)] = self._eventos()
+        self.assertEqual(tipo, 'vencimento')
+        self.assertEqual(dados['kpis'], {'contratos_pf_pendentes': 1, 'valor_inadimplencia': '1000.00'})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            parcela.valor_pago = Decimal('400.00')
+            parcela.save()
+            parcela.valor_pago = Decimal('1000.00')
+            parcela.situacao = '3'
+            parcela.save()
+
+        (tipo, parcial), (_, quitacao) = self._eventos()
+        self.assertEqual((tipo, parcial['valor'], parcial['kpis']), ('pagamento', '400.00', {'valor_inadimplencia': '-400.00'}))
+        self.assertEqual(quitacao['kpis'], {'contratos_pf_pendentes': -1, 'valor_inadimplencia': '-600.00'})
+        self.assertEqual(len(quitacao['versoes']), len(MODELOS_VERSIONADOS))
+
+    def test_mudanca_de_situacao(self):
+        projeto = Projeto.objects.create(
+            cod_projeto=1, nome='Projeto', data_inicio=date(2025, 1, 1),
+            data_encerramento=date(2025, 12, 31), valor=Decimal('100.00'), situacao='1',
+        )
+        self._eventos()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            projeto.situacao = '2'
+            projeto.save()
+            projeto.nome = 'Projeto renomeado'
+            projeto.save(update_fields=['nome'])
+            self.contrato.situacao = '4'
+            self.contrato.save()
+
+        eventos = self._eventos()
+        self.assertEqual([tipo for tipo, _ in eventos], ['situacao', 'situacao'])
+        self.assertEqual((eventos[0][1]['de'], eventos[0][1]['para'], eventos[0][1]['kpis']), ('1', '2', {'projetos_ativos': 1}))
+        self.assertEqual(eventos[1][1]['kpis'], {'contratos_pf_ativos': -1})
+
+    def test_rollback_nao_publica(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            self.contrato.situacao = '4'
+            self.contrato.save()
+        self.assertEqual(self._eventos(), [])
+
+    def test_vencimentos_do_dia(self):
+        ItemContrato.objects.create(
+            num_contrato=self.contrato, cod_lancamento=1, num_parcela=1, data_lancamento=date(2025, 1, 1),
+            data_vencimento=date(2025, 6, 14), valor_parcela=Decimal('300.00'), valor_pago=Decimal('100.00'), situacao='1',
+        )
+        self._eventos()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(publicar_vencimentos_do_dia(hoje=date(2025, 6, 15)), 1)
+
+        [(tipo, dados)] = self._eventos()
+        self.assertEqual((tipo, dados['parcelas']), ('vencimento', 1))
+        self.assertEqual(Decimal(dados['kpis']['valor_inadimplencia']), Decimal('200.00'))
+
+
+@override_settings(DASHBOARD_SSE_KEEPALIVE=0.05, DASHBOARD_SSE_MAX_DURATION=0.3)
+class DashboardEventosViewTest(TestCase):
+
+    def test_fluxo_sse(self):
+        user = get_user_model().objects.create_user(username='u', email='u@funetec.br', password='x')
+        self.client.force_login(user)
+
+        response = self.client.get('/dashboard/api/eventos/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+        fluxo = (parte.decode() for parte in response.streaming_content)
+        self.assertEqual(next(fluxo), 'retry: 3000\n')
+        tipo, dados = ler_evento(next(fluxo))
+        self.assertEqual((tipo, len(dados['versoes'])), ('versoes', len(MODELOS_VERSIONADOS)))
+
+        # Quadro publicado uma vez e repassado sem reprocessamento
+        quadro = formatar_evento('pagamento', {'kpis': {'valor_inadimplencia': '-10.00'}})
+        get_broker().publicar(quadro)
+        self.assertEqual(next(fluxo), quadro)
+        self.assertEqual(next(fluxo), ': keepalive\n\n')
+
+        # Encerrada após DASHBOARD_SSE_MAX_DURATION; o navegador reconecta
+        restante = list(fluxo)
+        self.assertTrue(all(parte == ': keepalive\n\n' for parte in restante))
+        self.assertEqual(get_broker()._filas, set())
@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from apps.contratos.models import Contrato, ItemContrato
+from apps.core.profiling import metrics
+from apps.dashboard.services.financeiro_analytics import FinanceiroAnalyticsService
+
+
+class FinanceiroMemoizacaoTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.hoje = date(2025, 6, 15)
+        self.contrato = Contrato.objects.create(
+            num_contrato='0001/2025', cod_ordem=1, descricao='Contrato', tipo_pessoa=1,
+            data_inicio=date(2025, 1, 1), valor=Decimal('3000.00'), situacao='2',
+        )
+        self._parcela(1, date(2025, 3, 10))
+
+    def _parcela(self, cod, data_pagamento):
+        return ItemContrato.objects.create(
+            num_contrato=self.contrato, cod_lancamento=cod, num_parcela=cod, data_lancamento=date(2025, 1, 1),
+            data_vencimento=data_pagamento, valor_parcela=Decimal('1000.00'), valor_pago=Decimal('1000.00'),
+            data_pagamento=data_pagamento, situacao='3',
+        )
+
+    def _contexto(self, service):
+        # Mesmas chamadas de FinanceiroAnalyticsView + os gráficos de receitas
+        return (
+            service.get_resumo_financeiro(), service.get_fluxo_caixa(), service.get_impostos_retidos(),
+            service.get_receitas_por_mes(), service.get_chart_fluxo_caixa(), service.get_chart_receitas(),
+        )
+
+    def _contadores(self):
+        contadores = metrics.resumo()['contadores']
+        return {nome: contadores.get(nome, 0) for nome in ('memo.hit', 'memo.cache_hit', 'memo.miss')}
+
+    def test_receitas_consultadas_uma_vez_e_invalidadas_por_itens(self):
+        antes = self._contadores()
+        with self.assertNumQueries(1):
+            resumo = self._contexto(FinanceiroAnalyticsService(hoje=self.hoje))[0]
+        self.assertEqual(resumo['total_receitas'], 1000.0)
+
+        # Outra requisição: vem do cache compartilhado, sem consulta
+        with self.assertNumQueries(0):
+            self._contexto(FinanceiroAnalyticsService(hoje=self.hoje))
+
+        depois = self._contadores()
+        self.assertEqual(depois['memo.miss'] - antes['memo.miss'], 1)
+        self.assertEqual(depois['memo.cache_hit'] - antes['memo.cache_hit'], 1)
+        self.assertGreaterEqual(depois['memo.hit'] - antes['memo.hit'], 8)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._parcela(2, date(2025, 4, 2))
+        receitas = FinanceiroAnalyticsService(hoje=self.hoje).get_receitas_por_mes()
+        self.assertEqual((receitas[3], receitas[4]), (1000.0, 1000.0))
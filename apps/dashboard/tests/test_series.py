@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Q, Sum
+from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from apps.projetos.models import Projeto
+from apps.dashboard.services.series import SEMANA, serie_temporal, ultimos_periodos
+from apps.dashboard.views.analytics_views import ProjetosAnalyticsService
+
+
+class SerieTemporalTest(TestCase):
+
+    def setUp(self):
+        projetos = [
+            # (cod, início, encerramento, valor, situação)
+            (1, date(2024, 11, 30), date(2025, 1, 31), '100.00', '6'),
+            (2, date(2024, 11, 2), date(2025, 3, 1), '50.00', '2'),
+            (3, date(2025, 1, 31), date(2025, 3, 31), '10.00', '6'),
+            (4, date(2024, 9, 1), date(2024, 10, 1), '1.00', '2'),  # fora da janela
+        ]
+        for cod, inicio, encerramento, valor, situacao in projetos:
+            Projeto.objects.create(
+                cod_projeto=cod, nome=f'Projeto {cod}', data_inicio=inicio,
+                data_encerramento=encerramento, valor=Decimal(valor), situacao=situacao,
+            )
+
+    def test_serie_mensal_densa_em_uma_consulta(self):
+        inicio, fim = ultimos_periodos(5, hoje=date(2025, 3, 15))
+        self.assertEqual((inicio, fim), (date(2024, 11, 1), date(2025, 4, 1)))
+
+        with self.assertNumQueries(1):
+            serie = serie_temporal(
+                Projeto.objects.all(), 'data_inicio',
+                {'total': Count('pk'), 'valor_concluido': Sum('valor', filter=Q(situacao='6'))},
+                inicio, fim,
+            )
+
+        self.assertEqual(serie.labels('%m/%Y'), ['11/2024', '12/2024', '01/2025', '02/2025', '03/2025'])
+        self.assertEqual(serie.valores['total'], [2, 0, 1, 0, 0])
+        self.assertEqual(serie.valores['valor_concluido'], [Decimal('100.00'), 0, Decimal('10.00'), 0, 0])
+
+    def test_serie_semanal(self):
+        serie = serie_temporal(
+            Projeto.objects.all(), 'data_encerramento', {'total': Count('pk')},
+            date(2025, 3, 1), date(2025, 4, 1), periodo=SEMANA,
+        )
+        # Semanas começam na segunda-feira, como TruncWeek
+        self.assertEqual(serie.periodos[0], date(2025, 2, 24))
+        self.assertEqual(len(serie.periodos), 6)
+        self.assertEqual(serie.valores['total'], [1, 0, 0, 0, 0, 1])
+
+    def test_evolucao_de_projetos_sem_meses_repetidos(self):
+        user = get_user_model().objects.create_user(username='admin', email='a@funetec.br', password='x', role='admin')
+        service = ProjetosAnalyticsService(user=user)
+
+        with self.assertNumQueries(2):
+            evolucao = service.get_evolucao_mensal()
+
+        meses = [item['mes'] for item in evolucao]
+        self.assertEqual(len(set(meses)), 12)
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import main_dashboard, analytics_views
+from .views import main_dashboard, analytics_views, eventos_views
 
 app_name = 'dashboard'
 
@@ -13,4 +13,7 @@ urlpatterns = [
     path('api/chart-data/financeiro/', analytics_views.FinanceiroChartDataView.as_view(), name='chart_data_financeiro'),
     path('api/chart-data/projetos/', analytics_views.ProjetosChartDataView.as_view(), name='chart_data_projetos'),
     path('api/chart-data/contratos/', analytics_views.ContratosChartDataView.as_view(), name='chart_data_contratos'),
+
+    # Deltas dos KPIs ao vivo (Server-Sent Events)
+    path('api/eventos/', eventos_views.DashboardEventosView.as_view(), name='eventos'),
 ]
\ No newline at end of file
@@ -1,16 +1,21 @@
 from django.views.generic import TemplateView, View
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.http import JsonResponse
-from django.db.models import Sum, Count, Avg, Q
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseNotModified
+from django.db.models import Sum, Count, Avg, F, Q
 from django.utils import timezone
 from datetime import timedelta, datetime
 import json
 from apps.projetos.models import Projeto
 from apps.contratos.models import Contrato, ItemContrato
 
+from apps.core.cache import memoizar, stale_while_revalidate
 from apps.core.middleware import BaseService
 
+from ..services.aging_report import AgingReport
 from ..services.financeiro_analytics import FinanceiroAnalyticsService
+from ..services.series import proximos_periodos, serie_temporal, ultimos_periodos
 
 class ProjetosAnalyticsView(LoginRequiredMixin, TemplateView):
     """View para analytics de projetos"""
@@ -74,12 +79,49 @@ class FinanceiroAnalyticsView(LoginRequiredMixin, PermissionRequiredMixin, Templ
 
 # APIs para dados dos gráficos (AJAX)
 
-class ProjetosChartDataView(LoginRequiredMixin, View):
+class ChartPayloadCacheMixin:
+    """
+    Payloads de gráfico em cache stale-while-revalidate (apps.core.cache):
+    a resposta sai sempre do último payload calculado e, passado o soft TTL
+    ou alterado um modelo versionado, um único recálculo roda em segundo
+    plano. ETag + Cache-Control: no-cache fazem o navegador revalidar e
+    receber 304 enquanto o payload não muda.
+    """
+    default_chart_type = None
+
+    def get_chart_data(self, user, chart_type):
+        raise NotImplementedError
+
+    def get_cache_scope(self, user):
+        """Parte da chave que separa payloads que dependem do usuário"""
+        return ''
+
+    def get(self, request, *args, **kwargs):
+        chart_type = request.GET.get('type', self.default_chart_type)
+        user = request.user
+        chave = f'chart_payload:{self.__class__.__name__}:{chart_type}:{self.get_cache_scope(user)}'
+
+        def calcular():
+            return json.dumps(self.get_chart_data(user, chart_type), cls=DjangoJSONEncoder).encode()
+
+        entrada = stale_while_revalidate(
+            chave, calcular, getattr(settings, 'CHART_CACHE_SOFT_TTL', 30),
+        )
+        if request.META.get('HTTP_IF_NONE_MATCH') == entrada.etag:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(entrada.conteudo, content_type='application/json')
+        response['ETag'] = entrada.etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class ProjetosChartDataView(LoginRequiredMixin, ChartPayloadCacheMixin, View):
     """API para dados de gráficos de projetos"""
+    default_chart_type = 'situacao'
     
-    def get(self, request, *args, **kwargs):
-        chart_type = request.GET.get('type', 'situacao')
-        analytics_service = ProjetosAnalyticsService(user=request.user)
+    def get_chart_data(self, user, chart_type):
+        analytics_service = ProjetosAnalyticsService(user=user)
         
         data = {}
         
@@ -96,16 +138,20 @@ class ProjetosChartDataView(LoginRequiredMixin, View):
         elif chart_type == 'status_custo':
             data = analytics_service.get_chart_status_custo()
         
-        return JsonResponse(data)
+        return data
 
 
-class ContratosChartDataView(LoginRequiredMixin, PermissionRequiredMixin, View):
+class ContratosChartDataView(LoginRequiredMixin, PermissionRequiredMixin, ChartPayloadCacheMixin, View):
     """API para dados de gráficos de contratos"""
     permission_required = 'accounts.can_view_financial_data'
+    default_chart_type = 'tipo_pessoa'
     
-    def get(self, request, *args, **kwargs):
-        chart_type = request.GET.get('type', 'tipo_pessoa')
-        analytics_service = ContratosAnalyticsService(user=request.user)
+    def get_cache_scope(self, user):
+        # Só quem gerencia contratos vê os valores (ContratosAnalyticsService._get_contratos_queryset)
+        return 'gestor' if user.can_manage_contracts() else 'leitor'
+    
+    def get_chart_data(self, user, chart_type):
+        analytics_service = ContratosAnalyticsService(user=user)
         
         data = {}
         
@@ -118,15 +164,15 @@ class ContratosChartDataView(LoginRequiredMixin, PermissionRequiredMixin, View):
         elif chart_type == 'prestadores_top':
             data = analytics_service.get_chart_prestadores_top()
         
-        return JsonResponse(data)
+        return data
 
 
-class FinanceiroChartDataView(LoginRequiredMixin, PermissionRequiredMixin, View):
+class FinanceiroChartDataView(LoginRequiredMixin, PermissionRequiredMixin, ChartPayloadCacheMixin, View):
     """API para dados de gráficos financeiros"""
     permission_required = 'accounts.can_view_financial_data'
+    default_chart_type = 'fluxo_caixa'
     
-    def get(self, request, *args, **kwargs):
-        chart_type = request.GET.get('type', 'fluxo_caixa')
+    def get_chart_data(self, user, chart_type):
         analytics_service = FinanceiroAnalyticsService()
         
         data = {}
@@ -140,7 +186,7 @@ class FinanceiroChartDataView(LoginRequiredMixin, PermissionRequiredMixin, View)
         elif chart_type == 'impostos':
             data = analytics_service.get_chart_impostos()
         
-        return JsonResponse(data)
+        return data
 
 
 # Services para Analytics
@@ -241,28 +287,10 @@ class ProjetosAnalyticsService(BaseService):
     
     def get_chart_evolucao(self):
         """Dados para gráfico de linha - evolução temporal"""
-        hoje = timezone.now().date()
-        meses = []
-        projetos_criados = []
-        projetos_concluidos = []
-        
-        for i in range(12):
-            mes = (hoje.replace(day=1) - timedelta(days=30*i))
-            meses.insert(0, mes.strftime('%b/%Y'))
-            
-            criados = self._get_projetos_queryset().filter(
-                data_inicio__year=mes.year,
-                data_inicio__month=mes.month
-            ).count()
-            
-            concluidos = self._get_projetos_queryset().filter(
-                situacao='6',
-                data_encerramento__year=mes.year,
-                data_encerramento__month=mes.month
-            ).count()
-            
-            projetos_criados.insert(0, criados)
-            projetos_concluidos.insert(0, concluidos)
+        criados, concluidos = self._series_evolucao()
+        meses = criados.labels('%b/%Y')
+        projetos_criados = criados.valores['total']
+        projetos_concluidos = concluidos.valores['total']
         
         return {
             'type': 'line',
@@ -339,30 +367,22 @@ class ProjetosAnalyticsService(BaseService):
     
     def get_evolucao_mensal(self):
         """Evolução mensal dos projetos"""
-        hoje = timezone.now().date()
-        evolucao = []
-        
-        for i in range(12):
-            mes = (hoje.replace(day=1) - timedelta(days=30*i))
-            
-            projetos_iniciados = self._get_projetos_queryset().filter(
-                data_inicio__year=mes.year,
-                data_inicio__month=mes.month
-            ).count()
-            
-            projetos_concluidos = self._get_projetos_queryset().filter(
-                situacao='6',
-                data_encerramento__year=mes.year,
-                data_encerramento__month=mes.month
-            ).count()
-            
-            evolucao.insert(0, {
-                'mes': mes.strftime('%m/%Y'),
-                'iniciados': projetos_iniciados,
-                'concluidos': projetos_concluidos
-            })
-        
-        return evolucao
+        iniciados, concluidos = self._series_evolucao()
+        return [
+            {'mes': mes.strftime('%m/%Y'), 'iniciados': total_iniciados, 'concluidos': total_concluidos}
+            for mes, total_iniciados, total_concluidos in zip(
+                iniciados.periodos, iniciados.valores['total'], concluidos.valores['total']
+            )
+        ]
+    
+    def _series_evolucao(self, meses=12):
+        """Projetos iniciados (data_inicio) e concluídos (data_encerramento) por mês: uma consulta cada"""
+        inicio, fim = ultimos_periodos(meses)
+        projetos = self._get_projetos_queryset()
+        return (
+            serie_temporal(projetos, 'data_inicio', {'total': Count('pk')}, inicio, fim),
+            serie_temporal(projetos.filter(situacao='6'), 'data_encerramento', {'total': Count('pk')}, inicio, fim),
+        )
     
     def get_chart_responsaveis(self):
         """Gráfico de distribuição por situação (substituindo responsáveis)"""
@@ -440,8 +460,10 @@ class ContratosAnalyticsService(BaseService):
         return {
             'total_contratos': contratos.count(),
             'valor_total': contratos.aggregate(Sum('valor'))['valor__sum'] or 0,
-            'valor_pago': contratos.aggregate(Sum('valor_pago'))['valor_pago__sum'] or 0,
-            'valor_pendente': contratos.aggregate(Sum('valor_pendente'))['valor_pendente__sum'] or 0,
+            'valor_pago': contratos.aggregate(Sum('total_pago'))['total_pago__sum'] or 0,
+            'valor_pendente': contratos.aggregate(
+                valor_pendente=Sum(F('total_previsto') - F('total_pago'))
+            )['valor_pendente'] or 0,
             'contratos_pf': contratos.filter(tipo_pessoa=1).count(),
             'contratos_pj': contratos.filter(tipo_pessoa=2).count(),
             'ticket_medio': contratos.aggregate(Avg('valor'))['valor__avg'] or 0,
@@ -454,7 +476,7 @@ class ContratosAnalyticsService(BaseService):
         ).annotate(
             total_contratos=Count('num_contrato'),
             valor_total=Sum('valor'),
-            valor_pago=Sum('valor_pago')
+            valor_pago=Sum('total_pago')
         ).order_by('-valor_total')[:10]
     
     def get_analise_pagamentos(self):
@@ -477,39 +499,9 @@ class ContratosAnalyticsService(BaseService):
             'taxa_inadimplencia': round((parcelas_vencidas / parcelas_total * 100) if parcelas_total > 0 else 0, 2)
         }
     
-    def get_inadimplencia(self):
-        """Análise de inadimplência por período"""
-        hoje = timezone.now().date()
-        
-        inadimplencia = {
-            '0-30': {'count': 0, 'valor': 0},
-            '31-60': {'count': 0, 'valor': 0},
-            '61-90': {'count': 0, 'valor': 0},
-            '90+': {'count': 0, 'valor': 0}
-        }
-        
-        parcelas_vencidas = ItemContrato.objects.filter(
-            situacao='1',
-            data_vencimento__lt=hoje
-        )
-        
-        for parcela in parcelas_vencidas:
-            dias_atraso = (hoje - parcela.data_vencimento).days
-            valor_pendente = float(parcela.get_valor_pendente())
-            
-            if dias_atraso <= 30:
-                periodo = '0-30'
-            elif dias_atraso <= 60:
-                periodo = '31-60'
-            elif dias_atraso <= 90:
-                periodo = '61-90'
-            else:
-                periodo = '90+'
-            
-            inadimplencia[periodo]['count'] += 1
-            inadimplencia[periodo]['valor'] += valor_pendente
-        
-        return inadimplencia
+    def get_inadimplencia(self, por=None):
+        """Análise de inadimplência por período (0-30, 31-60, 61-90 e 90+ dias)"""
+        return AgingReport().faixas(por=por)
     
     def get_chart_tipo_pessoa(self):
         """Gráfico de contratos por tipo de pessoa"""
@@ -556,6 +548,43 @@ class ContratosAnalyticsService(BaseService):
             }
         }
     
+    def get_chart_valores_mensais(self):
+        """Gráfico de valor e quantidade de contratos iniciados por mês (últimos 12 meses)"""
+        inicio, fim = ultimos_periodos(12)
+        serie = serie_temporal(
+            self._get_contratos_queryset(), 'data_inicio',
+            {'quantidade': Count('pk'), 'valor': Sum('valor')}, inicio, fim,
+        )
+        
+        return {
+            'type': 'bar',
+            'data': {
+                'labels': serie.labels('%b/%Y'),
+                'datasets': [
+                    {
+                        'label': 'Valor (R$)',
+                        'data': [float(valor) for valor in serie.valores['valor']],
+                        'backgroundColor': '#28a745',
+                        'yAxisID': 'y'
+                    },
+                    {
+                        'label': 'Quantidade',
+                        'data': serie.valores['quantidade'],
+                        'type': 'line',
+                        'borderColor': '#007bff',
+                        'yAxisID': 'y1'
+                    }
+                ]
+            },
+            'options': {
+                'responsive': True,
+                'scales': {
+                    'y': {'type': 'linear', 'display': True, 'position': 'left', 'beginAtZero': True},
+                    'y1': {'type': 'linear', 'display': True, 'position': 'right', 'beginAtZero': True}
+                }
+            }
+        }
+    
     def _get_contratos_queryset(self):
         """Obter queryset de contratos baseado nas permissões"""
         if self.user.can_manage_contracts():
@@ -619,29 +648,22 @@ class FinanceiroAnalyticsServiceOLD(BaseService):
     
     def get_fluxo_caixa(self):
         """Dados para fluxo de caixa projetado"""
-        hoje = timezone.now().date()
-        fluxo = []
-        
-        # Próximos 12 meses
-        for i in range(12):
-            mes = hoje.replace(day=1) + timedelta(days=30*i)
-            
-            # Parcelas que vencem no mês
-            parcelas_mes = ItemContrato.objects.filter(
-                situacao='1',
-                data_vencimento__year=mes.year,
-                data_vencimento__month=mes.month
-            )
-            
-            valor_previsto = sum(float(p.get_valor_total()) for p in parcelas_mes)
-            
-            fluxo.append({
-                'mes': mes.strftime('%b/%Y'),
-                'valor_previsto': valor_previsto,
-                'parcelas_count': parcelas_mes.count()
-            })
+        inicio, fim = proximos_periodos(12)
+        serie = serie_temporal(
+            ItemContrato.objects.filter(situacao='1'), 'data_vencimento',
+            {'valor_previsto': Sum('valor_parcela'), 'parcelas_count': Count('pk')}, inicio, fim,
+        )
         
-        return fluxo
+        return [
+            {
+                'mes': mes.strftime('%b/%Y'),
+                'valor_previsto': float(valor_previsto),
+                'parcelas_count': parcelas_count
+            }
+            for mes, valor_previsto, parcelas_count in zip(
+                serie.periodos, serie.valores['valor_previsto'], serie.valores['parcelas_count']
+            )
+        ]
     
     def get_chart_fluxo_caixa(self):
         """Gráfico de fluxo de caixa"""
@@ -686,16 +708,15 @@ class FinanceiroAnalyticsServiceOLD(BaseService):
             Sum('valor_pago')
         )['valor_pago__sum'] or 0
     
+    @memoizar()
+    def _totais_aging(self):
+        """Total pendente e inadimplente saem do mesmo aggregate: uma consulta por instância"""
+        return AgingReport().totais()
+    
     def _calcular_total_pendente(self):
         """Calcular total pendente"""
-        parcelas_pendentes = ItemContrato.objects.filter(situacao='1')
-        return sum(float(p.get_valor_pendente()) for p in parcelas_pendentes)
+        return float(self._totais_aging()['total_pendente'])
     
     def _calcular_inadimplencia_total(self):
         """Calcular total em inadimplência"""
-        hoje = timezone.now().date()
-        parcelas_vencidas = ItemContrato.objects.filter(
-            situacao='1',
-            data_vencimento__lt=hoje
-        )
-        return sum(float(p.get_valor_pendente()) for p in parcelas_vencidas)
\ No newline at end of file
+        return float(self._totais_aging()['inadimplencia_total'])
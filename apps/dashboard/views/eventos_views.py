@@ -0,0 +1,70 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.views.generic import View
+
+from apps.core.cache import get_versions
+from apps.core.eventos import formatar_evento, get_broker
+
+
+def fluxo_eventos(broker, keepalive, duracao_maxima, retry_ms):
+    """
+    Gera o fluxo text/event-stream de uma conexão: assina o broker e envia as
+    versões atuais do cache, lidas já com a assinatura ativa (o cliente
+    recarrega se perdeu alterações enquanto estava desconectado),
+    depois os quadros publicados, repassados sem nenhum processamento, e um
+    comentário de keepalive a cada `keepalive` segundos sem eventos. Após
+    `duracao_maxima` segundos a conexão é encerrada e o EventSource reconecta
+    em `retry_ms`, liberando o worker periodicamente.
+    """
+    assinatura = broker.assinar()
+    try:
+        yield f'retry: {retry_ms}\n'
+        yield formatar_evento('versoes', {'versoes': get_versions()})
+
+        inicio = ultimo_envio = time.monotonic()
+        while True:
+            agora = time.monotonic()
+            restante = duracao_maxima - (agora - inicio)
+            if restante <= 0:
+                return
+            mensagem = assinatura.receber(timeout=min(restante, keepalive))
+            agora = time.monotonic()
+            if mensagem is not None:
+                ultimo_envio = agora
+                yield mensagem
+            elif agora - ultimo_envio >= keepalive:
+                ultimo_envio = agora
+                yield ': keepalive\n\n'
+    finally:
+        assinatura.fechar()
+
+
+class DashboardEventosView(LoginRequiredMixin, View):
+    """
+    Server-Sent Events com os deltas dos KPIs do dashboard (pagamentos,
+    mudanças de situação, parcelas vencidas). Os deltas são calculados uma
+    vez por alteração pelos signals (apps.dashboard.signals) e chegam pelo
+    broker de eventos; cada conexão só repassa o texto já formatado.
+    """
+
+    def get(self, request, *args, **kwargs):
+        # A conexão fica aberta por minutos sem usar o banco
+        if not connection.in_atomic_block:
+            connection.close()
+
+        response = StreamingHttpResponse(
+            fluxo_eventos(
+                get_broker(),
+                keepalive=getattr(settings, 'DASHBOARD_SSE_KEEPALIVE', 15),
+                duracao_maxima=getattr(settings, 'DASHBOARD_SSE_MAX_DURATION', 300),
+                retry_ms=getattr(settings, 'DASHBOARD_SSE_RETRY_MS', 3000),
+            ),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Sem buffer no nginx
+        return response
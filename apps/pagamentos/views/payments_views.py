@@ -1,10 +1,10 @@
 from django.http import HttpResponse
 from django.views.generic import TemplateView, ListView
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Sum, Q
-from django.db.models.functions import Extract, TruncMonth
+from django.db.models import Sum, Q, F
 from django.utils import timezone
 from apps.contratos.models.item_contrato import ItemContrato
+from apps.contratos.models.monthly_rollup import MonthlyFinancialRollup
 
 class CreatePaymentView(LoginRequiredMixin, TemplateView):
     def get(self, request, *args, **kwargs):
@@ -54,15 +54,13 @@ class PaymentHistoryView(LoginRequiredMixin, TemplateView):
         )
         
         # Resumo por mês (últimos 12 meses)
-        monthly_summary = ItemContrato.objects.filter(
-            valor_pago__gt=0,
-            data_pagamento__isnull=False,
-            data_pagamento__year=timezone.now().year
+        monthly_summary = MonthlyFinancialRollup.objects.filter(
+            ano=timezone.now().year
         ).values(
-            month=Extract('data_pagamento', 'month')
+            month=F('mes')
         ).annotate(
             total=Sum('valor_pago'),
-            count=Sum('id') / Sum('id')
+            count=Sum('quantidade')
         ).order_by('month')
         
         # Contratos únicos para filtro
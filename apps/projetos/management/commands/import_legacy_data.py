@@ -2,10 +2,18 @@
 Management command para importar dados legados do arquivo inserts_postgres.sql
 """
 import os
+import time
 from django.core.management.base import BaseCommand
 from django.db import connection, transaction
 from django.conf import settings
 
+from apps.contratos.models import Contrato, MonthlyFinancialRollup, SequenciaContrato
+from apps.core.cache import MODELOS_VERSIONADOS, bump_version
+from apps.core.sql_loader import (
+    BulkLoader, completar_defaults, is_transaction_control, iter_statements,
+    model_column_defaults, model_column_resolver, parse_insert,
+)
+
 
 class Command(BaseCommand):
     help = 'Importa dados legados do arquivo inserts_postgres.sql'
@@ -22,56 +30,73 @@ class Command(BaseCommand):
             action='store_true',
             help='Executa em modo teste sem aplicar mudanças'
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Agrupa os INSERTs por tabela e carrega em lote (COPY no PostgreSQL)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Linhas por lote no modo --bulk (padrão: 5000)'
+        )
 
     def handle(self, *args, **options):
         file_path = options['file']
         dry_run = options['dry_run']
-        
+
         # Se não for caminho absoluto, assume que está na raiz do projeto
         if not os.path.isabs(file_path):
             file_path = os.path.join(settings.BASE_DIR, file_path)
-        
+
         if not os.path.exists(file_path):
             self.stdout.write(
                 self.style.ERROR(f'Arquivo não encontrado: {file_path}')
             )
             return
-        
+
         self.stdout.write(f'Lendo arquivo: {file_path}')
         self.stdout.write(f'Modo: {"DRY RUN" if dry_run else "EXECUÇÃO REAL"}')
-        
+
+        # O arquivo é lido em streaming, declaração por declaração
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                sql_content = f.read()
-        except Exception as e:
+                if options['bulk']:
+                    self.import_bulk(f, dry_run, options['batch_size'])
+                else:
+                    self.import_statements(f, dry_run)
+        except OSError as e:
             self.stdout.write(
                 self.style.ERROR(f'Erro ao ler arquivo: {e}')
             )
-            return
-        
-        # Divide o SQL em declarações individuais
-        statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-        
-        self.stdout.write(f'Encontradas {len(statements)} declarações SQL')
-        
+
+    def import_statements(self, f, dry_run):
+        """Modo original: uma execução por declaração"""
+        statements = (stmt for stmt in iter_statements(f) if not is_transaction_control(stmt))
+
         if dry_run:
             self.stdout.write('=== DRY RUN - Mostrando primeiras 5 declarações ===')
-            for i, stmt in enumerate(statements[:5]):
-                self.stdout.write(f'{i+1}. {stmt[:100]}...')
-            if len(statements) > 5:
-                self.stdout.write(f'... e mais {len(statements) - 5} declarações')
+            total = 0
+            for total, stmt in enumerate(statements, 1):
+                if total <= 5:
+                    self.stdout.write(f'{total}. {stmt[:100]}...')
+            self.stdout.write(f'Encontradas {total} declarações SQL')
             return
-        
+
+        resolver = model_column_resolver()
+        defaults = model_column_defaults()
+
         # Executa as declarações em uma transação
         try:
             with transaction.atomic():
                 with connection.cursor() as cursor:
                     success_count = 0
                     error_count = 0
-                    
+
                     for i, statement in enumerate(statements):
                         try:
-                            cursor.execute(statement)
+                            cursor.execute(*self.completar_insert(statement, resolver, defaults))
                             success_count += 1
                             if (i + 1) % 100 == 0:
                                 self.stdout.write(f'Processadas {i + 1} declarações...')
@@ -82,15 +107,101 @@ class Command(BaseCommand):
                             )
                             # Continue com as próximas declarações
                             continue
-                    
+
+                    self.atualizar_derivados()
                     self.stdout.write(
                         self.style.SUCCESS(
                             f'Importação concluída! '
                             f'Sucesso: {success_count}, Erros: {error_count}'
                         )
                     )
-                    
+
         except Exception as e:
             self.stdout.write(
                 self.style.ERROR(f'Erro durante a importação: {e}')
-            )
\ No newline at end of file
+            )
+
+    def atualizar_derivados(self):
+        """
+        SQL direto não dispara signals: atualiza consolidado, resumo e contador de
+        lançamentos (ultimo_lancamento) e sequências dos contratos e versões de cache
+        """
+        MonthlyFinancialRollup.rebuild()
+        Contrato.atualizar_resumo()
+        SequenciaContrato.sincronizar()
+        for label in MODELOS_VERSIONADOS:
+            bump_version(label)
+
+    def completar_insert(self, statement, resolver, defaults):
+        """
+        (sql, parâmetros) da declaração. INSERTs são reescritos com as colunas reais
+        dos modelos (codLancamento -> cod_lancamento) e os defaults das colunas
+        criadas depois do script.
+        """
+        insert = parse_insert(statement)
+        if not insert:
+            return statement, None
+        columns, rows = completar_defaults(
+            defaults, insert.table, resolver(insert.table, insert.columns), insert.rows
+        )
+
+        quote = connection.ops.quote_name
+        placeholder = '(' + ', '.join(['%s'] * len(columns)) + ')'
+        sql = (f'INSERT INTO {quote(insert.table)} ({", ".join(quote(coluna) for coluna in columns)}) '
+               f'VALUES {", ".join([placeholder] * len(rows))}')
+        return sql, [valor for row in rows for valor in row]
+
+    def import_bulk(self, f, dry_run, batch_size):
+        """Modo em lote: INSERTs agrupados por tabela, tudo ou nada"""
+        if dry_run:
+            contagem = {}
+            for statement in iter_statements(f):
+                insert = parse_insert(statement)
+                if insert:
+                    contagem[insert.table] = contagem.get(insert.table, 0) + len(insert.rows)
+            self.stdout.write('=== DRY RUN - Linhas por tabela ===')
+            for table, linhas in contagem.items():
+                self.stdout.write(f'{table}: {linhas} linhas')
+            return
+
+        loader = BulkLoader(
+            connection, batch_size=batch_size,
+            resolver=model_column_resolver(), defaults=model_column_defaults(),
+        )
+        self.stdout.write(f'Carga em lote via {"COPY" if loader.usa_copy else "INSERT multi-linha"}')
+
+        inicio = time.perf_counter()
+        try:
+            with transaction.atomic():
+                for statement in iter_statements(f):
+                    if is_transaction_control(statement):
+                        continue
+                    insert = parse_insert(statement)
+                    if insert:
+                        loader.add(insert)
+                    else:
+                        loader.execute(statement)
+                loader.flush()
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'Erro durante a importação (nenhuma linha gravada): {e}')
+            )
+            return
+        duracao = time.perf_counter() - inicio
+
+        self.atualizar_derivados()
+
+        total = 0
+        for table, stats in loader.stats.items():
+            total += stats.rows
+            self.stdout.write(
+                f'{table:<20} {stats.rows:>8} linhas  {stats.seconds:>7.3f}s  '
+                f'{stats.rows_per_second:>10,.0f} linhas/s'
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Importação concluída! {total} linhas em {duracao:.2f}s '
+                f'({total / duracao if duracao else 0:,.0f} linhas/s)'
+            )
+        )
@@ -1,6 +1,7 @@
 # apps/projetos/models/projeto.py
 from django.db import models
 from django.core.exceptions import ValidationError
+from apps.core.managers.base import ProjetoManager
 
 class Projeto(models.Model):
     '''
@@ -44,6 +45,8 @@ class Projeto(models.Model):
         default='1',  # Default to 'Aguardando Início'
         verbose_name='Situação'
     )
+
+    objects = ProjetoManager()
     
     class Meta:
         db_table = 'projetos'
@@ -5,6 +5,7 @@ from django.views.generic import CreateView, DetailView, ListView, UpdateView
 from ..models.requisicao import Requisicao
 from ..models.ordem import Ordem
 from ..forms.ordem_forms import OrdemForm
+from apps.core.pagination import KeysetPaginationMixin
 
 class OrdemCreateView(LoginRequiredMixin, CreateView):
     model = Ordem
@@ -30,11 +31,12 @@ class OrdemDetailView(LoginRequiredMixin, DetailView):
     template_name = 'ordens/ordem_detail.html'
     context_object_name = 'ordem'
 
-class OrdemListView(LoginRequiredMixin, ListView):
+class OrdemListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Ordem
     template_name = 'ordens/ordem_list.html'
     context_object_name = 'ordens'
     paginate_by = 10
+    ordering = ['cod_ordem']
 
     def get_queryset(self):
         requisicao_id = self.kwargs['requisicao_id']
@@ -0,0 +1,70 @@
+"""
+Management command para medir a vazão (linhas/s) de cada formato de relatório
+"""
+import tempfile
+import time
+from django.core.management.base import BaseCommand, CommandError
+from apps.relatorios.services.report_service import REPORT_SPECS, ReportEngine
+
+
+class Command(BaseCommand):
+    help = 'Mede linhas/s por relatório e formato (csv, xlsx, pdf, json) e do fan-out com todos os formatos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--relatorio',
+            action='append',
+            choices=sorted(REPORT_SPECS),
+            help='Relatório a medir (pode ser repetido; padrão: todos)'
+        )
+        parser.add_argument(
+            '--formato',
+            action='append',
+            choices=sorted(ReportEngine.RENDERERS),
+            help='Formato a medir (pode ser repetido; padrão: todos os disponíveis)'
+        )
+        parser.add_argument(
+            '--repeticoes',
+            type=int,
+            default=3,
+            help='Execuções por medição; é reportada a melhor (padrão: 3)'
+        )
+
+    def handle(self, *args, **options):
+        relatorios = options['relatorio'] or sorted(REPORT_SPECS)
+        formatos = options['formato'] or [
+            formato for formato, renderer in ReportEngine.RENDERERS.items() if renderer.available
+        ]
+        repeticoes = options['repeticoes']
+        if repeticoes < 1:
+            raise CommandError('--repeticoes deve ser maior que zero')
+
+        self.stdout.write(f"{'Relatório':<12} {'Formato':<10} {'Linhas':>8} {'Tempo (s)':>10} {'Linhas/s':>12}")
+
+        for slug in relatorios:
+            spec = REPORT_SPECS[slug]
+            for formato in formatos:
+                self._medir(spec, [formato], repeticoes)
+            if len(formatos) > 1:
+                self._medir(spec, formatos, repeticoes)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark concluído'))
+
+    def _medir(self, spec, formatos, repeticoes):
+        melhor = None
+        linhas = 0
+
+        for _ in range(repeticoes):
+            saidas = {formato: tempfile.TemporaryFile() for formato in formatos}
+            try:
+                inicio = time.perf_counter()
+                linhas = ReportEngine(spec).render(saidas)
+                duracao = time.perf_counter() - inicio
+            finally:
+                for saida in saidas.values():
+                    saida.close()
+            melhor = duracao if melhor is None else min(melhor, duracao)
+
+        rotulo = formatos[0] if len(formatos) == 1 else 'fan-out'
+        vazao = linhas / melhor if melhor else 0
+        self.stdout.write(f'{spec.slug:<12} {rotulo:<10} {linhas:>8} {melhor:>10.3f} {vazao:>12,.0f}')
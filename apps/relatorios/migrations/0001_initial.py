@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-17 12:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('chave', models.CharField(max_length=64, unique=True, verbose_name='Chave de Deduplicação')),
+                ('relatorio', models.CharField(max_length=50, verbose_name='Relatório')),
+                ('formato', models.CharField(max_length=10, verbose_name='Formato')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluido', 'Concluído'), ('erro', 'Erro')], default='pendente', max_length=20, verbose_name='Status')),
+                ('arquivo', models.CharField(blank=True, max_length=255, verbose_name='Arquivo (relativo a MEDIA_ROOT)')),
+                ('content_hash', models.CharField(blank=True, max_length=64, verbose_name='Hash SHA-256 do Conteúdo')),
+                ('linhas', models.IntegerField(blank=True, null=True, verbose_name='Linhas')),
+                ('erro', models.TextField(blank=True, verbose_name='Erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Concluído em')),
+                ('solicitado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='relatorios_solicitados', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Geração de Relatório',
+                'verbose_name_plural': 'Gerações de Relatórios',
+                'db_table': 'relatorio_jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 13:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relatorios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportjob',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em'),
+        ),
+    ]
@@ -0,0 +1,95 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class ReportJob(models.Model):
+    '''
+    Geração de relatório em segundo plano (Celery).
+    Pedidos com os mesmos parâmetros e sobre a mesma versão dos dados
+    compartilham o mesmo job (campo `chave`), e portanto o mesmo arquivo.
+    '''
+
+    STATUS_PENDENTE = 'pendente'
+    STATUS_PROCESSANDO = 'processando'
+    STATUS_CONCLUIDO = 'concluido'
+    STATUS_ERRO = 'erro'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDENTE, 'Pendente'),
+        (STATUS_PROCESSANDO, 'Processando'),
+        (STATUS_CONCLUIDO, 'Concluído'),
+        (STATUS_ERRO, 'Erro'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    chave = models.CharField(
+        max_length=64,
+        unique=True,
+        verbose_name='Chave de Deduplicação'
+    )
+    relatorio = models.CharField(
+        max_length=50,
+        verbose_name='Relatório'
+    )
+    formato = models.CharField(
+        max_length=10,
+        verbose_name='Formato'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDENTE,
+        verbose_name='Status'
+    )
+    arquivo = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name='Arquivo (relativo a MEDIA_ROOT)'
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name='Hash SHA-256 do Conteúdo'
+    )
+    linhas = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Linhas'
+    )
+    erro = models.TextField(
+        blank=True,
+        verbose_name='Erro'
+    )
+    solicitado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='relatorios_solicitados',
+        verbose_name='Solicitado por'
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Criado em')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='Iniciado em')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Concluído em')
+
+    class Meta:
+        db_table = 'relatorio_jobs'
+        verbose_name = 'Geração de Relatório'
+        verbose_name_plural = 'Gerações de Relatórios'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.relatorio}.{self.formato} - {self.get_status_display()}"
+
+    @staticmethod
+    def gerar_chave(relatorio, formato, versoes):
+        """Chave de deduplicação: relatório, formato e versão dos dados de origem"""
+        partes = [relatorio, formato, '.'.join(str(versao) for versao in versoes)]
+        return hashlib.sha256('|'.join(partes).encode()).hexdigest()
+
+    @property
+    def finalizado(self):
+        return self.status in (self.STATUS_CONCLUIDO, self.STATUS_ERRO)
@@ -1,74 +1,545 @@
 # apps/relatorios/services/report_service.py
+"""
+Pipeline declarativo de relatórios.
+
+Cada relatório é descrito por um ReportSpec (colunas, queryset e totais).
+O ReportEngine lê os totais com um único aggregate() e percorre as linhas
+uma única vez (values_list + iterator), repassando cada linha a um ou mais
+renderers (csv, xlsx, pdf, json) - o mesmo dado alimenta todos os formatos.
+"""
+import csv
 import io
-from django.http import HttpResponse
-from openpyxl import Workbook
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
+import json
+import logging
+import tempfile
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from django.db.models import DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.functional import cached_property
 
 from apps.projetos.models.projeto import Projeto
+from apps.contratos.models.contrato import Contrato
+from apps.contratos.models.item_contrato import ItemContrato
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, Alignment, PatternFill
+    EXCEL_AVAILABLE = True
+except ImportError:
+    EXCEL_AVAILABLE = False
+
+try:
+    from fpdf import FPDF
+    from fpdf.enums import XPos, YPos
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+
+logger = logging.getLogger('apps')
+
+EXPORT_CHUNK_SIZE = 2000
+STREAM_BUFFER_SIZE = 64 * 1024
+
+SITUACAO_MAP = {
+    '1': 'Aguardando Início', '2': 'Em Andamento', '3': 'Paralisado',
+    '4': 'Suspenso', '5': 'Cancelado', '6': 'Concluído'
+}
+
+TIPO_PESSOA_MAP = {1: 'Pessoa Física', 2: 'Pessoa Jurídica'}
+
+
+def formatar_moeda(valor):
+    return f"R$ {valor:,.2f}" if valor else "R$ 0,00"
+
+
+def formatar_data(data):
+    return data.strftime('%d/%m/%Y') if data else 'N/A'
+
+
+def data_json(data):
+    return data.strftime('%d/%m/%Y') if data else None
+
+
+def moeda_json(valor):
+    return float(valor) if valor else 0.0
+
+
+@dataclass(frozen=True)
+class Column:
+    """Coluna de relatório: campo lido do banco e como exibi-lo em cada formato"""
+    key: str
+    header: str
+    field: str
+    display: Optional[Callable] = None
+    json: Optional[Callable] = None
+    width: int = 15
+    pdf_width: int = 25
+    pdf_max_chars: Optional[int] = None
+    align: str = 'C'
+
+    def format(self, valor):
+        return self.display(valor) if self.display else valor
+
+    def format_json(self, valor):
+        return self.json(valor) if self.json else self.format(valor)
+
+
+@dataclass(frozen=True)
+class SummaryItem:
+    key: str
+    label: str
+    value: float
+    display: str
+
+
+@dataclass
+class ReportSpec:
+    """
+    Declaração de um relatório.
+    `totals` são expressões de agregação calculadas sobre `totals_queryset`
+    (por padrão o próprio queryset); `summary` converte o resultado em
+    linhas de resumo exibidas por todos os renderers.
+    """
+    slug: str
+    title: str
+    columns: list
+    queryset: Callable
+    totals: dict = field(default_factory=dict)
+    totals_queryset: Optional[Callable] = None
+    summary: Optional[Callable] = None
+    json_rows_key: str = 'linhas'
+    pdf_font_size: int = 8
+    pdf_max_rows: Optional[int] = None
+
+    def filename(self, extension):
+        return f"relatorio_{self.slug}.{extension}"
+
+    @property
+    def fields(self):
+        return [column.field for column in self.columns]
+
+    @property
+    def headers(self):
+        return [column.header for column in self.columns]
 
-class ReportService:
+
+class BaseRenderer:
     """
-    Service para gerar relatórios em diferentes formatos.
-    Implementa o padrão Factory Method.
+    Renderer incremental: open() -> write_row() para cada linha -> close().
+    Escreve bytes em `output` (qualquer objeto com write()).
     """
-    def generate_report(self, format_type, queryset):
-        if format_type == 'excel':
-            return self._generate_excel(queryset)
-        elif format_type == 'pdf':
-            return self._generate_pdf(queryset)
+    extension = ''
+    content_type = 'application/octet-stream'
+    streamable = False
+    available = True
+
+    def __init__(self, spec, summary, output):
+        self.spec = spec
+        self.summary = summary
+        self.output = output
+        self.generated_at = timezone.now().strftime('%d/%m/%Y às %H:%M')
+
+    def open(self):
+        pass
+
+    def write_row(self, row):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class _Echo:
+    """Pseudo-buffer para csv.writer: devolve a linha formatada em vez de acumulá-la"""
+
+    def write(self, value):
+        return value
+
+
+class CsvRenderer(BaseRenderer):
+    extension = 'csv'
+    content_type = 'text/csv'
+    streamable = True
+
+    def open(self):
+        self.writer = csv.writer(_Echo())
+        if self.summary:
+            self._write([f'{self.spec.title.upper()} - FUNETEC'])
+            self._write([f'Gerado em: {self.generated_at}'])
+            self._write([])
+            self._write(['RESUMO'])
+            for item in self.summary:
+                self._write([item.label, item.display])
+            self._write([])
+        self._write(self.spec.headers)
+
+    def write_row(self, row):
+        self._write([column.format(valor) for column, valor in zip(self.spec.columns, row)])
+
+    def _write(self, values):
+        self.output.write(self.writer.writerow(values).encode('utf-8'))
+
+
+class XlsxRenderer(BaseRenderer):
+    """openpyxl em modo write-only: as linhas vão para um arquivo temporário, não para a memória"""
+    extension = 'xlsx'
+    content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    available = EXCEL_AVAILABLE
+
+    def open(self):
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet(title=self.spec.title[:31])
+
+        for indice, column in enumerate(self.spec.columns):
+            self.sheet.column_dimensions[chr(ord('A') + indice)].width = column.width
+
+        # Título e data de geração
+        self.sheet.append([self._cell(f'{self.spec.title.upper()} - FUNETEC', font=Font(bold=True, size=16))])
+        self.sheet.append([f'Gerado em: {self.generated_at}'])
+        self.sheet.append([])
+
+        if self.summary:
+            self.sheet.append([self._cell('RESUMO', font=Font(bold=True, size=12))])
+            for item in self.summary:
+                self.sheet.append([f'{item.label}: {item.display}'])
+            self.sheet.append([])
+
+        # Cabeçalhos das colunas
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color="089561", end_color="089561", fill_type="solid")
+        header_alignment = Alignment(horizontal="center")
+        self.sheet.append([
+            self._cell(header, font=header_font, fill=header_fill, alignment=header_alignment)
+            for header in self.spec.headers
+        ])
+
+    def write_row(self, row):
+        self.sheet.append([column.format(valor) for column, valor in zip(self.spec.columns, row)])
+
+    def close(self):
+        self.workbook.save(self.output)
+
+    def _cell(self, valor, **estilos):
+        cell = WriteOnlyCell(self.sheet, value=valor)
+        for atributo, estilo in estilos.items():
+            setattr(cell, atributo, estilo)
+        return cell
+
+
+class PdfRenderer(BaseRenderer):
+    """fpdf2: tabela com cabeçalho repetido a cada página"""
+    extension = 'pdf'
+    content_type = 'application/pdf'
+    available = PDF_AVAILABLE
+
+    def open(self):
+        self.rows_written = 0
+        self.pdf = FPDF()
+        self.pdf.add_page()
+        self.pdf.set_auto_page_break(auto=True, margin=15)
+
+        # Título e data de geração
+        self.pdf.set_font('helvetica', 'B', 16)
+        self.pdf.cell(0, 10, f'{self.spec.title.upper()} - FUNETEC', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+        self.pdf.set_font('helvetica', '', 10)
+        self.pdf.cell(0, 5, f'Gerado em: {self.generated_at}', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+        self.pdf.ln(10)
+
+        if self.summary:
+            self._write_summary()
+
+        self._write_header()
+
+    def _write_summary(self):
+        # Caixa de resumo, dois itens por linha
+        self.pdf.set_fill_color(248, 249, 250)
+        self.pdf.rect(10, self.pdf.get_y(), 190, 8 + 6 * ((len(self.summary) + 1) // 2) + 4, 'F')
+        self.pdf.set_font('helvetica', 'B', 12)
+        self.pdf.cell(0, 8, 'RESUMO', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+        self.pdf.set_font('helvetica', '', 10)
+        for indice, item in enumerate(self.summary):
+            self.pdf.cell(95, 6, f'{item.label}: {item.display}', border=0, align='L')
+            if indice % 2:
+                self.pdf.ln()
+        self.pdf.ln(15)
+
+    def _write_header(self):
+        self.pdf.set_font('helvetica', 'B', self.spec.pdf_font_size + 1)
+        self.pdf.set_fill_color(8, 149, 97)  # Verde FUNETEC
+        self.pdf.set_text_color(255, 255, 255)
+        for column in self.spec.columns:
+            self.pdf.cell(column.pdf_width, 8, column.header, border=1, align='C', fill=True)
+        self.pdf.ln()
+        self.pdf.set_text_color(0, 0, 0)
+        self.pdf.set_font('helvetica', '', self.spec.pdf_font_size)
+
+    def write_row(self, row):
+        if self.spec.pdf_max_rows and self.rows_written >= self.spec.pdf_max_rows:
+            return
+        self.rows_written += 1
+
+        if self.pdf.get_y() > 270:
+            self.pdf.add_page()
+            self._write_header()
+
+        for column, valor in zip(self.spec.columns, row):
+            texto = str(column.format(valor))
+            if column.pdf_max_chars and len(texto) > column.pdf_max_chars:
+                texto = texto[:column.pdf_max_chars] + '...'
+            self.pdf.cell(column.pdf_width, 6, texto, border=1, align=column.align)
+        self.pdf.ln()
+
+    def close(self):
+        self.output.write(bytes(self.pdf.output()))
+
+
+class JsonRenderer(BaseRenderer):
+    """JSON escrito incrementalmente (orjson quando disponível)"""
+    extension = 'json'
+    content_type = 'application/json'
+    streamable = True
+
+    def open(self):
+        self.first = True
+        if self.summary:
+            cabecalho = {
+                'relatorio': f'{self.spec.title} - FUNETEC',
+                'gerado_em': self.generated_at,
+                'resumo': {item.key: item.value for item in self.summary},
+            }
+            # Reabre o objeto para anexar a lista de linhas
+            self.output.write(self._dumps(cabecalho)[:-1] + f', "{self.spec.json_rows_key}": ['.encode())
         else:
+            self.output.write(b'[')
+
+    def write_row(self, row):
+        item = {column.key: column.format_json(valor) for column, valor in zip(self.spec.columns, row)}
+        self.output.write((b'' if self.first else b',') + self._dumps(item))
+        self.first = False
+
+    def close(self):
+        self.output.write(b']}' if self.summary else b']')
+
+    def _dumps(self, data):
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+class _ChunkBuffer(io.BytesIO):
+    """Buffer que é esvaziado a cada bloco enviado ao cliente"""
+
+    def drain(self):
+        data = self.getvalue()
+        self.seek(0)
+        self.truncate()
+        return data
+
+
+class ReportEngine:
+    """
+    Executa um ReportSpec: totais em um aggregate() e linhas em uma única
+    passada, distribuídas para todos os renderers pedidos.
+    """
+
+    RENDERERS = {
+        'csv': CsvRenderer,
+        'xlsx': XlsxRenderer,
+        'pdf': PdfRenderer,
+        'json': JsonRenderer,
+    }
+
+    # Formato usado quando a biblioteca do formato pedido não está instalada
+    FALLBACKS = {
+        'pdf': 'csv',
+        'xlsx': 'json',
+    }
+
+    def __init__(self, spec, chunk_size=EXPORT_CHUNK_SIZE):
+        self.spec = spec
+        self.chunk_size = chunk_size
+
+    @cached_property
+    def totals(self):
+        if not self.spec.totals:
+            return {}
+        queryset = (self.spec.totals_queryset or self.spec.queryset)()
+        return queryset.aggregate(**self.spec.totals)
+
+    @cached_property
+    def summary(self):
+        if not self.spec.summary:
+            return []
+        return self.spec.summary(self.totals)
+
+    def rows(self):
+        return (self.spec.queryset()
+                .values_list(*self.spec.fields)
+                .iterator(chunk_size=self.chunk_size))
+
+    def resolve_format(self, format_type):
+        while format_type in self.FALLBACKS and not self.RENDERERS[format_type].available:
+            format_type = self.FALLBACKS[format_type]
+        if format_type not in self.RENDERERS:
             raise ValueError("Formato de relatório não suportado")
+        return format_type
+
+    def render(self, outputs):
+        """
+        Gera vários formatos com uma única leitura das linhas.
+        `outputs` mapeia formato -> arquivo binário; retorna o número de linhas.
+        """
+        renderers = [
+            self.RENDERERS[format_type](self.spec, self.summary, output)
+            for format_type, output in outputs.items()
+        ]
+        for renderer in renderers:
+            renderer.open()
+
+        total = 0
+        for row in self.rows():
+            for renderer in renderers:
+                renderer.write_row(row)
+            total += 1
+
+        for renderer in renderers:
+            renderer.close()
+        return total
+
+    def stream(self, format_type):
+        """Gerador de blocos de bytes para formatos que podem ser enviados incrementalmente"""
+        buffer = _ChunkBuffer()
+        renderer = self.RENDERERS[format_type](self.spec, self.summary, buffer)
+
+        renderer.open()
+        yield buffer.drain()
+        for row in self.rows():
+            renderer.write_row(row)
+            if buffer.tell() >= STREAM_BUFFER_SIZE:
+                yield buffer.drain()
+        renderer.close()
+        yield buffer.drain()
+
+    def response(self, format_type):
+        """HttpResponse de download no formato pedido (com fallback de biblioteca)"""
+        format_type = self.resolve_format(format_type)
+        renderer_class = self.RENDERERS[format_type]
+
+        if renderer_class.streamable:
+            response = StreamingHttpResponse(self.stream(format_type), content_type=renderer_class.content_type)
+            response['Content-Disposition'] = f'attachment; filename="{self.spec.filename(renderer_class.extension)}"'
+            return response
+
+        arquivo = tempfile.TemporaryFile()
+        try:
+            self.render({format_type: arquivo})
+        except Exception as e:
+            arquivo.close()
+            fallback = self.FALLBACKS.get(format_type)
+            if not fallback:
+                raise
+            logger.warning(f'REPORT_FALLBACK {self.spec.slug} {format_type} -> {fallback}: {e}')
+            return self.response(fallback)
+
+        arquivo.seek(0)
+        return FileResponse(
+            arquivo,
+            as_attachment=True,
+            filename=self.spec.filename(renderer_class.extension),
+            content_type=renderer_class.content_type,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Relatórios
+# ---------------------------------------------------------------------------
+
+PROJETOS_REPORT = ReportSpec(
+    slug='projetos',
+    title='Relatório de Projetos',
+    queryset=lambda: Projeto.objects.order_by('-data_inicio'),
+    columns=[
+        Column('codigo', 'Código', 'cod_projeto'),
+        Column('nome', 'Nome', 'nome', width=30, pdf_width=60, pdf_max_chars=25),
+        Column('valor', 'Valor', 'valor', formatar_moeda, moeda_json, align='R'),
+        Column('data_inicio', 'Data Início', 'data_inicio', formatar_data, data_json),
+        Column('data_encerramento', 'Data Encerramento', 'data_encerramento', formatar_data, data_json),
+        Column('situacao', 'Situação', 'situacao', lambda s: SITUACAO_MAP.get(s, 'N/A'), width=20, pdf_width=30),
+    ],
+)
+
+CONTRATOS_REPORT = ReportSpec(
+    slug='contratos',
+    title='Relatório de Contratos',
+    queryset=lambda: Contrato.objects.order_by('-data_inicio'),
+    pdf_font_size=7,
+    columns=[
+        Column('numero', 'Número', 'num_contrato', pdf_width=20),
+        Column('contratado', 'Contratado', 'contratado', lambda c: c or 'N/A',
+               width=25, pdf_width=40, pdf_max_chars=20),
+        Column('cpf_cnpj', 'CPF/CNPJ', 'cpf_cnpj', lambda c: c or 'N/A', width=20, pdf_width=30),
+        Column('tipo', 'Tipo', 'tipo_pessoa', lambda t: TIPO_PESSOA_MAP.get(t, 'N/A'), pdf_width=20),
+        Column('valor', 'Valor', 'valor', formatar_moeda, moeda_json, align='R'),
+        Column('data_inicio', 'Data Início', 'data_inicio', formatar_data, data_json, pdf_width=20),
+        Column('data_fim', 'Data Fim', 'data_fim', formatar_data, data_json, pdf_width=20),
+        Column('situacao', 'Situação', 'situacao', lambda s: SITUACAO_MAP.get(s, 'N/A'), width=20),
+    ],
+)
+
+
+def resumo_financeiro(totais):
+    total_recebido = totais['total_recebido'] or 0
+    total_previsto = totais['total_previsto'] or 0
+    total_pendente = total_previsto - total_recebido
+    taxa_recebimento = (total_recebido / total_previsto * 100) if total_previsto > 0 else 0
+
+    return [
+        SummaryItem('total_recebido', 'Total Recebido', float(total_recebido), f'R$ {total_recebido:,.2f}'),
+        SummaryItem('total_previsto', 'Total Previsto', float(total_previsto), f'R$ {total_previsto:,.2f}'),
+        SummaryItem('total_pendente', 'Total Pendente', float(total_pendente), f'R$ {total_pendente:,.2f}'),
+        SummaryItem('taxa_recebimento', 'Taxa de Recebimento', float(taxa_recebimento), f'{taxa_recebimento:.1f}%'),
+    ]
+
+
+FINANCEIRO_REPORT = ReportSpec(
+    slug='financeiro',
+    title='Relatório Financeiro',
+    queryset=lambda: (ItemContrato.objects.filter(valor_pago__gt=0)
+                      .annotate(diferenca=Coalesce(
+                          F('valor_parcela') - F('valor_pago'), Value(0),
+                          output_field=DecimalField(max_digits=14, decimal_places=2),
+                      ))
+                      .order_by('-data_pagamento')),
+    totals_queryset=lambda: ItemContrato.objects.all(),
+    totals={
+        'total_recebido': Sum('valor_pago', filter=Q(valor_pago__gt=0)),
+        'total_previsto': Sum('valor_parcela'),
+    },
+    summary=resumo_financeiro,
+    json_rows_key='pagamentos',
+    pdf_max_rows=50,  # PDF traz os últimos 50 pagamentos
+    columns=[
+        Column('data', 'Data', 'data_pagamento', formatar_data, data_json),
+        Column('contrato', 'Contrato', 'num_contrato', lambda c: str(c) if c else 'N/A'),
+        Column('parcela', 'Parcela', 'num_parcela', lambda n: f"{n}ª parcela"),
+        Column('valor_pago', 'Valor Pago', 'valor_pago', formatar_moeda, moeda_json, align='R'),
+        Column('valor_total', 'Valor Total', 'valor_parcela', formatar_moeda, moeda_json, align='R'),
+        Column('diferenca', 'Diferença', 'diferenca', formatar_moeda, moeda_json, align='R'),
+        Column('status', 'Status', 'situacao', lambda s: 'Liquidado' if s == '3' else 'Pago Parcial', pdf_width=40),
+    ],
+)
 
-    def _generate_excel(self, queryset):
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="relatorio_projetos.xlsx"'
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Projetos"
-
-        # Cabeçalho
-        columns = ['Código', 'Nome', 'Responsável', 'Situação', 'Valor Orçado']
-        ws.append(columns)
-
-        # Dados
-        for projeto in queryset:
-            row = [
-                projeto.codProjeto,
-                projeto.nome,
-                projeto.responsavel.get_full_name(),
-                projeto.get_situacao_display(),
-                projeto.valor,
-            ]
-            ws.append(row)
-        
-        wb.save(response)
-        return response
-
-    def _generate_pdf(self, queryset):
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="relatorio_projetos.pdf"'
-
-        buffer = io.BytesIO()
-        p = canvas.Canvas(buffer, pagesize=letter)
-
-        p.drawString(inch, 10.5 * inch, "Relatório de Projetos - FUNETEC")
-        
-        y = 10 * inch
-        for projeto in queryset:
-            text = f"#{projeto.codProjeto} - {projeto.nome} (Valor: R$ {projeto.valor})"
-            p.drawString(inch, y, text)
-            y -= 0.25 * inch
-            if y < inch: # Page break
-                p.showPage()
-                y = 10.5 * inch
-
-        p.showPage()
-        p.save()
-
-        pdf = buffer.getvalue()
-        buffer.close()
-        response.write(pdf)
-        return response
\ No newline at end of file
+REPORT_SPECS = {
+    spec.slug: spec
+    for spec in (PROJETOS_REPORT, CONTRATOS_REPORT, FINANCEIRO_REPORT)
+}
@@ -0,0 +1,110 @@
+import hashlib
+import logging
+import os
+import tempfile
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.cache import get_versions
+from apps.relatorios.models import ReportJob
+from apps.relatorios.services.report_service import REPORT_SPECS, ReportEngine
+
+logger = logging.getLogger('apps')
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def reports_dir():
+    return os.path.join(settings.MEDIA_ROOT, settings.REPORTS_DIR)
+
+
+def job_travado(job):
+    """Job em 'processando' além de REPORT_JOB_STALE_TIMEOUT: o worker morreu no meio"""
+    limite = timezone.now() - timedelta(seconds=settings.REPORT_JOB_STALE_TIMEOUT)
+    return job.status == ReportJob.STATUS_PROCESSANDO and (job.started_at is None or job.started_at < limite)
+
+
+def solicitar_relatorio(relatorio, formato, user=None):
+    """
+    Retorna o job do relatório pedido, criando-o (e enfileirando a geração)
+    apenas se não existir um job para os mesmos parâmetros e versão dos dados.
+    """
+    formato = ReportEngine(REPORT_SPECS[relatorio]).resolve_format(formato)
+    chave = ReportJob.gerar_chave(relatorio, formato, get_versions())
+
+    with transaction.atomic():
+        job, criado = ReportJob.objects.select_for_update().get_or_create(
+            chave=chave,
+            defaults={
+                'relatorio': relatorio,
+                'formato': formato,
+                'solicitado_por': user if user and user.is_authenticated else None,
+            }
+        )
+        # Falha anterior, worker perdido ou arquivo removido: gera novamente com o mesmo job
+        reenfileirar = job.status == ReportJob.STATUS_ERRO or job_travado(job) or (
+            job.status == ReportJob.STATUS_CONCLUIDO
+            and not os.path.exists(os.path.join(settings.MEDIA_ROOT, job.arquivo))
+        )
+        if reenfileirar:
+            job.status = ReportJob.STATUS_PENDENTE
+            job.erro = ''
+            job.save(update_fields=['status', 'erro'])
+
+        if criado or reenfileirar:
+            transaction.on_commit(lambda: gerar_relatorio.delay(str(job.pk)))
+
+    return job
+
+
+@shared_task
+def gerar_relatorio(job_id):
+    """Renderiza o relatório em MEDIA_ROOT/reports/<sha256>.<ext>"""
+    atualizados = ReportJob.objects.filter(
+        pk=job_id, status=ReportJob.STATUS_PENDENTE
+    ).update(status=ReportJob.STATUS_PROCESSANDO, started_at=timezone.now())
+    if not atualizados:
+        # Outro worker já processou (ou está processando) este job
+        return
+
+    job = ReportJob.objects.get(pk=job_id)
+    engine = ReportEngine(REPORT_SPECS[job.relatorio])
+    extensao = engine.RENDERERS[job.formato].extension
+    destino = reports_dir()
+    os.makedirs(destino, exist_ok=True)
+
+    temporario = tempfile.NamedTemporaryFile(dir=destino, suffix='.tmp', delete=False)
+    try:
+        with temporario:
+            linhas = engine.render({job.formato: temporario})
+
+        sha256 = hashlib.sha256()
+        with open(temporario.name, 'rb') as arquivo:
+            for bloco in iter(lambda: arquivo.read(HASH_CHUNK_SIZE), b''):
+                sha256.update(bloco)
+        content_hash = sha256.hexdigest()
+
+        # Conteúdo idêntico reaproveita o arquivo existente
+        nome = f'{content_hash}.{extensao}'
+        os.replace(temporario.name, os.path.join(destino, nome))
+    except Exception as e:
+        if os.path.exists(temporario.name):
+            os.remove(temporario.name)
+        logger.error(f'REPORT_JOB_ERROR {job.pk} {job.relatorio}.{job.formato}: {e}')
+        ReportJob.objects.filter(pk=job.pk).update(
+            status=ReportJob.STATUS_ERRO, erro=str(e), finished_at=timezone.now()
+        )
+        return
+
+    ReportJob.objects.filter(pk=job.pk).update(
+        status=ReportJob.STATUS_CONCLUIDO,
+        arquivo=os.path.join(settings.REPORTS_DIR, nome),
+        content_hash=content_hash,
+        linhas=linhas,
+        finished_at=timezone.now(),
+    )
+    logger.info(f'REPORT_JOB_DONE {job.pk} {job.relatorio}.{job.formato} - {linhas} linhas')
@@ -0,0 +1,78 @@
+import io
+import json
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from datetime import date
+from decimal import Decimal
+from openpyxl import load_workbook
+from apps.contratos.models import Contrato, ItemContrato
+from apps.relatorios.services.report_service import FINANCEIRO_REPORT, ReportEngine
+
+
+class ReportExportTest(TestCase):
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(username='relatorios', email='r@funetec.br', password='x')
+        self.client.force_login(user)
+
+        contrato = Contrato.objects.create(
+            num_contrato='0001/2025', cod_ordem=1, descricao='Contrato', tipo_pessoa=2,
+            data_inicio=date(2025, 1, 1), valor=Decimal('2000.00'), situacao='2',
+        )
+        for numero in range(1, 4):
+            ItemContrato.objects.create(
+                num_contrato=contrato, cod_lancamento=numero, num_parcela=numero,
+                data_lancamento=date(2025, 1, 1), data_vencimento=date(2025, numero, 10),
+                valor_parcela=Decimal('500.00'), valor_pago=Decimal('500.00') if numero < 3 else 0,
+                data_pagamento=date(2025, numero, 12) if numero < 3 else None, situacao='3' if numero < 3 else '1',
+            )
+
+    def _download(self, nome, formato):
+        response = self.client.get(reverse(f'relatorios:{nome}'), {'format': formato})
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_excel_streaming(self):
+        for nome in ('relatorio_projetos_generate', 'relatorio_contratos_generate', 'relatorio_financeiro_generate'):
+            workbook = load_workbook(io.BytesIO(self._download(nome, 'excel')))
+            self.assertTrue(workbook.active['A1'].value.endswith('FUNETEC'))
+
+        linhas = list(workbook.active.iter_rows(values_only=True))
+        self.assertEqual(linhas[-2][:2], ('12/02/2025', '0001/2025'))
+        self.assertEqual(len([linha for linha in linhas if linha[-1] == 'Liquidado']), 2)
+
+    def test_csv_e_json(self):
+        conteudo = self._download('relatorio_financeiro_generate', 'csv').decode()
+        self.assertIn('Total Recebido,"R$ 1,000.00"', conteudo)
+        self.assertIn('12/02/2025,0001/2025,2ª parcela', conteudo)
+
+        dados = json.loads(self._download('relatorio_financeiro_generate', 'json'))
+        self.assertEqual(dados['resumo']['total_previsto'], 1500.0)
+        self.assertEqual([p['data'] for p in dados['pagamentos']], ['12/02/2025', '12/01/2025'])
+
+        contratos = json.loads(self._download('relatorio_contratos_generate', 'json'))
+        self.assertEqual(contratos[0]['tipo'], 'Pessoa Jurídica')
+
+    def test_financeiro_com_diferenca(self):
+        ItemContrato.objects.filter(num_parcela=3).update(
+            valor_pago=Decimal('200.00'), data_pagamento=date(2025, 3, 12), situacao='2',
+        )
+
+        dados = json.loads(self._download('relatorio_financeiro_generate', 'json'))
+        self.assertEqual([p['diferenca'] for p in dados['pagamentos']], [300.0, 0.0, 0.0])
+        self.assertIn('Diferença', self._download('relatorio_financeiro_generate', 'csv').decode())
+
+    def test_pdf(self):
+        conteudo = self._download('relatorio_projetos_generate', 'pdf')
+        self.assertTrue(conteudo.startswith(b'%PDF'))
+
+    def test_fan_out_le_dados_uma_vez(self):
+        saidas = {formato: io.BytesIO() for formato in ReportEngine.RENDERERS}
+
+        # Uma consulta para os totais e uma para as linhas, para todos os formatos
+        with self.assertNumQueries(2):
+            total = ReportEngine(FINANCEIRO_REPORT).render(saidas)
+
+        self.assertEqual(total, 2)
+        self.assertTrue(all(saida.getvalue() for saida in saidas.values()))
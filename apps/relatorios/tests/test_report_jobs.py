@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from datetime import date, timedelta
+from decimal import Decimal
+from apps.contratos.models import Contrato
+from apps.core.cache import get_versions
+from apps.relatorios.models import ReportJob
+
+
+class ReportJobTest(TestCase):
+    """Executa com CELERY_TASK_ALWAYS_EAGER (padrão sem broker configurado)"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        user = get_user_model().objects.create_user(username='relatorios', email='r@funetec.br', password='x')
+        self.client.force_login(user)
+
+    def _solicitar(self, formato='pdf'):
+        url = reverse('relatorios:relatorio_financeiro_generate')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(url, {'format': formato, 'async': '1'})
+        self.assertEqual(response.status_code, 202)
+        return response.json()
+
+    def test_gera_e_deduplica(self):
+        primeiro = self._solicitar()
+        segundo = self._solicitar()
+
+        self.assertEqual(primeiro['id'], segundo['id'])
+        self.assertEqual(ReportJob.objects.count(), 1)
+
+        status = self.client.get(primeiro['status_url']).json()
+        self.assertEqual(status['status'], ReportJob.STATUS_CONCLUIDO)
+
+        job = ReportJob.objects.get()
+        self.assertEqual(job.arquivo, os.path.join('reports', f'{job.content_hash}.pdf'))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, job.arquivo)))
+
+        download = self.client.get(status['download_url'])
+        self.assertTrue(b''.join(download.streaming_content).startswith(b'%PDF'))
+
+    def test_alteracao_nos_dados_gera_novo_job(self):
+        primeiro = self._solicitar('csv')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Contrato.objects.create(
+                num_contrato='0001/2025', cod_ordem=1, descricao='Contrato', tipo_pessoa=1,
+                data_inicio=date(2025, 1, 1), valor=Decimal('1000.00'), situacao='1',
+            )
+        segundo = self._solicitar('csv')
+
+        self.assertNotEqual(primeiro['id'], segundo['id'])
+        self.assertEqual(ReportJob.objects.filter(status=ReportJob.STATUS_CONCLUIDO).count(), 2)
+
+    @override_settings(REPORT_JOB_STALE_TIMEOUT=600)
+    def test_job_travado_em_processando_e_reenfileirado(self):
+        job = ReportJob.objects.create(
+            chave=ReportJob.gerar_chave('financeiro', 'csv', get_versions()), relatorio='financeiro',
+            formato='csv', status=ReportJob.STATUS_PROCESSANDO, started_at=timezone.now(),
+        )
+
+        # Ainda dentro do prazo: outro worker pode estar gerando
+        self.assertEqual(self._solicitar('csv')['status'], ReportJob.STATUS_PROCESSANDO)
+
+        ReportJob.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(seconds=601))
+        self.assertEqual(self._solicitar('csv')['id'], str(job.pk))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ReportJob.STATUS_CONCLUIDO)
+        self.assertEqual(ReportJob.objects.count(), 1)
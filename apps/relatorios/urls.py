@@ -18,6 +18,10 @@ urlpatterns = [
     path('financeiro/', report_views.RelatorioFinanceiroView.as_view(), name='relatorio_financeiro'),
     path('financeiro/generate/', report_views.RelatorioFinanceiroGenerateView.as_view(), name='relatorio_financeiro_generate'),
     
+    # Relatórios gerados em segundo plano
+    path('jobs/<uuid:pk>/', report_views.RelatorioJobStatusView.as_view(), name='relatorio_job_status'),
+    path('jobs/<uuid:pk>/download/', report_views.RelatorioJobDownloadView.as_view(), name='relatorio_job_download'),
+    
     # Relatórios Personalizados
     path('custom/', report_views.RelatorioCustomView.as_view(), name='relatorio_custom'),
     path('custom/generate/', report_views.RelatorioCustomGenerateView.as_view(), name='relatorio_custom_generate'),
@@ -1,51 +1,24 @@
 from django.views.generic import TemplateView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponse, JsonResponse
-from django.shortcuts import redirect
-from django.db.models import Sum, Count, Q
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
+from django.db.models import Sum, F
 from django.utils import timezone
 from django.contrib import messages
-from datetime import datetime, timedelta
 from apps.projetos.models.projeto import Projeto
 from apps.contratos.models.contrato import Contrato
 from apps.contratos.models.item_contrato import ItemContrato
+from apps.contratos.models.monthly_rollup import MonthlyFinancialRollup
+from apps.relatorios.models import ReportJob
+from apps.relatorios.services.report_service import (
+    CONTRATOS_REPORT, FINANCEIRO_REPORT, PROJETOS_REPORT, REPORT_SPECS, ReportEngine,
+)
+from apps.relatorios.tasks import solicitar_relatorio
 
-# Para geração de arquivos
-import io
-import csv
-import json
+import os
 
-# PDF generation
-try:
-    from fpdf import FPDF
-    PDF_AVAILABLE = True
-    PDF_LIBRARY = 'fpdf'
-except ImportError:
-    try:
-        from weasyprint import HTML, CSS
-        from django.template.loader import render_to_string
-        PDF_AVAILABLE = True
-        PDF_LIBRARY = 'weasyprint'
-    except ImportError:
-        try:
-            from reportlab.lib import colors
-            from reportlab.lib.pagesizes import letter, A4
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            PDF_AVAILABLE = True
-            PDF_LIBRARY = 'reportlab'
-        except ImportError:
-            PDF_AVAILABLE = False
-            PDF_LIBRARY = None
-
-# Excel generation
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, PatternFill
-    EXCEL_AVAILABLE = True
-except ImportError:
-    EXCEL_AVAILABLE = False
 
 class RelatorioListView(LoginRequiredMixin, TemplateView):
     template_name = 'relatorios/relatorio_list.html'
@@ -88,246 +61,81 @@ class RelatorioProjetosView(LoginRequiredMixin, TemplateView):
         
         return context
 
-class RelatorioProjetosGenerateView(LoginRequiredMixin, View):
-    def get(self, request, *args, **kwargs):
-        format_type = request.GET.get('format', 'html')
-        
-        if format_type == 'pdf':
-            return self.generate_pdf()
-        elif format_type == 'excel':
-            return self.generate_excel()
-        else:
-            return redirect('relatorios:relatorio_projetos')
+class RelatorioGenerateView(LoginRequiredMixin, View):
+    """
+    Download de relatório declarado por um ReportSpec.
+    O formato vem de ?format= (pdf, excel, csv ou json); com ?async=1 a
+    geração é enfileirada no Celery e a resposta traz a URL de status.
+    """
+    spec = None
+    redirect_url = None
+    
+    FORMATOS = {
+        'pdf': 'pdf',
+        'excel': 'xlsx',
+        'csv': 'csv',
+        'json': 'json',
+    }
     
-    def generate_pdf(self):
-        if not PDF_AVAILABLE:
-            # Fallback para CSV se PDF não estiver disponível
-            return self.generate_csv_fallback()
-            
-        if PDF_LIBRARY == 'fpdf':
-            return self.generate_pdf_fpdf()
-        else:
-            # Fallback para CSV se não conseguir gerar PDF
-            return self.generate_csv_fallback()
-    
-    def generate_pdf_fpdf(self):
-        # Gerar PDF para relatório de projetos usando FPDF
-        try:
-            from fpdf import FPDF
-            from fpdf.enums import XPos, YPos
-            
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_auto_page_break(auto=True, margin=15)
-            
-            # Título
-            pdf.set_font('helvetica', 'B', 16)
-            pdf.cell(0, 10, 'RELATÓRIO DE PROJETOS - FUNETEC', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-            
-            # Data de geração
-            pdf.set_font('helvetica', '', 10)
-            pdf.cell(0, 5, f'Gerado em: {timezone.now().strftime("%d/%m/%Y às %H:%M")}', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-            pdf.ln(10)
-            
-            # Cabeçalho da tabela
-            pdf.set_font('helvetica', 'B', 9)
-            pdf.set_fill_color(8, 149, 97)  # Verde FUNETEC
-            pdf.set_text_color(255, 255, 255)  # Texto branco
-            
-            # Larguras das colunas
-            col_widths = [25, 60, 25, 25, 25, 30]
-            headers = ['Código', 'Nome', 'Valor', 'Data Início', 'Data Fim', 'Situação']
-            
-            for i, header in enumerate(headers):
-                pdf.cell(col_widths[i], 8, header, border=1, align='C', fill=True)
-            pdf.ln()
-            
-            # Dados dos projetos
-            projetos = Projeto.objects.all().order_by('-data_inicio')
-            
-            situacao_map = {
-                '1': 'Aguardando Início', '2': 'Em Andamento', '3': 'Paralisado',
-                '4': 'Suspenso', '5': 'Cancelado', '6': 'Concluído'
-            }
-            
-            pdf.set_text_color(0, 0, 0)  # Texto preto
-            pdf.set_font('helvetica', '', 8)
-            
-            for projeto in projetos:
-                # Verificar se precisa de nova página
-                if pdf.get_y() > 270:
-                    pdf.add_page()
-                    # Repetir cabeçalho
-                    pdf.set_font('helvetica', 'B', 9)
-                    pdf.set_fill_color(8, 149, 97)
-                    pdf.set_text_color(255, 255, 255)
-                    for i, header in enumerate(headers):
-                        pdf.cell(col_widths[i], 8, header, border=1, align='C', fill=True)
-                    pdf.ln()
-                    pdf.set_text_color(0, 0, 0)
-                    pdf.set_font('helvetica', '', 8)
-                
-                # Dados da linha
-                nome = projeto.nome[:25] + '...' if len(projeto.nome) > 25 else projeto.nome
-                valor = f"R$ {projeto.valor:,.2f}" if projeto.valor else "R$ 0,00"
-                data_inicio = projeto.data_inicio.strftime('%d/%m/%Y') if projeto.data_inicio else 'N/A'
-                data_fim = projeto.data_encerramento.strftime('%d/%m/%Y') if projeto.data_encerramento else 'N/A'
-                situacao = situacao_map.get(projeto.situacao, 'N/A')
-                
-                row_data = [projeto.cod_projeto, nome, valor, data_inicio, data_fim, situacao]
-                
-                for i, data in enumerate(row_data):
-                    align = 'R' if i == 2 else 'C'  # Valor alinhado à direita
-                    pdf.cell(col_widths[i], 6, str(data), border=1, align=align)
-                pdf.ln()
-            
-            # Gerar o PDF (método correto para fpdf2)
-            pdf_output = pdf.output()
-            if isinstance(pdf_output, (bytearray, bytes)):
-                pdf_bytes = bytes(pdf_output)
-            else:
-                pdf_bytes = pdf_output.encode('latin-1')
-            
-            response = HttpResponse(pdf_bytes, content_type='application/pdf')
-            response['Content-Disposition'] = 'attachment; filename="relatorio_projetos.pdf"'
-            
-            return response
-            
-        except Exception as e:
-            # Se falhar a geração de PDF, usar fallback CSV
-            return self.generate_csv_fallback()
-    
-    def generate_csv_fallback(self):
-        # Fallback CSV se PDF não funcionar
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="relatorio_projetos.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Código', 'Nome', 'Valor', 'Data Início', 'Data Encerramento', 'Situação'])
-        
-        projetos = Projeto.objects.all().order_by('-data_inicio')
-        
-        situacao_map = {
-            '1': 'Aguardando Início', '2': 'Em Andamento', '3': 'Paralisado',
-            '4': 'Suspenso', '5': 'Cancelado', '6': 'Concluído'
-        }
-        
-        for projeto in projetos:
-            writer.writerow([
-                projeto.cod_projeto,
-                projeto.nome,
-                f"R$ {projeto.valor:,.2f}" if projeto.valor else "R$ 0,00",
-                projeto.data_inicio.strftime('%d/%m/%Y') if projeto.data_inicio else 'N/A',
-                projeto.data_encerramento.strftime('%d/%m/%Y') if projeto.data_encerramento else 'N/A',
-                situacao_map.get(projeto.situacao, 'N/A')
-            ])
-        
-        return response
-    
-    def generate_excel(self):
-        if not EXCEL_AVAILABLE:
-            # Fallback para JSON se Excel não estiver disponível
-            return self.generate_json_fallback()
-            
-        # Gerar Excel para relatório de projetos
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Relatório de Projetos"
-        
-        # Estilo do cabeçalho
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="089561", end_color="089561", fill_type="solid")
-        header_alignment = Alignment(horizontal="center")
-        
-        # Título
-        ws.merge_cells('A1:F1')
-        ws['A1'] = "RELATÓRIO DE PROJETOS - FUNETEC"
-        ws['A1'].font = Font(bold=True, size=16)
-        ws['A1'].alignment = Alignment(horizontal="center")
-        
-        # Data de geração
-        ws.merge_cells('A2:F2')
-        ws['A2'] = f"Gerado em: {timezone.now().strftime('%d/%m/%Y às %H:%M')}"
-        ws['A2'].alignment = Alignment(horizontal="center")
-        
-        # Cabeçalhos das colunas
-        headers = ['Código', 'Nome', 'Valor', 'Data Início', 'Data Encerramento', 'Situação']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=4, column=col)
-            cell.value = header
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # Dados dos projetos
-        projetos = Projeto.objects.all().order_by('-data_inicio')
-        
-        situacao_map = {
-            '1': 'Aguardando Início', '2': 'Em Andamento', '3': 'Paralisado',
-            '4': 'Suspenso', '5': 'Cancelado', '6': 'Concluído'
-        }
-        
-        for row, projeto in enumerate(projetos, 5):
-            ws.cell(row=row, column=1, value=projeto.cod_projeto)
-            ws.cell(row=row, column=2, value=projeto.nome)
-            ws.cell(row=row, column=3, value=f"R$ {projeto.valor:,.2f}" if projeto.valor else "R$ 0,00")
-            ws.cell(row=row, column=4, value=projeto.data_inicio.strftime('%d/%m/%Y') if projeto.data_inicio else 'N/A')
-            ws.cell(row=row, column=5, value=projeto.data_encerramento.strftime('%d/%m/%Y') if projeto.data_encerramento else 'N/A')
-            ws.cell(row=row, column=6, value=situacao_map.get(projeto.situacao, 'N/A'))
-        
-        # Ajustar largura das colunas
-        column_widths = {
-            'A': 15,  # Código
-            'B': 30,  # Nome 
-            'C': 15,  # Valor
-            'D': 15,  # Data Início
-            'E': 15,  # Data Encerramento
-            'F': 20   # Situação
-        }
-        
-        for col_letter, width in column_widths.items():
-            ws.column_dimensions[col_letter].width = width
+    def get(self, request, *args, **kwargs):
+        format_type = self.FORMATOS.get(request.GET.get('format', 'html'))
         
-        # Salvar em buffer
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
+        if not format_type:
+            return redirect(self.redirect_url)
         
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = 'attachment; filename="relatorio_projetos.xlsx"'
+        if request.GET.get('async') in ('1', 'true'):
+            job = solicitar_relatorio(self.spec.slug, format_type, request.user)
+            return JsonResponse(job_payload(job), status=202)
         
-        return response
+        return ReportEngine(self.spec).response(format_type)
+
+
+def job_payload(job):
+    """Representação JSON do job para polling"""
+    return {
+        'id': str(job.pk),
+        'relatorio': job.relatorio,
+        'formato': job.formato,
+        'status': job.status,
+        'linhas': job.linhas,
+        'erro': job.erro or None,
+        'status_url': reverse('relatorios:relatorio_job_status', args=[job.pk]),
+        'download_url': (
+            reverse('relatorios:relatorio_job_download', args=[job.pk])
+            if job.status == ReportJob.STATUS_CONCLUIDO else None
+        ),
+    }
+
+
+class RelatorioJobStatusView(LoginRequiredMixin, View):
+    """Status de um relatório gerado em segundo plano"""
     
-    def generate_json_fallback(self):
-        # Fallback JSON se Excel não funcionar
-        projetos = Projeto.objects.all().order_by('-data_inicio')
-        
-        situacao_map = {
-            '1': 'Aguardando Início', '2': 'Em Andamento', '3': 'Paralisado',
-            '4': 'Suspenso', '5': 'Cancelado', '6': 'Concluído'
-        }
-        
-        data = []
-        for projeto in projetos:
-            data.append({
-                'codigo': projeto.cod_projeto,
-                'nome': projeto.nome,
-                'valor': float(projeto.valor) if projeto.valor else 0.0,
-                'data_inicio': projeto.data_inicio.strftime('%d/%m/%Y') if projeto.data_inicio else None,
-                'data_encerramento': projeto.data_encerramento.strftime('%d/%m/%Y') if projeto.data_encerramento else None,
-                'situacao': situacao_map.get(projeto.situacao, 'N/A')
-            })
-        
-        response = HttpResponse(
-            json.dumps(data, indent=2, ensure_ascii=False),
-            content_type='application/json'
+    def get(self, request, pk, *args, **kwargs):
+        job = get_object_or_404(ReportJob, pk=pk)
+        return JsonResponse(job_payload(job))
+
+
+class RelatorioJobDownloadView(LoginRequiredMixin, View):
+    """Download do arquivo de um relatório concluído"""
+    
+    def get(self, request, pk, *args, **kwargs):
+        job = get_object_or_404(ReportJob, pk=pk, status=ReportJob.STATUS_CONCLUIDO)
+        caminho = os.path.join(settings.MEDIA_ROOT, job.arquivo)
+        if not os.path.exists(caminho):
+            raise Http404("Arquivo do relatório não encontrado")
+        
+        renderer = ReportEngine.RENDERERS[job.formato]
+        return FileResponse(
+            open(caminho, 'rb'),
+            as_attachment=True,
+            filename=REPORT_SPECS[job.relatorio].filename(renderer.extension),
+            content_type=renderer.content_type,
         )
-        response['Content-Disposition'] = 'attachment; filename="relatorio_projetos.json"'
-        
-        return response
+
+
+class RelatorioProjetosGenerateView(RelatorioGenerateView):
+    spec = PROJETOS_REPORT
+    redirect_url = 'relatorios:relatorio_projetos'
 
 class RelatorioContratosView(LoginRequiredMixin, TemplateView):
     template_name = 'relatorios/relatorio_contratos.html'
@@ -360,331 +168,9 @@ class RelatorioContratosView(LoginRequiredMixin, TemplateView):
         
         return context
 
-class RelatorioContratosGenerateView(LoginRequiredMixin, View):
-    def get(self, request, *args, **kwargs):
-        format_type = request.GET.get('format', 'html')
-        
-        if format_type == 'pdf':
-            return self.generate_pdf()
-        elif format_type == 'excel':
-            return self.generate_excel()
-        else:
-            return redirect('relatorios:relatorio_contratos')
-    
-    def generate_pdf(self):
-        if not PDF_AVAILABLE:
-            # Fallback para CSV se PDF não estiver disponível
-            return self.generate_csv_fallback()
-            
-        if PDF_LIBRARY == 'fpdf':
-            return self.generate_pdf_fpdf()
-        else:
-            # Fallback para CSV se não conseguir gerar PDF
-            return self.generate_csv_fallback()
-    
-    def generate_pdf_fpdf(self):
-        # Gerar PDF para relatório de contratos usando FPDF
-        try:
-            from fpdf import FPDF
-            from fpdf.enums import XPos, YPos
-            
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_auto_page_break(auto=True, margin=15)
-            
-            # Título
-            pdf.set_font('helvetica', 'B', 16)
-            pdf.cell(0, 10, 'RELATÓRIO DE CONTRATOS - FUNETEC', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-            
-            # Data de geração
-            pdf.set_font('helvetica', '', 10)
-            pdf.cell(0, 5, f'Gerado em: {timezone.now().strftime("%d/%m/%Y às %H:%M")}', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-            pdf.ln(10)
-            
-            # Cabeçalho da tabela
-            pdf.set_font('helvetica', 'B', 8)
-            pdf.set_fill_color(8, 149, 97)  # Verde FUNETEC
-            pdf.set_text_color(255, 255, 255)  # Texto branco
-            
-            # Larguras das colunas
-            col_widths = [20, 40, 30, 20, 25, 20, 20, 25]
-            headers = ['Número', 'Contratado', 'CPF/CNPJ', 'Tipo', 'Valor', 'Data Início', 'Data Fim', 'Situação']
-            
-            for i, header in enumerate(headers):
-                pdf.cell(col_widths[i], 8, header, border=1, align='C', fill=True)
-            pdf.ln()
-            
-            # Dados dos contratos
-            contratos = Contrato.objects.all().order_by('-data_inicio')
-            
-            situacao_map = {
-                '1': 'Aguardando Início', '2': 'Em Andamento', '3': 'Paralisado',
-                '4': 'Suspenso', '5': 'Cancelado', '6': 'Concluído'
-            }
-            
-            pdf.set_text_color(0, 0, 0)  # Texto preto
-            pdf.set_font('helvetica', '', 7)
-            
-            for contrato in contratos:
-                # Verificar se precisa de nova página
-                if pdf.get_y() > 270:
-                    pdf.add_page()
-                    # Repetir cabeçalho
-                    pdf.set_font('helvetica', 'B', 8)
-                    pdf.set_fill_color(8, 149, 97)
-                    pdf.set_text_color(255, 255, 255)
-                    for i, header in enumerate(headers):
-                        pdf.cell(col_widths[i], 8, header, border=1, align='C', fill=True)
-                    pdf.ln()
-                    pdf.set_text_color(0, 0, 0)
-                    pdf.set_font('helvetica', '', 7)
-                
-                # Dados da linha
-                contratado = (contrato.contratado or 'N/A')[:20] + '...' if len(contrato.contratado or '') > 20 else (contrato.contratado or 'N/A')
-                cpf_cnpj = contrato.cpf_cnpj or 'N/A'
-                tipo = 'PF' if contrato.tipo_pessoa == 1 else 'PJ' if contrato.tipo_pessoa == 2 else 'N/A'
-                valor = f"R$ {contrato.valor:,.0f}" if contrato.valor else "R$ 0"
-                data_inicio = contrato.data_inicio.strftime('%d/%m/%Y') if contrato.data_inicio else 'N/A'
-                data_fim = contrato.data_fim.strftime('%d/%m/%Y') if contrato.data_fim else 'N/A'
-                situacao = situacao_map.get(contrato.situacao, 'N/A')
-                
-                row_data = [contrato.num_contrato, contratado, cpf_cnpj, tipo, valor, data_inicio, data_fim, situacao]
-                
-                for i, data in enumerate(row_data):
-                    align = 'R' if i == 4 else 'C'  # Valor alinhado à direita
-                    pdf.cell(col_widths[i], 6, str(data), border=1, align=align)
-                pdf.ln()
-            
-            # Gerar o PDF (método correto para fpdf2)
-            pdf_output = pdf.output()
-            if isinstance(pdf_output, (bytearray, bytes)):
-                pdf_bytes = bytes(pdf_output)
-            else:
-                pdf_bytes = pdf_output.encode('latin-1')
-            
-            response = HttpResponse(pdf_bytes, content_type='application/pdf')
-            response['Content-Disposition'] = 'attachment; filename="relatorio_contratos.pdf"'
-            
-            return response
-            
-        except Exception as e:
-            # Se falhar a geração de PDF, usar fallback CSV
-            return self.generate_csv_fallback()
-    
-    def generate_old_pdf(self):
-        # Implementação antiga com reportlab (não funciona)
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        
-        # Estilos
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-        
-        # Elementos do documento
-        elements = []
-        
-        # Título
-        title = Paragraph("RELATÓRIO DE CONTRATOS - FUNETEC", title_style)
-        elements.append(title)
-        
-        # Data de geração
-        date_text = f"Gerado em: {timezone.now().strftime('%d/%m/%Y às %H:%M')}"
-        date_para = Paragraph(date_text, styles['Normal'])
-        elements.append(date_para)
-        elements.append(Spacer(1, 20))
-        
-        # Dados dos contratos
-        contratos = Contrato.objects.all().order_by('-data_inicio')
-        
-        situacao_map = {
-            '1': 'Aguardando Início', '2': 'Em Andamento', '3': 'Paralisado',
-            '4': 'Suspenso', '5': 'Cancelado', '6': 'Concluído'
-        }
-        
-        # Tabela de dados
-        data = [['Número', 'Contratado', 'CPF/CNPJ', 'Tipo', 'Valor', 'Data Início', 'Data Fim', 'Situação']]
-        
-        for contrato in contratos:
-            data.append([
-                contrato.num_contrato,
-                contrato.contratado or 'N/A',
-                contrato.cpf_cnpj or 'N/A',
-                'Pessoa Física' if contrato.tipo_pessoa == 1 else 'Pessoa Jurídica' if contrato.tipo_pessoa == 2 else 'N/A',
-                f"R$ {contrato.valor:,.2f}" if contrato.valor else "R$ 0,00",
-                contrato.data_inicio.strftime('%d/%m/%Y') if contrato.data_inicio else 'N/A',
-                contrato.data_fim.strftime('%d/%m/%Y') if contrato.data_fim else 'N/A',
-                situacao_map.get(contrato.situacao, 'N/A')
-            ])
-        
-        # Criar tabela
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#089561')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        
-        # Construir PDF
-        doc.build(elements)
-        
-        buffer.seek(0)
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="relatorio_contratos.pdf"'
-        
-        return response
-    
-    def generate_csv_fallback(self):
-        # Fallback CSV se PDF não funcionar
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="relatorio_contratos.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Número', 'Contratado', 'CPF/CNPJ', 'Tipo', 'Valor', 'Data Início', 'Data Fim', 'Situação'])
-        
-        contratos = Contrato.objects.all().order_by('-data_inicio')
-        
-        situacao_map = {
-            '1': 'Aguardando Início', '2': 'Em Andamento', '3': 'Paralisado',
-            '4': 'Suspenso', '5': 'Cancelado', '6': 'Concluído'
-        }
-        
-        for contrato in contratos:
-            writer.writerow([
-                contrato.num_contrato,
-                contrato.contratado or 'N/A',
-                contrato.cpf_cnpj or 'N/A',
-                'Pessoa Física' if contrato.tipo_pessoa == 1 else 'Pessoa Jurídica' if contrato.tipo_pessoa == 2 else 'N/A',
-                f"R$ {contrato.valor:,.2f}" if contrato.valor else "R$ 0,00",
-                contrato.data_inicio.strftime('%d/%m/%Y') if contrato.data_inicio else 'N/A',
-                contrato.data_fim.strftime('%d/%m/%Y') if contrato.data_fim else 'N/A',
-                situacao_map.get(contrato.situacao, 'N/A')
-            ])
-        
-        return response
-    
-    def generate_excel(self):
-        if not EXCEL_AVAILABLE:
-            # Fallback para JSON se Excel não estiver disponível
-            return self.generate_json_fallback()
-            
-        # Gerar Excel para relatório de contratos
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Relatório de Contratos"
-        
-        # Estilo do cabeçalho
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="089561", end_color="089561", fill_type="solid")
-        header_alignment = Alignment(horizontal="center")
-        
-        # Título
-        ws.merge_cells('A1:H1')
-        ws['A1'] = "RELATÓRIO DE CONTRATOS - FUNETEC"
-        ws['A1'].font = Font(bold=True, size=16)
-        ws['A1'].alignment = Alignment(horizontal="center")
-        
-        # Data de geração
-        ws.merge_cells('A2:H2')
-        ws['A2'] = f"Gerado em: {timezone.now().strftime('%d/%m/%Y às %H:%M')}"
-        ws['A2'].alignment = Alignment(horizontal="center")
-        
-        # Cabeçalhos das colunas
-        headers = ['Número', 'Contratado', 'CPF/CNPJ', 'Tipo', 'Valor', 'Data Início', 'Data Fim', 'Situação']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=4, column=col)
-            cell.value = header
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # Dados dos contratos
-        contratos = Contrato.objects.all().order_by('-data_inicio')
-        
-        situacao_map = {
-            '1': 'Aguardando Início', '2': 'Em Andamento', '3': 'Paralisado',
-            '4': 'Suspenso', '5': 'Cancelado', '6': 'Concluído'
-        }
-        
-        for row, contrato in enumerate(contratos, 5):
-            ws.cell(row=row, column=1, value=contrato.num_contrato)
-            ws.cell(row=row, column=2, value=contrato.contratado or 'N/A')
-            ws.cell(row=row, column=3, value=contrato.cpf_cnpj or 'N/A')
-            ws.cell(row=row, column=4, value='Pessoa Física' if contrato.tipo_pessoa == 1 else 'Pessoa Jurídica' if contrato.tipo_pessoa == 2 else 'N/A')
-            ws.cell(row=row, column=5, value=f"R$ {contrato.valor:,.2f}" if contrato.valor else "R$ 0,00")
-            ws.cell(row=row, column=6, value=contrato.data_inicio.strftime('%d/%m/%Y') if contrato.data_inicio else 'N/A')
-            ws.cell(row=row, column=7, value=contrato.data_fim.strftime('%d/%m/%Y') if contrato.data_fim else 'N/A')
-            ws.cell(row=row, column=8, value=situacao_map.get(contrato.situacao, 'N/A'))
-        
-        # Ajustar largura das colunas
-        column_widths = {
-            'A': 15,  # Número
-            'B': 25,  # Contratado
-            'C': 20,  # CPF/CNPJ
-            'D': 15,  # Tipo
-            'E': 15,  # Valor
-            'F': 15,  # Data Início
-            'G': 15,  # Data Fim
-            'H': 20   # Situação
-        }
-        
-        for col_letter, width in column_widths.items():
-            ws.column_dimensions[col_letter].width = width
-        
-        # Salvar em buffer
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = 'attachment; filename="relatorio_contratos.xlsx"'
-        
-        return response
-    
-    def generate_json_fallback(self):
-        # Fallback JSON se Excel não funcionar
-        contratos = Contrato.objects.all().order_by('-data_inicio')
-        
-        situacao_map = {
-            '1': 'Aguardando Início', '2': 'Em Andamento', '3': 'Paralisado',
-            '4': 'Suspenso', '5': 'Cancelado', '6': 'Concluído'
-        }
-        
-        data = []
-        for contrato in contratos:
-            data.append({
-                'numero': contrato.num_contrato,
-                'contratado': contrato.contratado or 'N/A',
-                'cpf_cnpj': contrato.cpf_cnpj or 'N/A',
-                'tipo': 'Pessoa Física' if contrato.tipo_pessoa == 1 else 'Pessoa Jurídica' if contrato.tipo_pessoa == 2 else 'N/A',
-                'valor': float(contrato.valor) if contrato.valor else 0.0,
-                'data_inicio': contrato.data_inicio.strftime('%d/%m/%Y') if contrato.data_inicio else None,
-                'data_fim': contrato.data_fim.strftime('%d/%m/%Y') if contrato.data_fim else None,
-                'situacao': situacao_map.get(contrato.situacao, 'N/A')
-            })
-        
-        response = HttpResponse(
-            json.dumps(data, indent=2, ensure_ascii=False),
-            content_type='application/json'
-        )
-        response['Content-Disposition'] = 'attachment; filename="relatorio_contratos.json"'
-        
-        return response
+class RelatorioContratosGenerateView(RelatorioGenerateView):
+    spec = CONTRATOS_REPORT
+    redirect_url = 'relatorios:relatorio_contratos'
 
 class RelatorioFinanceiroView(LoginRequiredMixin, TemplateView):
     template_name = 'relatorios/relatorio_financeiro.html'
@@ -696,9 +182,10 @@ class RelatorioFinanceiroView(LoginRequiredMixin, TemplateView):
         parcelas_pagas = ItemContrato.objects.filter(valor_pago__gt=0).select_related('num_contrato').order_by('-data_pagamento')
         todas_parcelas = ItemContrato.objects.all()
         
-        # Resumos financeiros
-        total_recebido = parcelas_pagas.aggregate(total=Sum('valor_pago'))['total'] or 0
-        total_previsto = todas_parcelas.aggregate(total=Sum('valor_parcela'))['total'] or 0
+        # Resumos financeiros (mesma agregação do relatório exportado)
+        totais = ReportEngine(FINANCEIRO_REPORT).totals
+        total_recebido = totais['total_recebido'] or 0
+        total_previsto = totais['total_previsto'] or 0
         total_pendente = total_previsto - total_recebido
         
         # Parcelas por situação
@@ -708,15 +195,14 @@ class RelatorioFinanceiroView(LoginRequiredMixin, TemplateView):
             situacao__in=['1', '2']
         ).count()
         
-        # Pagamentos por mês (ano atual) - SQLite compatible
-        from django.db.models.functions import Extract
-        pagamentos_mensais = parcelas_pagas.filter(
-            data_pagamento__year=timezone.now().year
+        # Pagamentos por mês (ano atual) - lidos do consolidado mensal
+        pagamentos_mensais = MonthlyFinancialRollup.objects.filter(
+            ano=timezone.now().year
+        ).values(
+            month=F('mes')
         ).annotate(
-            month=Extract('data_pagamento', 'month')
-        ).values('month').annotate(
             total=Sum('valor_pago'),
-            count=Count('id')
+            count=Sum('quantidade')
         ).order_by('month')
         
         context.update({
@@ -732,413 +218,10 @@ class RelatorioFinanceiroView(LoginRequiredMixin, TemplateView):
         
         return context
 
-class RelatorioFinanceiroGenerateView(LoginRequiredMixin, View):
-    def get(self, request, *args, **kwargs):
-        format_type = request.GET.get('format', 'html')
-        
-        if format_type == 'pdf':
-            return self.generate_pdf()
-        elif format_type == 'excel':
-            return self.generate_excel()
-        else:
-            return redirect('relatorios:relatorio_financeiro')
-    
-    def generate_pdf(self):
-        if not PDF_AVAILABLE:
-            # Fallback para CSV se PDF não estiver disponível
-            return self.generate_csv_fallback()
-            
-        if PDF_LIBRARY == 'fpdf':
-            return self.generate_pdf_fpdf()
-        else:
-            # Fallback para CSV se não conseguir gerar PDF
-            return self.generate_csv_fallback()
-    
-    def generate_pdf_fpdf(self):
-        # Gerar PDF para relatório financeiro usando FPDF
-        try:
-            from fpdf import FPDF
-            from fpdf.enums import XPos, YPos
-            
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_auto_page_break(auto=True, margin=15)
-            
-            # Título
-            pdf.set_font('helvetica', 'B', 16)
-            pdf.cell(0, 10, 'RELATÓRIO FINANCEIRO - FUNETEC', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-            
-            # Data de geração
-            pdf.set_font('helvetica', '', 10)
-            pdf.cell(0, 5, f'Gerado em: {timezone.now().strftime("%d/%m/%Y às %H:%M")}', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-            pdf.ln(15)
-            
-            # Resumo financeiro
-            parcelas_pagas = ItemContrato.objects.filter(valor_pago__gt=0).select_related('num_contrato')
-            todas_parcelas = ItemContrato.objects.all()
-            
-            total_recebido = parcelas_pagas.aggregate(total=Sum('valor_pago'))['total'] or 0
-            total_previsto = todas_parcelas.aggregate(total=Sum('valor_parcela'))['total'] or 0
-            total_pendente = total_previsto - total_recebido
-            taxa_recebimento = (total_recebido / total_previsto * 100) if total_previsto > 0 else 0
-            
-            # Caixa de resumo
-            pdf.set_fill_color(248, 249, 250)  # Cinza claro
-            pdf.rect(10, pdf.get_y(), 190, 40, 'F')
-            
-            pdf.set_font('helvetica', 'B', 12)
-            pdf.cell(0, 8, 'RESUMO FINANCEIRO', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-            
-            pdf.set_font('helvetica', '', 10)
-            pdf.cell(95, 6, f'Total Recebido: R$ {total_recebido:,.2f}', border=0, align='L')
-            pdf.cell(95, 6, f'Total Previsto: R$ {total_previsto:,.2f}', border=0, align='L')
-            pdf.ln()
-            pdf.cell(95, 6, f'Total Pendente: R$ {total_pendente:,.2f}', border=0, align='L')
-            pdf.cell(95, 6, f'Taxa de Recebimento: {taxa_recebimento:.1f}%', border=0, align='L')
-            pdf.ln(15)
-            
-            # Cabeçalho da tabela
-            pdf.set_font('helvetica', 'B', 9)
-            pdf.set_fill_color(8, 149, 97)  # Verde FUNETEC
-            pdf.set_text_color(255, 255, 255)  # Texto branco
-            
-            # Larguras das colunas
-            col_widths = [25, 25, 25, 25, 25, 25, 40]
-            headers = ['Data', 'Contrato', 'Parcela', 'Valor Pago', 'Valor Total', 'Diferença', 'Status']
-            
-            for i, header in enumerate(headers):
-                pdf.cell(col_widths[i], 8, header, border=1, align='C', fill=True)
-            pdf.ln()
-            
-            # Dados das parcelas pagas
-            parcelas = parcelas_pagas.order_by('-data_pagamento')[:50]  # Últimas 50
-            
-            situacao_map = {
-                '1': 'Pendente', '2': 'Processando', '3': 'Liquidada', '4': 'Cancelada'
-            }
-            
-            pdf.set_text_color(0, 0, 0)  # Texto preto
-            pdf.set_font('helvetica', '', 8)
-            
-            for parcela in parcelas:
-                # Verificar se precisa de nova página
-                if pdf.get_y() > 270:
-                    pdf.add_page()
-                    # Repetir cabeçalho
-                    pdf.set_font('helvetica', 'B', 9)
-                    pdf.set_fill_color(8, 149, 97)
-                    pdf.set_text_color(255, 255, 255)
-                    for i, header in enumerate(headers):
-                        pdf.cell(col_widths[i], 8, header, border=1, align='C', fill=True)
-                    pdf.ln()
-                    pdf.set_text_color(0, 0, 0)
-                    pdf.set_font('helvetica', '', 8)
-                
-                # Dados da linha
-                data_pag = parcela.data_pagamento.strftime('%d/%m/%Y') if parcela.data_pagamento else 'N/A'
-                contrato = parcela.num_contrato.num_contrato if parcela.num_contrato else 'N/A'
-                num_parcela = f"{parcela.num_parcela}ª"
-                valor_pago = f"R$ {parcela.valor_pago:,.0f}"
-                valor_total = f"R$ {parcela.valor_parcela:,.0f}"
-                diferenca = parcela.valor_parcela - parcela.valor_pago if parcela.valor_parcela and parcela.valor_pago else 0
-                diferenca_str = f"R$ {diferenca:,.0f}"
-                status = situacao_map.get(parcela.situacao, 'N/A')
-                
-                row_data = [data_pag, contrato, num_parcela, valor_pago, valor_total, diferenca_str, status]
-                
-                for i, data in enumerate(row_data):
-                    align = 'R' if i in [3, 4, 5] else 'C'  # Valores alinhados à direita
-                    pdf.cell(col_widths[i], 6, str(data), border=1, align=align)
-                pdf.ln()
-            
-            # Gerar o PDF (método correto para fpdf2)
-            pdf_output = pdf.output()
-            if isinstance(pdf_output, (bytearray, bytes)):
-                pdf_bytes = bytes(pdf_output)
-            else:
-                pdf_bytes = pdf_output.encode('latin-1')
-            
-            response = HttpResponse(pdf_bytes, content_type='application/pdf')
-            response['Content-Disposition'] = 'attachment; filename="relatorio_financeiro.pdf"'
-            
-            return response
-            
-        except Exception as e:
-            # Se falhar a geração de PDF, usar fallback CSV
-            return self.generate_csv_fallback()
-    
-    def generate_old_pdf(self):
-        # Implementação antiga com reportlab (não funciona)
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        
-        # Estilos
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-        
-        # Elementos do documento
-        elements = []
-        
-        # Título
-        title = Paragraph("RELATÓRIO FINANCEIRO - FUNETEC", title_style)
-        elements.append(title)
-        
-        # Data de geração
-        date_text = f"Gerado em: {timezone.now().strftime('%d/%m/%Y às %H:%M')}"
-        date_para = Paragraph(date_text, styles['Normal'])
-        elements.append(date_para)
-        elements.append(Spacer(1, 20))
-        
-        # Resumo financeiro
-        parcelas_pagas = ItemContrato.objects.filter(valor_pago__gt=0)
-        todas_parcelas = ItemContrato.objects.all()
-        
-        total_recebido = parcelas_pagas.aggregate(total=Sum('valor_pago'))['total'] or 0
-        total_previsto = todas_parcelas.aggregate(total=Sum('valor_parcela'))['total'] or 0
-        total_pendente = total_previsto - total_recebido
-        
-        resumo_data = [
-            ['RESUMO FINANCEIRO', '', '', ''],
-            ['Total Recebido', f'R$ {total_recebido:,.2f}', '', ''],
-            ['Total Previsto', f'R$ {total_previsto:,.2f}', '', ''],
-            ['Total Pendente', f'R$ {total_pendente:,.2f}', '', ''],
-            ['Taxa de Recebimento', f'{(total_recebido/total_previsto*100) if total_previsto > 0 else 0:.1f}%', '', '']
-        ]
-        
-        resumo_table = Table(resumo_data)
-        resumo_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#089561')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(resumo_table)
-        elements.append(Spacer(1, 20))
-        
-        # Tabela de pagamentos
-        data = [['Data', 'Contrato', 'Parcela', 'Valor Pago', 'Valor Total', 'Status']]
-        
-        parcelas_pagas_list = parcelas_pagas.order_by('-data_pagamento')
-        
-        for parcela in parcelas_pagas_list:
-            data.append([
-                parcela.data_pagamento.strftime('%d/%m/%Y') if parcela.data_pagamento else 'N/A',
-                str(parcela.num_contrato.num_contrato) if parcela.num_contrato else 'N/A',
-                f"{parcela.num_parcela}ª parcela",
-                f"R$ {parcela.valor_pago:,.2f}",
-                f"R$ {parcela.valor_parcela:,.2f}",
-                'Liquidado' if parcela.situacao == '3' else 'Pago Parcial'
-            ])
-        
-        # Criar tabela
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#089561')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        
-        # Construir PDF
-        doc.build(elements)
-        
-        buffer.seek(0)
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="relatorio_financeiro.pdf"'
-        
-        return response
-    
-    def generate_csv_fallback(self):
-        # Fallback CSV se PDF não funcionar
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="relatorio_financeiro.csv"'
-        
-        writer = csv.writer(response)
-        
-        # Cabeçalho do resumo
-        parcelas_pagas = ItemContrato.objects.filter(valor_pago__gt=0)
-        todas_parcelas = ItemContrato.objects.all()
-        
-        total_recebido = parcelas_pagas.aggregate(total=Sum('valor_pago'))['total'] or 0
-        total_previsto = todas_parcelas.aggregate(total=Sum('valor_parcela'))['total'] or 0
-        total_pendente = total_previsto - total_recebido
-        
-        writer.writerow(['RELATÓRIO FINANCEIRO - FUNETEC'])
-        writer.writerow([f'Gerado em: {timezone.now().strftime("%d/%m/%Y às %H:%M")}'])
-        writer.writerow([])
-        writer.writerow(['RESUMO'])
-        writer.writerow(['Total Recebido', f'R$ {total_recebido:,.2f}'])
-        writer.writerow(['Total Previsto', f'R$ {total_previsto:,.2f}'])
-        writer.writerow(['Total Pendente', f'R$ {total_pendente:,.2f}'])
-        writer.writerow(['Taxa de Recebimento', f'{(total_recebido/total_previsto*100) if total_previsto > 0 else 0:.1f}%'])
-        writer.writerow([])
-        
-        # Cabeçalho da tabela
-        writer.writerow(['Data', 'Contrato', 'Parcela', 'Valor Pago', 'Valor Total', 'Status'])
-        
-        # Dados dos pagamentos
-        parcelas_pagas_list = parcelas_pagas.order_by('-data_pagamento')
-        
-        for parcela in parcelas_pagas_list:
-            writer.writerow([
-                parcela.data_pagamento.strftime('%d/%m/%Y') if parcela.data_pagamento else 'N/A',
-                str(parcela.num_contrato.num_contrato) if parcela.num_contrato else 'N/A',
-                f"{parcela.num_parcela}ª parcela",
-                f"R$ {parcela.valor_pago:,.2f}",
-                f"R$ {parcela.valor_parcela:,.2f}",
-                'Liquidado' if parcela.situacao == '3' else 'Pago Parcial'
-            ])
-        
-        return response
-    
-    def generate_excel(self):
-        if not EXCEL_AVAILABLE:
-            # Fallback para JSON se Excel não estiver disponível
-            return self.generate_json_fallback()
-            
-        # Gerar Excel para relatório financeiro
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Relatório Financeiro"
-        
-        # Estilo do cabeçalho
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="089561", end_color="089561", fill_type="solid")
-        header_alignment = Alignment(horizontal="center")
-        
-        # Título
-        ws.merge_cells('A1:F1')
-        ws['A1'] = "RELATÓRIO FINANCEIRO - FUNETEC"
-        ws['A1'].font = Font(bold=True, size=16)
-        ws['A1'].alignment = Alignment(horizontal="center")
-        
-        # Data de geração
-        ws.merge_cells('A2:F2')
-        ws['A2'] = f"Gerado em: {timezone.now().strftime('%d/%m/%Y às %H:%M')}"
-        ws['A2'].alignment = Alignment(horizontal="center")
-        
-        # Resumo financeiro
-        parcelas_pagas = ItemContrato.objects.filter(valor_pago__gt=0)
-        todas_parcelas = ItemContrato.objects.all()
-        
-        total_recebido = parcelas_pagas.aggregate(total=Sum('valor_pago'))['total'] or 0
-        total_previsto = todas_parcelas.aggregate(total=Sum('valor_parcela'))['total'] or 0
-        total_pendente = total_previsto - total_recebido
-        
-        # Resumo de dados
-        ws['A4'] = "RESUMO FINANCEIRO"
-        ws['A4'].font = Font(bold=True, size=12)
-        ws['A5'] = f"Total Recebido: R$ {total_recebido:,.2f}"
-        ws['A6'] = f"Total Previsto: R$ {total_previsto:,.2f}" 
-        ws['A7'] = f"Total Pendente: R$ {total_pendente:,.2f}"
-        ws['A8'] = f"Taxa de Recebimento: {(total_recebido/total_previsto*100) if total_previsto > 0 else 0:.1f}%"
-        
-        # Cabeçalhos das colunas (linha 10)
-        headers = ['Data', 'Contrato', 'Parcela', 'Valor Pago', 'Valor Total', 'Status']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=10, column=col)
-            cell.value = header
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # Dados dos pagamentos
-        parcelas_pagas_list = parcelas_pagas.order_by('-data_pagamento')
-        
-        for row, parcela in enumerate(parcelas_pagas_list, 11):
-            ws.cell(row=row, column=1, value=parcela.data_pagamento.strftime('%d/%m/%Y') if parcela.data_pagamento else 'N/A')
-            ws.cell(row=row, column=2, value=str(parcela.num_contrato.num_contrato) if parcela.num_contrato else 'N/A')
-            ws.cell(row=row, column=3, value=f"{parcela.num_parcela}ª parcela")
-            ws.cell(row=row, column=4, value=f"R$ {parcela.valor_pago:,.2f}")
-            ws.cell(row=row, column=5, value=f"R$ {parcela.valor_parcela:,.2f}")
-            ws.cell(row=row, column=6, value='Liquidado' if parcela.situacao == '3' else 'Pago Parcial')
-        
-        # Ajustar largura das colunas
-        column_widths = {
-            'A': 15,  # Data
-            'B': 15,  # Contrato
-            'C': 15,  # Parcela
-            'D': 15,  # Valor Pago
-            'E': 15,  # Valor Total
-            'F': 15   # Status
-        }
-        
-        for col_letter, width in column_widths.items():
-            ws.column_dimensions[col_letter].width = width
-        
-        # Salvar em buffer
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = 'attachment; filename="relatorio_financeiro.xlsx"'
-        
-        return response
-    
-    def generate_json_fallback(self):
-        # Fallback JSON se Excel não funcionar - Gerar JSON para relatório financeiro
-        parcelas_pagas = ItemContrato.objects.filter(valor_pago__gt=0)
-        todas_parcelas = ItemContrato.objects.all()
-        
-        total_recebido = parcelas_pagas.aggregate(total=Sum('valor_pago'))['total'] or 0
-        total_previsto = todas_parcelas.aggregate(total=Sum('valor_parcela'))['total'] or 0
-        total_pendente = total_previsto - total_recebido
-        
-        # Resumo
-        resumo = {
-            'total_recebido': float(total_recebido) if total_recebido else 0.0,
-            'total_previsto': float(total_previsto) if total_previsto else 0.0,
-            'total_pendente': float(total_pendente) if total_pendente else 0.0,
-            'taxa_recebimento': float((total_recebido/total_previsto*100) if total_previsto > 0 else 0)
-        }
-        
-        # Pagamentos
-        pagamentos = []
-        parcelas_pagas_list = parcelas_pagas.order_by('-data_pagamento')
-        
-        for parcela in parcelas_pagas_list:
-            pagamentos.append({
-                'data': parcela.data_pagamento.strftime('%d/%m/%Y') if parcela.data_pagamento else None,
-                'contrato': str(parcela.num_contrato.num_contrato) if parcela.num_contrato else 'N/A',
-                'parcela': f"{parcela.num_parcela}ª parcela",
-                'valor_pago': float(parcela.valor_pago) if parcela.valor_pago else 0.0,
-                'valor_total': float(parcela.valor_parcela) if parcela.valor_parcela else 0.0,
-                'status': 'Liquidado' if parcela.situacao == '3' else 'Pago Parcial'
-            })
-        
-        data = {
-            'relatorio': 'Financeiro - FUNETEC',
-            'gerado_em': timezone.now().strftime('%d/%m/%Y às %H:%M'),
-            'resumo': resumo,
-            'pagamentos': pagamentos
-        }
-        
-        response = HttpResponse(
-            json.dumps(data, indent=2, ensure_ascii=False),
-            content_type='application/json'
-        )
-        response['Content-Disposition'] = 'attachment; filename="relatorio_financeiro.json"'
-        
-        return response
-    
+class RelatorioFinanceiroGenerateView(RelatorioGenerateView):
+    spec = FINANCEIRO_REPORT
+    redirect_url = 'relatorios:relatorio_financeiro'
+
 class RelatorioCustomView(LoginRequiredMixin, TemplateView):
     template_name = 'relatorios/relatorio_custom.html'
     